@@ -0,0 +1,244 @@
+"""
+Benchmark suite for the scanner.
+
+Generates a synthetic repository (see synth.py), then times the file walker
+on the directory and on its zipball, each scanner on its own, classification,
+and an end-to-end `local` scan. Results are written as JSON, and can be
+compared against an earlier run to catch regressions:
+
+    python benchmarks/bench.py --files 2000 --output bench.json
+    python benchmarks/bench.py --files 2000 --baseline bench.json --tolerance 0.15
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import click
+from click.testing import CliRunner
+from rich.console import Console
+from rich.table import Table
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "repo_scanner", "src")
+CONFIG_DIR = os.path.join(SRC_DIR, "repo_scanner", "config")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from repo_scanner.scanner.utils import load_config
+from repo_scanner.scanner.file_filter import FileFilter
+from repo_scanner.scanner.classifier import Classifier
+from repo_scanner.scanner.scanners.keyword_scanner import KeywordScanner
+from repo_scanner.scanner.scanners.dependency_scanner import DependencyScanner
+from repo_scanner.scanner.scanners import ast_scanner
+from repo_scanner.scanner.pipeline import ScanRouter
+from repo_scanner.cli.main import cli
+from synth import generate_repo, make_zipball
+
+console = Console(stderr=True)
+
+# Version of the results layout, bumped when fields change meaning
+RESULTS_VERSION = 1
+
+
+def best_of(repeat: int, run: Callable[[], None], setup: Optional[Callable[[], None]] = None) -> float:
+    """Fastest of `repeat` timed runs; setup runs untimed before each one."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def record(name: str, seconds: float, files: int, size: int, **extra) -> Dict:
+    entry = {
+        "name": name,
+        "seconds": round(seconds, 6),
+        "files": files,
+        "bytes": size,
+        "files_per_s": round(files / seconds, 2) if seconds else None,
+        "mb_per_s": round(size / seconds / 1e6, 3) if seconds else None,
+    }
+    entry.update(extra)
+    return entry
+
+
+def clear_parse_cache():
+    # Each run must parse for real, not hit the previous run's cache
+    ast_scanner._parse_cache.clear()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(repo_dir: str, zip_path: str, repeat: int) -> List[Dict]:
+    config = load_config(os.path.join(CONFIG_DIR, "scanner_config.yaml"))
+    langs = load_config(os.path.join(CONFIG_DIR, "languages.yaml"))
+    file_filter = FileFilter.from_config(langs, config)
+    results = []
+
+    files = list(file_filter.walk_repo(repo_dir))
+    files = [f for f in files if hasattr(f, "content")]
+    total_bytes = sum(len(f.content.encode("utf-8")) for f in files)
+    console.print(f"[bold blue]{len(files)} files, {total_bytes / 1e6:.1f} MB[/bold blue]")
+
+    seconds = best_of(repeat, lambda: sum(1 for _ in file_filter.walk_repo(repo_dir)))
+    results.append(record("walk_repo", seconds, len(files), total_bytes))
+
+    def walk_zip():
+        with zipfile.ZipFile(zip_path) as archive:
+            for _ in file_filter.walk_zip(archive):
+                pass
+    results.append(record("walk_zip", best_of(repeat, walk_zip), len(files), total_bytes))
+
+    indicators = []
+    scanners = [KeywordScanner(config, langs), DependencyScanner(config), ast_scanner.ASTScanner()]
+    # Each scanner only gets the files the pipeline would route to it
+    router = ScanRouter(scanners)
+    for scanner in scanners:
+        found = []
+        routed = [f for f in files if scanner in router.route(f.path, f.extension)]
+
+        def scan(scanner=scanner, found=found, routed=routed):
+            found.clear()
+            for f in routed:
+                found.extend(scanner.scan(f.path, f.content))
+        seconds = best_of(repeat, scan, clear_parse_cache)
+        results.append(record(type(scanner).__name__, seconds, len(files), total_bytes, indicators=len(found)))
+        indicators.extend(found)
+
+    classifier = Classifier(config)
+    label = {}
+
+    def classify():
+        label["classification"] = classifier.classify(indicators)
+        label["confidence"] = classifier.get_confidence(indicators)
+    seconds = best_of(repeat, classify)
+    results.append(record("Classifier", seconds, len(files), total_bytes, indicators=len(indicators),
+                          indicators_per_s=round(len(indicators) / seconds, 2) if seconds else None, **label))
+
+    # The real CLI path: config loading, walking, scanning, classification and
+    # writing the results file (into a scratch working directory)
+    runner = CliRunner()
+    args = ["--config", os.path.join(CONFIG_DIR, "scanner_config.yaml"),
+            "--languages", os.path.join(CONFIG_DIR, "languages.yaml"),
+            "local", repo_dir, "--output", "json"]
+    with tempfile.TemporaryDirectory() as scratch:
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            def scan_local():
+                outcome = runner.invoke(cli, args, catch_exceptions=False)
+                if outcome.exit_code != 0:
+                    raise RuntimeError(f"local scan failed: {outcome.output}")
+            seconds = best_of(repeat, scan_local, clear_parse_cache)
+        finally:
+            os.chdir(cwd)
+    results.append(record("scan_local", seconds, len(files), total_bytes))
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Names of benchmarks whose files/s fell more than `tolerance` below the baseline."""
+    old = {b["name"]: b for b in baseline.get("benchmarks", [])}
+    table = Table(title="Benchmarks")
+    table.add_column("Benchmark")
+    table.add_column("files/s", justify="right")
+    table.add_column("MB/s", justify="right")
+    table.add_column("vs baseline", justify="right")
+    regressions = []
+    for entry in results:
+        change = ""
+        before = old.get(entry["name"])
+        if before and before.get("files_per_s") and entry["files_per_s"]:
+            ratio = entry["files_per_s"] / before["files_per_s"]
+            change = f"{ratio - 1:+.1%}"
+            if ratio < 1 - tolerance:
+                regressions.append(entry["name"])
+                change = f"[red]{change}[/red]"
+        table.add_row(entry["name"], f"{entry['files_per_s']:.0f}", f"{entry['mb_per_s']:.2f}", change)
+    console.print(table)
+    return regressions
+
+
+@click.command()
+@click.option('--files', default=2000, show_default=True, help='Source files in the synthetic repository.')
+@click.option('--mix', default="python=4,javascript=3,typescript=2,go=1", show_default=True, help='Language weights.')
+@click.option('--file-size', default=4096, show_default=True, help='Mean source file size in bytes.')
+@click.option('--mcp-ratio', default=0.02, show_default=True, help='Fraction of files with a planted MCP signature.')
+@click.option('--seed', default=0, show_default=True, help='Random seed for the generator.')
+@click.option('--repeat', default=3, show_default=True, help='Runs per benchmark; the fastest counts.')
+@click.option('--workdir', default=None, help='Keep the generated repository here instead of a temporary directory.')
+@click.option('--output', default=None, help='Write results JSON to this file (default: stdout).')
+@click.option('--baseline', default=None, help='Earlier results JSON to compare against.')
+@click.option('--tolerance', default=0.15, show_default=True, help='Allowed files/s drop before a benchmark counts as a regression.')
+def main(files, mix, file_size, mcp_ratio, seed, repeat, workdir, output, baseline, tolerance):
+    """Time the scanner on a synthetic repository."""
+    params = {"files": files, "mix": mix, "file_size": file_size, "mcp_ratio": mcp_ratio, "seed": seed, "repeat": repeat}
+    with tempfile.TemporaryDirectory() as tmp:
+        base = workdir or tmp
+        repo_dir = os.path.join(base, "bench-repo")
+        if os.path.exists(repo_dir):
+            raise click.UsageError(f"{repo_dir} already exists")
+        try:
+            summary = generate_repo(repo_dir, files, mix, file_size, mcp_ratio, seed)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--mix')
+        zip_path = make_zipball(repo_dir, os.path.join(base, "bench-repo.zip"))
+        results = run_suite(repo_dir, zip_path, repeat)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": params,
+            "repository": summary,
+        },
+        "benchmarks": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        console.print(f"[green]Results saved to: {output}[/green]")
+    else:
+        click.echo(json.dumps(report, indent=2))
+
+    regressions = []
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+        if previous.get("meta", {}).get("params") != params:
+            console.print("[yellow]Baseline was run with different parameters; numbers may not be comparable.[/yellow]")
+        regressions = compare(results, previous, tolerance)
+    elif output:
+        compare(results, {}, tolerance)
+
+    if regressions:
+        console.print(f"[red]Regressions: {', '.join(regressions)}[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
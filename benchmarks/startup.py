@@ -0,0 +1,175 @@
+"""
+Startup benchmark for the CLI.
+
+Every run is a fresh interpreter, as when the scanner is invoked from a git
+hook. Measures importing the CLI, `--help`, and a `local` scan of a tiny
+repository with a cold and with a warm config snapshot (see
+ConfigSnapshot), and lists the slowest imports from `python -X importtime`:
+
+    python benchmarks/startup.py --output startup.json
+    python benchmarks/startup.py --baseline startup.json --tolerance 0.2
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "repo_scanner", "src")
+LAUNCHER = os.path.join(ROOT_DIR, "repo_scanner", "run_scanner.py")
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+from synth import generate_repo
+
+console = Console(stderr=True)
+
+# Version of the results layout, bumped when fields change meaning
+RESULTS_VERSION = 1
+
+
+def timed_run(args: List[str], cwd: str) -> float:
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=cwd, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def best_of(repeat: int, args: List[str], cwd: str, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        best = min(best, timed_run(args, cwd))
+    return best
+
+
+def slowest_imports(cwd: str, top: int) -> List[Dict]:
+    """Direct imports of the CLI module with the highest cumulative import time."""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import repo_scanner.cli.main"],
+                         cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    # "import time: self [us] | cumulative | imported package", children
+    # indented by two spaces per level and listed before their parent
+    children, direct = [], []
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        depth = (len(parts[2]) - len(parts[2].lstrip()) - 1) // 2
+        if depth == 1:
+            children.append({"module": name, "cumulative_ms": int(parts[1]) / 1000})
+        elif depth == 0:
+            if name == "repo_scanner.cli.main":
+                direct = children
+            children = []
+    return sorted(direct, key=lambda m: -m["cumulative_ms"])[:top]
+
+
+def run_suite(repeat: int, top: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_dir = os.path.join(tmp, "tiny-repo")
+        generate_repo(repo_dir, files=20, file_size=1024, mcp_ratio=0.2)
+        cache_dir = os.path.join(tmp, "cache")
+        snapshot_dir = os.path.join(cache_dir, "snapshots")
+        scan = [LAUNCHER, "--cache-dir", cache_dir, "--quiet", "--ndjson", "-", "local", repo_dir]
+
+        def drop_snapshots():
+            if os.path.isdir(snapshot_dir):
+                for name in os.listdir(snapshot_dir):
+                    os.remove(os.path.join(snapshot_dir, name))
+
+        results = [
+            {"name": "python", "seconds": best_of(repeat, ["-c", "pass"], tmp)},
+            {"name": "import_cli", "seconds": best_of(repeat, ["-c", "import repo_scanner.cli.main"], tmp)},
+            {"name": "help", "seconds": best_of(repeat, [LAUNCHER, "--help"], tmp)},
+            {"name": "local_cold", "seconds": best_of(repeat, scan, tmp, drop_snapshots)},
+        ]
+        timed_run(scan, tmp)  # make sure the snapshot exists
+        results.append({"name": "local_warm", "seconds": best_of(repeat, scan, tmp)})
+        for entry in results:
+            entry["seconds"] = round(entry["seconds"], 4)
+        return {"benchmarks": results, "imports": slowest_imports(tmp, top)}
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Names of benchmarks that got more than `tolerance` slower than the baseline."""
+    old = {b["name"]: b for b in baseline.get("benchmarks", [])}
+    table = Table(title="Startup")
+    table.add_column("Benchmark")
+    table.add_column("ms", justify="right")
+    table.add_column("vs baseline", justify="right")
+    regressions = []
+    for entry in results:
+        change = ""
+        before = old.get(entry["name"])
+        if before and before.get("seconds"):
+            ratio = entry["seconds"] / before["seconds"]
+            change = f"{ratio - 1:+.1%}"
+            if ratio > 1 + tolerance:
+                regressions.append(entry["name"])
+                change = f"[red]{change}[/red]"
+        table.add_row(entry["name"], f"{entry['seconds'] * 1000:.0f}", change)
+    console.print(table)
+    return regressions
+
+
+@click.command()
+@click.option('--repeat', default=5, show_default=True, help='Runs per benchmark; the fastest counts.')
+@click.option('--top', default=10, show_default=True, help='Slowest imports of the CLI module to report.')
+@click.option('--output', default=None, help='Write results JSON to this file (default: stdout).')
+@click.option('--baseline', default=None, help='Earlier results JSON to compare against.')
+@click.option('--tolerance', default=0.2, show_default=True, help='Allowed slowdown before a benchmark counts as a regression.')
+def main(repeat, top, output, baseline, tolerance):
+    """Time CLI startup and a tiny local scan in fresh interpreters."""
+    suite = run_suite(repeat, top)
+    report = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "params": {"repeat": repeat},
+        },
+        **suite,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        console.print(f"[green]Results saved to: {output}[/green]")
+    else:
+        click.echo(json.dumps(report, indent=2))
+
+    previous: Optional[Dict] = None
+    if baseline:
+        with open(baseline) as f:
+            previous = json.load(f)
+    regressions = compare(suite["benchmarks"], previous or {}, tolerance)
+
+    imports = Table(title="Slowest imports")
+    imports.add_column("Module")
+    imports.add_column("ms", justify="right")
+    for entry in suite["imports"]:
+        imports.add_row(entry["module"], f"{entry['cumulative_ms']:.1f}")
+    console.print(imports)
+
+    if regressions:
+        console.print(f"[red]Regressions: {', '.join(regressions)}[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Synthetic repository generator for the benchmarks.
+
+Builds a deterministic source tree for a given seed, size and language mix,
+with MCP server signatures planted in a fraction of the files, and can pack
+it as a GitHub-style zipball (one top-level folder).
+
+    python benchmarks/synth.py /tmp/synth --files 2000 --mix python=4,javascript=3,go=1 --zip
+"""
+import json
+import os
+import random
+import zipfile
+from typing import Dict, List
+
+import click
+
+# Per language: source extension, manifest name and known MCP dependency
+LANGUAGES = {
+    "python": {"ext": ".py", "manifest": "requirements.txt", "mcp_dep": "mcp"},
+    "javascript": {"ext": ".js", "manifest": "package.json", "mcp_dep": "@modelcontextprotocol/sdk"},
+    "typescript": {"ext": ".ts", "manifest": "package.json", "mcp_dep": "@modelcontextprotocol/sdk"},
+    "go": {"ext": ".go", "manifest": "go.mod", "mcp_dep": "github.com/mark3labs/mcp-go"},
+    "rust": {"ext": ".rs", "manifest": "Cargo.toml", "mcp_dep": "rmcp"},
+}
+
+# Plain dependencies per manifest, so parsers and the known-package index
+# have something to reject
+FILLER_DEPS = {
+    "requirements.txt": ["requests", "flask", "numpy", "pydantic", "click"],
+    "package.json": ["express", "lodash", "react", "typescript", "zod"],
+    "go.mod": ["github.com/gorilla/mux", "golang.org/x/sync", "github.com/spf13/cobra"],
+    "Cargo.toml": ["serde", "tokio", "clap", "anyhow"],
+}
+
+MCP_SNIPPETS = {
+    "python": (
+        "from mcp.server import Server\n"
+        "from mcp.server.stdio import stdio_server\n\n"
+        "server = Server(\"{name}\")\n\n"
+        "@server.list_tools()\n"
+        "async def listTools():\n"
+        "    return []\n"
+    ),
+    "javascript": (
+        "import {{ Server }} from \"@modelcontextprotocol/sdk/server/index.js\";\n"
+        "import {{ StdioServerTransport }} from \"@modelcontextprotocol/sdk/server/stdio.js\";\n"
+        "const server = new Server({{ name: \"{name}\" }});\n"
+        "server.setRequestHandler(ListToolsRequestSchema, async () => ({{ tools: [] }}));\n"
+    ),
+    "go": (
+        "import \"github.com/mark3labs/mcp-go/server\"\n\n"
+        "func serve{name}() {{ s := server.NewMCPServer(\"{name}\", \"1.0\"); server.ServeStdio(s) }}\n"
+    ),
+    "rust": (
+        "use rmcp::{{ServerHandler, transport::stdio}};\n"
+        "// registerTool for {name}\n"
+    ),
+}
+MCP_SNIPPETS["typescript"] = MCP_SNIPPETS["javascript"]
+
+WORDS = ["data", "user", "item", "cache", "config", "request", "result", "value", "index", "buffer",
+         "stream", "event", "token", "record", "batch", "query", "parser", "worker", "queue", "state"]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """"python=4,javascript=3" -> {"python": 4.0, "javascript": 3.0}"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in LANGUAGES:
+            raise ValueError(f"Unknown language '{name}' (choose from {', '.join(LANGUAGES)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def _ident(rng: random.Random, n: int) -> str:
+    return "_".join(rng.choice(WORDS) for _ in range(2)) + f"_{n}"
+
+
+def _filler(lang: str, rng: random.Random, n: int) -> str:
+    """One function or class worth of ordinary code, unique per n."""
+    name = _ident(rng, n)
+    a, b = rng.choice(WORDS), rng.choice(WORDS)
+    if lang == "python":
+        if n % 4 == 0:
+            return f"class {name.title().replace('_', '')}:\n    def __init__(self, {a}):\n        self.{a} = {a}\n\n"
+        return f"def {name}({a}, {b}=None):\n    if {b} is None:\n        {b} = [{n}, {a}]\n    return len({b}) + {n}\n\n"
+    if lang in ("javascript", "typescript"):
+        return f"function {name}({a}, {b}) {{\n  const out = [{a}, {b}, {n}];\n  return out.filter(Boolean).length;\n}}\n\n"
+    if lang == "go":
+        return f"func {name.title().replace('_', '')}({a} int, {b} string) int {{\n\treturn {a} + len({b}) + {n}\n}}\n\n"
+    return f"fn {name}({a}: u32, {b}: &str) -> usize {{\n    ({a} as usize) + {b}.len() + {n}\n}}\n\n"
+
+
+def _header(lang: str, rng: random.Random) -> str:
+    if lang == "python":
+        return "".join(f"import {m}\n" for m in rng.sample(["os", "sys", "json", "re", "typing", "logging"], 3)) + "\n"
+    if lang in ("javascript", "typescript"):
+        return "".join(f"const {m} = require(\"{m}\");\n" for m in rng.sample(["fs", "path", "util", "events"], 2)) + "\n"
+    if lang == "go":
+        return "package main\n\nimport \"fmt\"\n\n"
+    return "use std::collections::HashMap;\n\n"
+
+
+def _manifest(manifest: str, deps: List[str]) -> str:
+    if manifest == "requirements.txt":
+        return "".join(f"{d}>=1.0\n" for d in deps)
+    if manifest == "package.json":
+        return json.dumps({"name": "bench", "version": "1.0.0", "dependencies": {d: "^1.0.0" for d in deps}}, indent=2)
+    if manifest == "go.mod":
+        return "module example.com/bench\n\ngo 1.22\n\nrequire (\n" + "".join(f"\t{d} v1.0.0\n" for d in deps) + ")\n"
+    return "[package]\nname = \"bench\"\nversion = \"0.1.0\"\n\n[dependencies]\n" + "".join(f"{d} = \"1\"\n" for d in deps)
+
+
+def generate_repo(root: str, files: int = 1000, mix: str = "python=4,javascript=3,typescript=2,go=1",
+                  file_size: int = 4096, mcp_ratio: float = 0.02, seed: int = 0) -> Dict:
+    """
+    Writes a synthetic repository under root and returns a summary:
+    files and bytes written per language, and how many files got an MCP
+    signature. The same arguments always produce the same tree.
+    """
+    rng = random.Random(seed)
+    weights = parse_mix(mix)
+    langs, lang_weights = list(weights), list(weights.values())
+    dirs = [""] + [f"src/{rng.choice(WORDS)}{i}" + (f"/{rng.choice(WORDS)}" if i % 3 == 0 else "") for i in range(max(1, files // 50))]
+    summary = {"files": 0, "bytes": 0, "planted": 0, "languages": {}}
+
+    def write(rel_path: str, content: str):
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = content.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+        summary["files"] += 1
+        summary["bytes"] += len(data)
+        return len(data)
+
+    planted_langs = set()
+    for n in range(files):
+        lang = rng.choices(langs, lang_weights)[0]
+        ext = LANGUAGES[lang]["ext"]
+        parts = [_header(lang, rng)]
+        size = len(parts[0])
+        if rng.random() < mcp_ratio:
+            parts.append(MCP_SNIPPETS[lang].format(name=f"bench{n}"))
+            summary["planted"] += 1
+            planted_langs.add(lang)
+        target = max(256, int(rng.gauss(file_size, file_size / 4)))
+        k = n * 1000
+        while size < target:
+            chunk = _filler(lang, rng, k)
+            parts.append(chunk)
+            size += len(chunk)
+            k += 1
+        written = write(f"{rng.choice(dirs)}/{_ident(rng, n)}{ext}".lstrip("/"), "".join(parts))
+        stats = summary["languages"].setdefault(lang, {"files": 0, "bytes": 0})
+        stats["files"] += 1
+        stats["bytes"] += written
+
+    # One manifest per ecosystem present, declaring the SDK where it was planted
+    for manifest in sorted({LANGUAGES[lang]["manifest"] for lang in weights}):
+        deps = list(FILLER_DEPS[manifest])
+        deps += sorted({LANGUAGES[lang]["mcp_dep"] for lang in planted_langs if LANGUAGES[lang]["manifest"] == manifest})
+        write(manifest, _manifest(manifest, deps))
+
+    # Content the walker must skip without reading
+    for i in range(max(1, files // 100)):
+        write(f"node_modules/dep{i}/index.js", _filler("javascript", rng, i))
+        write(f".git/objects/{i:02x}/blob", "x" * 512)
+    return summary
+
+
+def make_zipball(root: str, zip_path: str, prefix: str = "bench-repo-0000000") -> str:
+    """Packs root like a GitHub zipball: every member under one top-level folder."""
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                zf.write(path, f"{prefix}/{rel}")
+    return zip_path
+
+
+@click.command()
+@click.argument('root')
+@click.option('--files', default=1000, show_default=True, help='Number of source files.')
+@click.option('--mix', default="python=4,javascript=3,typescript=2,go=1", show_default=True, help='Language weights.')
+@click.option('--file-size', default=4096, show_default=True, help='Mean source file size in bytes.')
+@click.option('--mcp-ratio', default=0.02, show_default=True, help='Fraction of files with a planted MCP signature.')
+@click.option('--seed', default=0, show_default=True, help='Random seed.')
+@click.option('--zip', 'zip_path', is_flag=False, flag_value="", default=None, help='Also write a zipball (default: <root>.zip).')
+def main(root, files, mix, file_size, mcp_ratio, seed, zip_path):
+    """Generate a synthetic repository under ROOT."""
+    try:
+        summary = generate_repo(root, files, mix, file_size, mcp_ratio, seed)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--mix')
+    if zip_path is not None:
+        summary["zipball"] = make_zipball(root, zip_path or root.rstrip("/\\") + ".zip")
+    click.echo(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,47 @@
 import logging
+import signal
 import sys
 import os
+import time
+from contextlib import nullcontext
 import click
-from rich.console import Console
-from rich.table import Table
-from ..scanner.utils import setup_logger, load_config
-from ..scanner.github_client import GitHubClient
-from ..scanner.repo_fetcher import RepoFetcher
+from ..scanner.utils import setup_logger, safe_filename
+from ..scanner.config_snapshot import ConfigSnapshot
 from ..scanner.file_filter import FileFilter
-from ..scanner.scanners.keyword_scanner import KeywordScanner
-from ..scanner.scanners.dependency_scanner import DependencyScanner
-from ..scanner.scanners.ast_scanner import ASTScanner
-from ..scanner.classifier import Classifier
+from ..scanner.pipeline import EarlyStop, scan_files, scan_files_parallel, build_result
+from ..scanner.result_cache import ResultCache
 from ..scanner.result import ScanResult
+from ..scanner.result_sink import NDJSONSink
+from ..scanner.indicator_store import IndicatorStore
+from ..scanner.indicator_archive import IndicatorArchive
+from ..scanner import metrics as scan_metrics
 
 logger = setup_logger()
-console = Console()
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "repo_scanner")
+RESULTS_DIR = "results"
+
+def console():
+    """rich's console, shared with the log handler; rich is imported on first output."""
+    from rich import get_console
+    return get_console()
 
 @click.group()
 @click.pass_context
 @click.option('--config', default=None, help='Path to scanner config.')
 @click.option('--languages', default=None, help='Path to languages config.')
 @click.option('--token', envvar='GITHUB_TOKEN', help='GitHub API Token.')
-def cli(ctx, config, languages, token):
+@click.option('--api-url', envvar='GITHUB_API_URL', default=None, help='GitHub API root (default https://api.github.com), e.g. for GitHub Enterprise or a local stub.')
+@click.option('--tokens', envvar='GITHUB_TOKENS', default=None, help='Comma-separated token pool; batch scans (--workers) rotate across them with rate-limit pacing.')
+@click.option('--cache', is_flag=True, help='Reuse stored results for repositories whose head commit and config are unchanged.')
+@click.option('--blob-memo', is_flag=True, help='Reuse per-file indicators for file contents already scanned in any repository (kept under <cache-dir>/blobs).')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR, show_default=True, help='Directory for on-disk caches.')
+@click.option('--archive', is_flag=True, help='Keep the raw indicators of every scan under <cache-dir>/archive for the rescore command.')
+@click.option('--metrics', is_flag=True, help='Record per-stage timings and counters in a metrics block of each result.')
+@click.option('--profile', is_flag=True, help='Also write a cProfile stats file per repository to results/ (implies --metrics).')
+@click.option('--ndjson', 'ndjson_path', default=None, help='Stream every result as one JSON line to this file instead of one JSON file per repository ("-" for stdout, ".gz" to compress).')
+@click.option('--quiet', is_flag=True, help='Skip the per-repository console tables.')
+def cli(ctx, config, languages, token, api_url, tokens, cache, blob_memo, cache_dir, archive, metrics, profile, ndjson_path, quiet):
     # Resolve default paths relative to package if not provided
     if not config:
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -38,57 +57,332 @@ def cli(ctx, config, languages, token):
             languages = "config/languages.yaml"
 
     ctx.ensure_object(dict)
-    ctx.obj['config'] = load_config(config)
-    ctx.obj['languages'] = load_config(languages)
+    ctx.obj['config_path'] = config
+    ctx.obj['languages_path'] = languages
+    # Parsed configs and built scanners, from the snapshot cache when warm
+    snapshot = ConfigSnapshot.load(config, languages, os.path.join(cache_dir, "snapshots"))
+    ctx.obj['snapshot'] = snapshot
+    ctx.obj['config'] = snapshot.config
+    ctx.obj['languages'] = snapshot.languages
+    ctx.obj['config_hash'] = snapshot.config_hash
     ctx.obj['token'] = token
+    ctx.obj['api_url'] = api_url
+    ctx.obj['cache_dir'] = cache_dir
+    ctx.obj['token_pool'] = [t.strip() for t in tokens.split(",") if t.strip()] if tokens else []
     
     # Initialize components
-    ctx.obj['github_client'] = GitHubClient(token)
-    ctx.obj['repo_fetcher'] = RepoFetcher(token)
+    ctx.obj['result_cache'] = ResultCache(os.path.join(cache_dir, "results")) if cache else None
+    ctx.obj['memo_path'] = os.path.join(cache_dir, "blobs", "memo.sqlite3") if blob_memo else None
+    ctx.obj['archive'] = IndicatorArchive(os.path.join(cache_dir, "archive"), ctx.obj['config']) if archive else None
+    ctx.obj['metrics'] = metrics or profile
+    ctx.obj['profile_dir'] = RESULTS_DIR if profile else None
+    ctx.obj['quiet'] = quiet
+    ctx.obj['sink'] = open_sink(ctx, ndjson_path) if ndjson_path else None
+
+# GitHub clients are created (and requests imported) only by the commands that
+# need them, so a local scan starts without them
+def github_client(ctx):
+    if 'github_client' not in ctx.obj:
+        from ..scanner.github_client import GitHubClient
+        ctx.obj['github_client'] = GitHubClient(ctx.obj['token'], cache_dir=os.path.join(ctx.obj['cache_dir'], "http"),
+                                              base_url=ctx.obj['api_url'])
+    return ctx.obj['github_client']
+
+def repo_fetcher(ctx):
+    if 'repo_fetcher' not in ctx.obj:
+        from ..scanner.repo_fetcher import RepoFetcher
+        ctx.obj['repo_fetcher'] = RepoFetcher(ctx.obj['token'])
+    return ctx.obj['repo_fetcher']
+
+def async_client(ctx):
+    """The paced client over the --tokens pool, or None without one."""
+    if 'async_client' not in ctx.obj:
+        token_pool = ctx.obj['token_pool']
+        if token_pool:
+            from ..scanner.async_github_client import AsyncGitHubClient
+            ctx.obj['async_client'] = AsyncGitHubClient(token_pool, base_url=ctx.obj['api_url'])
+        else:
+            ctx.obj['async_client'] = None
+    return ctx.obj['async_client']
+
+def ensure_result_cache(ctx):
+    """--delta rescans from stored results, so it stores them even without --cache."""
+    if ctx.obj['result_cache'] is None:
+        ctx.obj['result_cache'] = ResultCache(os.path.join(ctx.obj['cache_dir'], "results"))
+
+def close_async_client(ctx):
+    if ctx.obj.get('async_client'):
+        ctx.obj['async_client'].close()
+
+def blob_memo(ctx):
+    """The BlobMemo for scans in this process, or None without --blob-memo."""
+    if 'blob_memo' not in ctx.obj:
+        ctx.obj['blob_memo'] = None
+        if ctx.obj['memo_path']:
+            from ..scanner.blob_memo import BlobMemo
+            memo = BlobMemo.for_config(ctx.obj['memo_path'], ctx.obj['config'], ctx.obj['languages'])
+            ctx.call_on_close(memo.close)
+            ctx.obj['blob_memo'] = memo
+    return ctx.obj['blob_memo']
+
+def open_sink(ctx, path: str) -> NDJSONSink:
+    """One NDJSON writer for the whole invocation, closed when the command ends."""
+    try:
+        sink = NDJSONSink(path)
+    except OSError as e:
+        raise click.BadParameter(str(e), param_hint='--ndjson')
+    if sink.to_stdout:
+        # stdout carries the results; move console output and logging to stderr
+        console().stderr = True
+
+    def close():
+        sink.close()
+        if not sink.to_stdout:
+            console().print(f"[green]{sink.count} result(s) saved to: {sink.path}[/green]")
+    ctx.call_on_close(close)
+    return sink
 
 @cli.command()
 @click.argument('repo_name') # owner/repo
 @click.option('--output', type=click.Choice(['json', 'table']), default='json', help='Output format.')
+@click.option('--in-memory', is_flag=True, help='Scan the downloaded archive in memory instead of extracting it to disk.')
+@click.option('--jobs', default=1, type=int, help='Scan files of a repository on N processes.')
+@click.option('--triage', is_flag=True, help='Check manifests from the git tree first and only download the archive if they score above the configured cutoff.')
+@click.option('--fast', is_flag=True, help='Visit manifests and entrypoints first and stop as soon as the classification can no longer change.')
+@click.option('--delta', is_flag=True, help='Rescan a repository stored at an older commit from the files changed since then (compare API) instead of its archive; implies --cache.')
 @click.pass_context
-def repo(ctx, repo_name, output):
+def repo(ctx, repo_name, output, in_memory, jobs, triage, fast, delta):
     """Scan a specific repository (owner/name)."""
-    scan_repo(ctx, repo_name, output)
+    if delta:
+        ensure_result_cache(ctx)
+    scan_repo(ctx, repo_name, output, in_memory, jobs, triage, fast, delta)
 
 @cli.command()
 @click.argument('username')
 @click.option('--output', type=click.Choice(['json', 'table']), default='json', help='Output format.')
+@click.option('--in-memory', is_flag=True, help='Scan the downloaded archive in memory instead of extracting it to disk.')
+@click.option('--workers', default=1, type=int, help='Scan N repositories concurrently (downloads on threads, scanning on processes).')
+@click.option('--triage', is_flag=True, help='Check manifests from the git tree first and only download the archive if they score above the configured cutoff.')
+@click.option('--fast', is_flag=True, help='Visit manifests and entrypoints first and stop as soon as the classification can no longer change.')
+@click.option('--delta', is_flag=True, help='Rescan a repository stored at an older commit from the files changed since then (compare API) instead of its archive; implies --cache.')
 @click.pass_context
-def user(ctx, username, output):
+def user(ctx, username, output, in_memory, workers, triage, fast, delta):
     """Scan all repositories for a user."""
-    client = ctx.obj['github_client']
-    for repo_meta in client.get_user_repos(username):
-        scan_repo(ctx, repo_meta.full_name, output)
+    client = github_client(ctx)
+    repo_names = (repo_meta.full_name for repo_meta in client.get_user_repos(username))
+    if delta:
+        ensure_result_cache(ctx)
+    scan_many(ctx, repo_names, output, in_memory, workers, triage, fast, delta)
 
 @cli.command()
 @click.argument('org')
 @click.option('--output', type=click.Choice(['json', 'table']), default='json', help='Output format.')
+@click.option('--in-memory', is_flag=True, help='Scan the downloaded archive in memory instead of extracting it to disk.')
+@click.option('--workers', default=1, type=int, help='Scan N repositories concurrently (downloads on threads, scanning on processes).')
+@click.option('--triage', is_flag=True, help='Check manifests from the git tree first and only download the archive if they score above the configured cutoff.')
+@click.option('--fast', is_flag=True, help='Visit manifests and entrypoints first and stop as soon as the classification can no longer change.')
+@click.option('--delta', is_flag=True, help='Rescan a repository stored at an older commit from the files changed since then (compare API) instead of its archive; implies --cache.')
 @click.pass_context
-def org(ctx, org, output):
+def org(ctx, org, output, in_memory, workers, triage, fast, delta):
     """Scan all repositories for an organization."""
-    client = ctx.obj['github_client']
-    for repo_meta in client.get_org_repos(org):
-        scan_repo(ctx, repo_meta.full_name, output)
+    client = github_client(ctx)
+    repo_names = (repo_meta.full_name for repo_meta in client.get_org_repos(org))
+    if delta:
+        ensure_result_cache(ctx)
+    scan_many(ctx, repo_names, output, in_memory, workers, triage, fast, delta)
 
 @cli.command()
 @click.argument('path')
 @click.option('--output', type=click.Choice(['json', 'table']), default='json', help='Output format.')
+@click.option('--jobs', default=1, type=int, help='Scan files of a repository on N processes.')
+@click.option('--incremental', is_flag=True, help='Keep a per-file index and only rescan files that changed since the last run.')
+@click.option('--watch', is_flag=True, help='Keep running and re-classify whenever files change (implies --incremental).')
+@click.option('--interval', default=2.0, type=float, help='Polling interval in seconds for --watch.')
+@click.option('--fast', is_flag=True, help='Visit manifests and entrypoints first and stop as soon as the classification can no longer change.')
 @click.pass_context
-def local(ctx, path, output):
+def local(ctx, path, output, jobs, incremental, watch, interval, fast):
     """Scan a local directory."""
-    scan_local(ctx, path, output)
+    if incremental or watch:
+        scan_local_incremental(ctx, path, output, watch, interval)
+    else:
+        scan_local(ctx, path, output, jobs, fast)
+
+@cli.command()
+@click.option('--all', 'show_all', is_flag=True, help='List every repository, not only those whose classification changed.')
+@click.option('--history', is_flag=True, help='Rescore every archived scan instead of only the latest one per repository.')
+@click.pass_context
+def rescore(ctx, show_all, history):
+    """Re-classify archived scans (see --archive) under the current config."""
+    from ..scanner.rescore import Rescorer
+
+    archive = IndicatorArchive(os.path.join(ctx.obj['cache_dir'], "archive"))
+    if not archive.repos:
+        logger.error("The archive is empty; scan with --archive first.")
+        return
+
+    try:
+        rescorer = Rescorer(ctx.obj['config'])
+    except RuntimeError as e:
+        logger.error(str(e))
+        return
+
+    started = time.perf_counter()
+    result = rescorer.run(archive, latest_only=not history)
+    elapsed = time.perf_counter() - started
+    from rich.table import Table
+
+    console().print(f"Rescored {len(result.repos)} scan(s) ({archive.size} entries) in {elapsed:.2f}s")
+
+    table = Table(title="Rescore")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Archived", style="yellow")
+    table.add_column("Now", style="magenta")
+    table.add_column("Confidence", style="green")
+    rows = range(len(result.repos)) if show_all else result.changed()
+    for i in rows:
+        repo = result.repos[i]
+        name = repo["repository"] + (" (partial)" if repo.get("partial") else "")
+        table.add_row(name, repo["classification"], result.labels[i], f"{result.confidence[i]:.2f}")
+    console().print(table)
+
+    summary = Table(title="Classifications")
+    summary.add_column("Classification", style="cyan")
+    summary.add_column("Archived", style="yellow")
+    summary.add_column("Now", style="magenta")
+    for label in ("SERVER", "PROTOCOL_RELATED", "CLIENT", "UNKNOWN"):
+        before = sum(1 for repo in result.repos if repo["classification"] == label)
+        summary.add_row(label, str(before), str(result.labels.count(label)))
+    console().print(summary)
+
+@cli.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Address to listen on.')
+@click.option('--port', default=8765, show_default=True, type=int, help='Port to listen on.')
+@click.option('--socket', 'socket_path', default=None, help='Listen on this Unix socket instead of host:port.')
+@click.option('--workers', default=2, show_default=True, type=int, help='Scanner processes kept warm (downloads use twice as many threads).')
+@click.option('--triage', is_flag=True, help='Check manifests from the git tree first and only download the archive if they score above the configured cutoff.')
+@click.option('--fast', is_flag=True, help='Visit manifests and entrypoints first and stop as soon as the classification can no longer change.')
+@click.option('--delta', is_flag=True, help='Rescan a repository stored at an older commit from the files changed since then (compare API) instead of its archive; implies --cache.')
+@click.option('--max-jobs', default=1000, show_default=True, type=int, help='Finished jobs kept for lookup.')
+@click.pass_context
+def serve(ctx, host, port, socket_path, workers, triage, fast, delta, max_jobs):
+    """Run a scan service with warm scanners behind a local JSON API."""
+    from ..scanner.service import ScanService, make_server
+
+    if delta:
+        ensure_result_cache(ctx)
+    sink = ctx.obj['sink']
+    archived = {"config": ctx.obj['config'], "archive": ctx.obj['archive']}
+
+    def on_result(result: ScanResult, config: dict):
+        if not ctx.obj['quiet']:
+            logger.info(f"{result.repository}: {result.classification} ({result.confidence:.2f})")
+        if archived["archive"] and result.classification != "ERROR" and not result.from_cache:
+            # Archived features refer to pattern names of the config they were scanned with
+            if config != archived["config"]:
+                archived["config"] = config
+                archived["archive"] = IndicatorArchive(os.path.join(ctx.obj['cache_dir'], "archive"), config)
+            archived["archive"].append(result)
+        if sink:
+            sink.write(result)
+
+    service = ScanService(
+        ctx.obj['config_path'],
+        ctx.obj['languages_path'],
+        github_client(ctx),
+        repo_fetcher(ctx),
+        workers=workers,
+        max_jobs=max_jobs,
+        batch_options=dict(
+            cache=ctx.obj['result_cache'],
+            async_client=async_client(ctx),
+            triage=triage,
+            fast=fast,
+            collect_metrics=ctx.obj['metrics'],
+            profile_dir=ctx.obj['profile_dir'],
+            memo_path=ctx.obj['memo_path'],
+            delta=delta
+        ),
+        on_result=on_result
+    )
+    address = socket_path or f"http://{host}:{port}"
+    try:
+        server = make_server(service, host, port, socket_path)
+    except OSError as e:
+        service.close()
+        raise click.ClickException(f"Cannot listen on {address}: {e}")
+
+    # SIGHUP re-reads the config files; SIGTERM shuts down like Ctrl+C
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda *_: service.reload(force=True))
+    signal.signal(signal.SIGTERM, _interrupt)
+    console().print(f"[green]Serving on {address}[/green] (POST /scan, GET /jobs/<id>, POST /reload, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+        close_async_client(ctx)
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def scan_many(ctx, repo_names, output_format, in_memory=False, workers=1, triage=False, fast=False, delta=False):
+    if workers <= 1:
+        for repo_full_name in repo_names:
+            scan_repo(ctx, repo_full_name, output_format, in_memory, triage=triage, fast=fast, delta=delta)
+        return
+
+    from ..scanner.batch import BatchScanner
+
+    # Batch mode always scans archives in memory inside the worker processes
+    batch = BatchScanner(
+        ctx.obj['config'],
+        ctx.obj['languages'],
+        github_client(ctx),
+        repo_fetcher(ctx),
+        workers=workers,
+        cache=ctx.obj['result_cache'],
+        cfg_hash=ctx.obj['config_hash'],
+        async_client=async_client(ctx),
+        triage=triage,
+        fast=fast,
+        collect_metrics=ctx.obj['metrics'],
+        profile_dir=ctx.obj['profile_dir'],
+        memo_path=ctx.obj['memo_path'],
+        delta=delta
+    )
+    try:
+        for result in batch.run(repo_names):
+            emit_result(ctx, result, output_format)
+    finally:
+        close_async_client(ctx)
+
+def repo_metrics(ctx, name: str):
+    """Collects ScanMetrics (and a profile) for one scan when --metrics/--profile is on."""
+    if not ctx.obj['metrics']:
+        return nullcontext()
+    profile_dir = ctx.obj['profile_dir']
+    return scan_metrics.collect(scan_metrics.profile_path(profile_dir, name) if profile_dir else None)
+
+def scan_repo(ctx, repo_full_name, output_format, in_memory=False, jobs=1, triage=False, fast=False, delta=False):
+    with repo_metrics(ctx, repo_full_name):
+        _scan_repo(ctx, repo_full_name, output_format, in_memory, jobs, triage, fast, delta)
+
+def _scan_repo(ctx, repo_full_name, output_format, in_memory=False, jobs=1, triage=False, fast=False, delta=False):
+    from ..scanner.repo_fetcher import RepoFetcher
+    from ..scanner.triage import Triage
 
-def scan_repo(ctx, repo_full_name, output_format):
     config = ctx.obj['config']
     langs = ctx.obj['languages']
     token = ctx.obj['token']
     
-    client = ctx.obj['github_client']
-    fetcher = ctx.obj['repo_fetcher']
+    client = github_client(ctx)
+    fetcher = repo_fetcher(ctx)
+    cache = ctx.obj['result_cache']
     
     try:
         if "/" not in repo_full_name:
@@ -100,48 +394,66 @@ def scan_repo(ctx, repo_full_name, output_format):
         # 1. Get Metadata
         # metadata = client.get_repo_metadata(owner, name) # Optional optimization
         
+        # Resolve the head commit first so an unchanged repo skips the download
+        commit_sha = None
+        if cache:
+            with scan_metrics.stage("metadata"):
+                commit_sha = client.get_head_sha(owner, name)
+            cached = cache.get(repo_full_name, commit_sha, ctx.obj['config_hash'], triaged=triage, stopped_early=fast)
+            if cached:
+                logger.info(f"Using cached result for {repo_full_name}@{commit_sha[:7]}")
+                output_result(ctx, cached, output_format)
+                return
+            if delta:
+                with scan_metrics.stage("delta"):
+                    result = delta_rescan(ctx, owner, name, repo_full_name, commit_sha)
+                if result is not None:
+                    cache.put(result, ctx.obj['config_hash'])
+                    emit_result(ctx, result, output_format)
+                    return
+        
+        # Triage: manifests only; skip the archive when they show no MCP signal
+        if triage:
+            with scan_metrics.stage("triage"):
+                outcome = Triage(config).run(
+                    client.get_tree(owner, name, commit_sha),
+                    lambda blob_sha: client.get_blob(owner, name, blob_sha)
+                )
+            if not outcome.passed:
+                logger.info(f"Triage score {outcome.score:.2f} for {repo_full_name}; skipping archive download")
+                result = outcome.to_result(config, repo_full_name, commit_sha)
+                if cache:
+                    cache.put(result, ctx.obj['config_hash'])
+                emit_result(ctx, result, output_format)
+                return
+        
         # 2. Download and Extract
-        url = client.get_archive_url(owner, name)
+        url = client.get_archive_url(owner, name, commit_sha)
         
-        with fetcher.fetch_repo_zip(url) as repo_path:
-            # 3. Initialize Scanners
-            scanners = [
-                KeywordScanner(config),
-                DependencyScanner(),
-                ASTScanner() 
-            ]
-            
-            file_filter = FileFilter(langs.get('languages', {}))
-            
-            all_indicators = []
-            files_scanned = 0
-            file_extensions_seen = set()
-            
-            # 4. Scan Loop
-            for file_data in file_filter.walk_repo(repo_path):
-                files_scanned += 1
-                file_extensions_seen.add(file_data.extension)
-                
-                for scanner in scanners:
-                    indicators = scanner.scan(file_data.path, file_data.content)
-                    all_indicators.extend(indicators)
+        # In-memory mode reads members straight out of the ZIP, skipping extraction.
+        # Delta rescans need root-relative indicator paths, which only it records.
+        in_memory = in_memory or delta
+        source = fetcher.fetch_repo_archive(url) if in_memory else fetcher.fetch_repo_zip(url)
+        
+        with source as repo:
+            file_filter = FileFilter.from_config(langs, config)
+            if in_memory:
+                files = file_filter.walk_zip(repo, prioritize=fast)
+            else:
+                files = file_filter.walk_repo(repo, prioritize=fast)
             
-            # 5. Classify
-            classifier = Classifier(config)
-            classification = classifier.classify(all_indicators)
-            confidence = classifier.get_confidence(all_indicators)
+            # 3. Scan Loop
+            stop = EarlyStop(config) if fast else None
+            all_indicators, files_scanned, file_extensions_seen = run_scanners(ctx, files, jobs, stop)
             
-            # 6. Result
-            result = ScanResult(
-                repository=repo_full_name,
-                classification=classification,
-                confidence=confidence,
-                indicators=all_indicators,
-                languages_detected=list(file_extensions_seen),
-                files_scanned=files_scanned
-            )
+            # 4. Classify & Result
+            result = build_result(config, repo_full_name, all_indicators, files_scanned, file_extensions_seen)
+            result.commit_sha = commit_sha or (RepoFetcher.archive_commit_sha(repo) if in_memory else None)
+            result.stopped_early = bool(stop and stop.triggered)
             
-            output_result(result, output_format)
+        if cache:
+            cache.put(result, ctx.obj['config_hash'])
+        emit_result(ctx, result, output_format)
 
     except Exception as e:
         error_msg = str(e)
@@ -151,9 +463,33 @@ def scan_repo(ctx, repo_full_name, output_format):
         logger.error(f"Failed to scan {repo_full_name}: {error_msg}")
         # In a batch process, we might want to return an error result instead of just logging
         err_res = ScanResult(repository=repo_full_name, classification="ERROR")
-        output_result(err_res, output_format)
+        output_result(ctx, err_res, output_format)
+
+def delta_rescan(ctx, owner, name, repo_full_name, commit_sha):
+    """Result from the compare API since the last stored scan (see Delta), or None."""
+    from ..scanner.delta import Delta
+
+    client = github_client(ctx)
+    previous = ctx.obj['result_cache'].latest(repo_full_name, ctx.obj['config_hash'])
+    if not Delta.applies_to(previous):
+        return None
+    if 'delta' not in ctx.obj:
+        ctx.obj['delta'] = Delta(ctx.obj['config'], ctx.obj['languages'], ctx.obj['snapshot'].scanners)
+    try:
+        comparison = client.compare(owner, name, previous.commit_sha, commit_sha)
+        return ctx.obj['delta'].run(
+            repo_full_name, commit_sha, previous, comparison,
+            lambda blob_sha: client.get_blob(owner, name, blob_sha)
+        )
+    except Exception as e:
+        logger.info(f"No delta rescan for {repo_full_name} ({e}); scanning the archive")
+        return None
+
+def scan_local(ctx, path, output_format, jobs=1, fast=False):
+    with repo_metrics(ctx, path):
+        _scan_local(ctx, path, output_format, jobs, fast)
 
-def scan_local(ctx, path, output_format):
+def _scan_local(ctx, path, output_format, jobs=1, fast=False):
     config = ctx.obj['config']
     langs = ctx.obj['languages']
     
@@ -162,68 +498,115 @@ def scan_local(ctx, path, output_format):
         return
 
     try:
-        # 1. Initialize Scanners
-        scanners = [
-            KeywordScanner(config),
-            DependencyScanner(),
-            ASTScanner() 
-        ]
-        
-        file_filter = FileFilter(langs.get('languages', {}))
-        
-        all_indicators = []
-        files_scanned = 0
-        file_extensions_seen = set()
+        file_filter = FileFilter.from_config(langs, config)
         
-        # 2. Scan Loop
-        for file_data in file_filter.walk_repo(path):
-            files_scanned += 1
-            file_extensions_seen.add(file_data.extension)
-            
-            for scanner in scanners:
-                indicators = scanner.scan(file_data.path, file_data.content)
-                all_indicators.extend(indicators)
-        
-        # 3. Classify
-        classifier = Classifier(config)
-        classification = classifier.classify(all_indicators)
-        confidence = classifier.get_confidence(all_indicators)
+        # 1. Scan Loop
+        stop = EarlyStop(config) if fast else None
+        files = file_filter.walk_repo(path, prioritize=fast)
+        all_indicators, files_scanned, file_extensions_seen = run_scanners(ctx, files, jobs, stop)
         
-        # 4. Result
-        result = ScanResult(
-            repository=path,
-            classification=classification,
-            confidence=confidence,
-            indicators=all_indicators,
-            languages_detected=list(file_extensions_seen),
-            files_scanned=files_scanned
-        )
+        # 2. Classify & Result
+        result = build_result(config, path, all_indicators, files_scanned, file_extensions_seen)
+        result.stopped_early = bool(stop and stop.triggered)
         
-        output_result(result, output_format)
+        emit_result(ctx, result, output_format)
 
     except Exception as e:
         logger.error(f"Failed to scan {path}: {e}")
 
 
-def output_result(result: ScanResult, fmt: str):
-    # 1. Save Full JSON to File
+def scan_local_incremental(ctx, path, output_format, watch=False, interval=2.0):
+    from ..scanner.file_index import FileIndex, IncrementalScanner
+
+    config = ctx.obj['config']
+    langs = ctx.obj['languages']
+    
+    if not os.path.exists(path):
+        logger.error(f"Path not found: {path}")
+        return
+
+    file_filter = FileFilter.from_config(langs, config)
+    index = FileIndex.for_root(ctx.obj['cache_dir'], path, ctx.obj['config_hash'])
+    scanner = IncrementalScanner(ctx.obj['snapshot'].scanners, file_filter, index)
+
+    first = True
+    try:
+        while True:
+            try:
+                with repo_metrics(ctx, path):
+                    all_indicators, files_scanned, file_extensions_seen, changed = scanner.scan(path)
+                    # In watch mode only report again when something changed
+                    if first or changed:
+                        logger.info(f"{changed} of {files_scanned} file(s) changed since the last scan")
+                        result = build_result(config, path, all_indicators, files_scanned, file_extensions_seen)
+                        emit_result(ctx, result, output_format)
+            except Exception as e:
+                logger.error(f"Failed to scan {path}: {e}")
+            first = False
+            if not watch:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+def run_scanners(ctx, files, jobs=1, stop=None):
+    config = ctx.obj['config']
+    # Early termination needs files in order, so --fast always scans sequentially
+    if jobs > 1 and stop is None:
+        return scan_files_parallel(config, files, jobs, languages=ctx.obj['languages'], memo_path=ctx.obj['memo_path'])
+    if jobs > 1:
+        logger.info("--fast scans files sequentially; ignoring --jobs")
+    return scan_files(ctx.obj['snapshot'].scanners, files, stop, blob_memo(ctx))
+
+def emit_result(ctx, result: ScanResult, fmt: str):
+    # Cache hits were archived when they were scanned; they are only output,
+    # as scan_repo does with its own hits
+    archive = ctx.obj['archive']
+    if archive and result.classification != "ERROR" and not result.from_cache:
+        archive.append(result)
+    output_result(ctx, result, fmt)
+
+def save_result(result: ScanResult, quiet: bool = False):
     try:
-        results_dir = "results"
+        results_dir = RESULTS_DIR
         if not os.path.exists(results_dir):
             os.makedirs(results_dir)
             
-        safe_name = result.repository.replace("/", "_").replace("\\", "_").replace(":", "")
+        safe_name = safe_filename(result.repository)
         timestamp = result.timestamp.replace(":", "-").split(".")[0]
         filename = f"{results_dir}/{safe_name}_{timestamp}.json"
         
         with open(filename, 'w') as f:
             f.write(result.model_dump_json(indent=2))
         
-        console.print(f"[green]Full results saved to: {filename}[/green]")
+        if not quiet:
+            console().print(f"[green]Full results saved to: {filename}[/green]")
         
     except Exception as e:
         logger.error(f"Failed to save results file: {e}")
 
+def output_result(ctx, result: ScanResult, fmt: str):
+    # Metrics of a scan running in this thread; batch results bring their own
+    metrics = scan_metrics.current()
+    if metrics is not None and result.metrics is None:
+        result.metrics = metrics.as_dict()
+
+    quiet = ctx.obj['quiet']
+    sink = ctx.obj['sink']
+
+    # 1. Save Full JSON to File (or one line of the --ndjson stream)
+    if sink:
+        try:
+            sink.write(result)
+        except Exception as e:
+            logger.error(f"Failed to write result of {result.repository}: {e}")
+    else:
+        save_result(result, quiet)
+
+    if quiet:
+        return
+    from rich.table import Table
+
     # 2. Print Summary to Console (Always, unless logic changes)
     # The user requested: "just show the confidence score and file name or path where the keywords matched"
     
@@ -236,26 +619,54 @@ def output_result(result: ScanResult, fmt: str):
     table.add_row("Files Scanned", str(result.files_scanned))
     table.add_row("Languages", ", ".join(result.languages_detected))
     
-    console.print(table)
+    console().print(table)
     
     if result.indicators:
         ind_table = Table(title="Indicators Found (Summary)")
         ind_table.add_column("Type", style="cyan")
         ind_table.add_column("Value", style="green")
         ind_table.add_column("File Path", style="yellow")
+        ind_table.add_column("Hits", style="magenta")
         
-        # Sort by score/weight if possible, or just take top few
-        # Showing full path might be long, so maybe relative or basename
-        for ind in result.indicators[:15]: # Limit to top 15
+        # Repeated hits of the same value in one file collapse into one row
+        rows = IndicatorStore(result.indicators).aggregate()
+        for ind, count in rows[:15]: # Limit to top 15
             ind_table.add_row(
                 ind.type, 
                 ind.value, 
-                ind.file if ind.file else "N/A"
+                ind.file if ind.file else "N/A",
+                str(count)
             )
         
-        console.print(ind_table)
-        if len(result.indicators) > 15:
-            console.print(f"... and {len(result.indicators) - 15} more indicators (see full JSON file).")
+        console().print(ind_table)
+        if len(rows) > 15:
+            console().print(f"... and {len(rows) - 15} more indicators (see the full JSON result).")
+
+    if result.metrics:
+        output_metrics(result.metrics)
+
+def output_metrics(metrics: dict):
+    from rich.table import Table
+
+    table = Table(title="Metrics")
+    table.add_column("Section", style="cyan")
+    table.add_column("Name", style="green")
+    table.add_column("Value", style="magenta", justify="right")
+    for name, seconds in sorted(metrics.get("stages", {}).items(), key=lambda kv: -kv[1]):
+        table.add_row("stage", name, f"{seconds:.3f}s")
+    for name, entry in sorted(metrics.get("scanners", {}).items(), key=lambda kv: -kv[1]["seconds"]):
+        table.add_row("scanner", name, f"{entry['seconds']:.3f}s / {entry['files']} files")
+    # The slowest patterns; "(combined)" is the shared pass of all embeddable ones
+    patterns = sorted(metrics.get("patterns", {}).items(), key=lambda kv: -kv[1]["seconds"])
+    for name, entry in patterns[:5]:
+        table.add_row("pattern", name, f"{entry['seconds']:.3f}s / {entry['files']} files")
+    for name, value in metrics.get("counters", {}).items():
+        table.add_row("counter", name, str(value))
+    for reason, value in metrics.get("skipped", {}).items():
+        table.add_row("skipped", reason, str(value))
+    console().print(table)
+    if metrics.get("profile"):
+        console().print(f"[green]Profile saved to: {metrics['profile']}[/green] (python -m pstats)")
 
 if __name__ == '__main__':
     cli()
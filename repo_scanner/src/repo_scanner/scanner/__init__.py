@@ -1,9 +1,36 @@
-from .result import ScanResult, Indicator, RepoMetadata
-from .github_client import GitHubClient
-from .repo_fetcher import RepoFetcher
-from .file_filter import FileFilter
-from .scanners.keyword_scanner import KeywordScanner
-from .scanners.dependency_scanner import DependencyScanner
-from .scanners.ast_scanner import ASTScanner
-from .classifier import Classifier
-# from .utils import setup_logger, load_config
+import importlib
+
+# Public name -> submodule. Imported on first access, so importing one
+# submodule (e.g. for a local scan) does not pull in requests and friends.
+_EXPORTS = {
+    "ScanResult": ".result",
+    "Indicator": ".result",
+    "RepoMetadata": ".result",
+    "CompactIndicator": ".indicator_store",
+    "IndicatorStore": ".indicator_store",
+    "IndicatorArchive": ".indicator_archive",
+    "BlobMemo": ".blob_memo",
+    "GitHubClient": ".github_client",
+    "RepoFetcher": ".repo_fetcher",
+    "FileFilter": ".file_filter",
+    "KeywordScanner": ".scanners.keyword_scanner",
+    "DependencyScanner": ".scanners.dependency_scanner",
+    "ASTScanner": ".scanners.ast_scanner",
+    "Classifier": ".classifier",
+    "load_config": ".utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,238 @@
+import asyncio
+import base64
+import threading
+import time
+from typing import AsyncGenerator, Awaitable, List, Optional, TypeVar
+import requests
+from requests.adapters import HTTPAdapter
+from .result import RepoMetadata
+from .github_client import GitHubClient
+from .utils import logger
+
+T = TypeVar("T")
+
+
+class TokenState:
+    """
+    Rate-limit bookkeeping for one token, fed by x-ratelimit-* headers.
+
+    Requests are paced so the remaining budget is spread evenly over the time
+    left until the window resets, instead of bursting until GitHub throttles.
+    """
+
+    def __init__(self, token: Optional[str], reserve: int = 10):
+        self.token = token
+        self.reserve = reserve
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.next_slot = 0.0
+
+    def ready_at(self, now: float) -> float:
+        ready = max(self.next_slot, self.blocked_until)
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at > now:
+            ready = max(ready, self.reset_at)
+        return ready
+
+    def reserve_slot(self, now: float):
+        start = max(now, self.ready_at(now))
+        interval = 0.0
+        if self.remaining is not None:
+            if self.reset_at <= start:
+                # The window has rolled over; wait for the next response to learn the new budget
+                self.remaining = None
+            else:
+                budget = max(self.remaining - self.reserve, 1)
+                interval = (self.reset_at - start) / budget
+                self.remaining -= 1
+        self.next_slot = start + interval
+        return start
+
+    def update(self, headers):
+        if "x-ratelimit-remaining" not in headers:
+            return
+        remaining = int(headers["x-ratelimit-remaining"])
+        reset_at = float(headers.get("x-ratelimit-reset", 0))
+        # Answers can arrive out of order; within one window the lowest count is the freshest
+        if reset_at != self.reset_at or self.remaining is None:
+            self.remaining = remaining
+            self.reset_at = reset_at
+        else:
+            self.remaining = min(self.remaining, remaining)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+
+class AsyncGitHubClient:
+    """
+    Asyncio GitHub client with proactive rate-limit scheduling.
+
+    Requests are spread over a pool of tokens: each request goes to the token
+    that can send soonest under its own pacing, so throughput stays near the
+    combined ceiling. Primary limits (remaining = 0) park a token until its
+    reset, secondary limits (retry-after) park it for the given time, and the
+    request is retried on whichever token is free next.
+
+    HTTP I/O goes through one pooled requests.Session per token, run off the
+    event loop with asyncio.to_thread, so no extra dependency is needed.
+    """
+
+    def __init__(self, tokens: List[str] = None, base_url: str = None,
+                 max_concurrency: int = 16, max_retries: int = 5):
+        self.base_url = base_url or GitHubClient.BASE_URL
+        self.max_retries = max_retries
+        self.states = [TokenState(t) for t in (tokens or [None])]
+        self.sessions = {}
+        for state in self.states:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Accept": "application/vnd.github.v3+json"})
+            if state.token:
+                session.headers.update({"Authorization": f"token {state.token}"})
+            self.sessions[id(state)] = session
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Download threads call call() concurrently; only one may start the loop
+        self._start_lock = threading.Lock()
+
+    def _bind(self):
+        """Creates the lock and semaphore for the running loop (asyncio primitives belong to one loop)."""
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _acquire_token(self) -> TokenState:
+        async with self._lock:
+            now = time.time()
+            state = min(self.states, key=lambda s: s.ready_at(now))
+            start = state.reserve_slot(now)
+        delay = start - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return state
+
+    async def request(self, method: str, endpoint: str, params: dict = None, headers: dict = None) -> requests.Response:
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        if self._lock is None:
+            self._bind()
+
+        for attempt in range(self.max_retries + 1):
+            state = await self._acquire_token()
+            session = self.sessions[id(state)]
+            async with self._semaphore:
+                response = await asyncio.to_thread(session.request, method, url, params=params, headers=headers)
+            state.update(response.headers)
+
+            retry_after = response.headers.get("retry-after")
+            exhausted = response.headers.get("x-ratelimit-remaining") == "0"
+            if response.status_code in (403, 429) and (retry_after is not None or exhausted):
+                if attempt == self.max_retries:
+                    break
+                if retry_after is not None:
+                    # Secondary rate limit
+                    logger.warning(f"Secondary rate limit hit; pausing token for {retry_after}s.")
+                    state.block(float(retry_after))
+                else:
+                    logger.warning("Rate limit exhausted for a token; rotating.")
+                    state.block(max(state.reset_at - time.time(), 0) + 1)
+                continue
+
+            response.raise_for_status()
+            return response
+        raise RuntimeError(f"Giving up on {url} after {self.max_retries} retries "
+                           f"(last answer: {response.status_code})")
+
+    async def get_repo_metadata(self, owner: str, repo: str) -> RepoMetadata:
+        data = (await self.request("GET", f"/repos/{owner}/{repo}")).json()
+        return _repo_metadata(data)
+
+    async def get_head_sha(self, owner: str, repo: str, ref: str = None) -> str:
+        endpoint = f"/repos/{owner}/{repo}/commits/{ref or 'HEAD'}"
+        response = await self.request("GET", endpoint, headers={"Accept": "application/vnd.github.sha"})
+        return response.text.strip()
+
+    async def get_tree(self, owner: str, repo: str, ref: str = None) -> dict:
+        endpoint = f"/repos/{owner}/{repo}/git/trees/{ref or 'HEAD'}"
+        return (await self.request("GET", endpoint, params={"recursive": "1"})).json()
+
+    async def get_blob(self, owner: str, repo: str, blob_sha: str) -> bytes:
+        data = (await self.request("GET", f"/repos/{owner}/{repo}/git/blobs/{blob_sha}")).json()
+        return base64.b64decode(data["content"]) if data.get("encoding") == "base64" else data["content"].encode("utf-8")
+
+    async def compare(self, owner: str, repo: str, base: str, head: str) -> dict:
+        return (await self.request("GET", f"/repos/{owner}/{repo}/compare/{base}...{head}")).json()
+
+    async def get_user_repos(self, username: str) -> AsyncGenerator[RepoMetadata, None]:
+        async for meta in self._paginate_repos(f"/users/{username}/repos"):
+            yield meta
+
+    async def get_org_repos(self, org: str) -> AsyncGenerator[RepoMetadata, None]:
+        async for meta in self._paginate_repos(f"/orgs/{org}/repos"):
+            yield meta
+
+    async def _paginate_repos(self, endpoint: str) -> AsyncGenerator[RepoMetadata, None]:
+        params = {"per_page": 100}
+        while endpoint:
+            response = await self.request("GET", endpoint, params=params)
+            for repo_data in response.json():
+                yield _repo_metadata(repo_data)
+            endpoint = response.links.get("next", {}).get("url")
+            params = None
+
+    def get_archive_url(self, owner: str, repo: str, ref: str = None) -> str:
+        if ref:
+            return f"{self.base_url}/repos/{owner}/{repo}/zipball/{ref}"
+        return f"{self.base_url}/repos/{owner}/{repo}/zipball"
+
+    async def download_archive(self, url: str) -> bytes:
+        logger.info(f"Downloading repository from {url}...")
+        return (await self.request("GET", url)).content
+
+    # Bridging for thread-based callers (e.g. BatchScanner download threads)
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Runs the client's event loop on a background thread, once, and returns the loop."""
+        with self._start_lock:
+            if self._thread is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="async-github-client", daemon=True)
+                thread.start()
+                # Pacing state is shared by every caller, so its primitives live on this loop
+                loop.call_soon_threadsafe(self._bind)
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def call(self, coro: Awaitable[T]) -> T:
+        """Runs a coroutine on the background loop and blocks until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start()).result()
+
+    def close(self):
+        with self._start_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+                self._lock = self._semaphore = None
+        for session in self.sessions.values():
+            session.close()
+
+
+def _repo_metadata(data: dict) -> RepoMetadata:
+    return RepoMetadata(
+        name=data["name"],
+        owner=data["owner"]["login"],
+        full_name=data["full_name"],
+        html_url=data["html_url"],
+        description=data.get("description"),
+        language=data.get("language"),
+        stars=data["stargazers_count"],
+        default_branch=data["default_branch"],
+        updated_at=data["updated_at"]
+    )
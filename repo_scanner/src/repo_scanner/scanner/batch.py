@@ -0,0 +1,251 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from typing import Dict, Generator, Iterable, Optional
+from .result import ScanResult
+from .github_client import GitHubClient
+from .async_github_client import AsyncGitHubClient
+from .repo_fetcher import RepoFetcher
+from .file_filter import FileFilter
+from .result_cache import ResultCache, config_hash
+from .blob_memo import BlobMemo
+from .triage import Triage
+from .delta import Delta
+from .pipeline import EarlyStop, build_scanners, scan_files, build_result
+from .utils import logger
+from . import metrics as scan_metrics
+
+# Per-process scanner state, built once by _init_worker
+_worker = {}
+
+
+def _init_worker(config: Dict, languages: Dict, fast: bool = False, memo_path: Optional[str] = None):
+    _worker["config"] = config
+    _worker["fast"] = fast
+    _worker["scanners"] = build_scanners(config, languages)
+    _worker["file_filter"] = FileFilter.from_config(languages, config)
+    _worker["memo"] = BlobMemo.for_config(memo_path, config, languages) if memo_path else None
+
+
+def _scan_worker_files(repository: str, files) -> ScanResult:
+    fast = _worker["fast"]
+    stop = EarlyStop(_worker["config"]) if fast else None
+    memo = _worker["memo"]
+    indicators, files_scanned, extensions = scan_files(_worker["scanners"], files, stop, memo)
+    if memo is not None:
+        memo.flush()
+    result = build_result(_worker["config"], repository, indicators, files_scanned, extensions)
+    result.stopped_early = bool(stop and stop.triggered)
+    return result
+
+
+def _scan_archive(repo_full_name: str, data: bytes, collect_metrics: bool = False,
+                  profile_path: Optional[str] = None) -> ScanResult:
+    """Runs in a worker process: scans a downloaded zipball without extracting it."""
+    with scan_metrics.collect(profile_path) if collect_metrics else nullcontext() as metrics:
+        with RepoFetcher.open_archive(data) as archive:
+            files = _worker["file_filter"].walk_zip(archive, prioritize=_worker["fast"])
+            result = _scan_worker_files(repo_full_name, files)
+            result.commit_sha = RepoFetcher.archive_commit_sha(archive)
+    if metrics is not None:
+        result.metrics = metrics.as_dict()
+    return result
+
+
+def _scan_path(path: str, collect_metrics: bool = False, profile_path: Optional[str] = None) -> ScanResult:
+    """Runs in a worker process: scans a local directory."""
+    with scan_metrics.collect(profile_path) if collect_metrics else nullcontext() as metrics:
+        files = _worker["file_filter"].walk_repo(path, prioritize=_worker["fast"])
+        result = _scan_worker_files(path, files)
+    if metrics is not None:
+        result.metrics = metrics.as_dict()
+    return result
+
+
+class BatchScanner:
+    """
+    Scans many repositories concurrently.
+
+    Downloads run on a thread pool and overlap with scanning, which runs on a
+    process pool. At most max_in_flight repositories are downloaded or waiting
+    to be scanned at any time, which bounds memory held by archives. A failing
+    repository yields an ERROR result instead of stopping the batch. With a
+    ResultCache, repositories whose head commit was already scanned under the
+    same config are answered from the cache without downloading; such results
+    have from_cache set. With an AsyncGitHubClient, API calls and downloads are paced and spread over its
+    token pool instead of going through the synchronous client. With triage,
+    only repositories whose manifests pass the Triage cutoff are downloaded.
+    With fast, each archive is scanned manifests-first and stops once its
+    label is settled. With collect_metrics, each result carries a metrics
+    block (see ScanMetrics) combining the download thread and the worker;
+    with profile_dir, both are also profiled into one pstats file per repo.
+    With delta (and a cache), a repository whose last stored result is for
+    an older commit is rescanned from the compare API (see Delta) instead of
+    downloading its archive. With memo_path, the workers share the BlobMemo stored there, so file
+    contents already seen in another repository are not scanned again.
+    """
+
+    def __init__(self, config: Dict, languages: Dict, client: GitHubClient, fetcher: RepoFetcher,
+                 workers: int = 4, max_in_flight: Optional[int] = None,
+                 cache: Optional[ResultCache] = None, cfg_hash: Optional[str] = None,
+                 async_client: Optional[AsyncGitHubClient] = None, triage: bool = False,
+                 fast: bool = False, collect_metrics: bool = False, profile_dir: Optional[str] = None,
+                 memo_path: Optional[str] = None, delta: bool = False):
+        self.config = config
+        self.languages = languages
+        self.client = client
+        self.fetcher = fetcher
+        self.workers = max(1, workers)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.cache = cache
+        self.cfg_hash = cfg_hash or config_hash(config, languages)
+        self.async_client = async_client
+        self.triage = Triage(config) if triage else None
+        self.fast = fast
+        self.profile_dir = profile_dir
+        self.collect_metrics = collect_metrics or profile_dir is not None
+        self.memo_path = memo_path
+        self.delta = Delta(config, languages) if delta and cache else None
+
+    def _head_sha(self, owner: str, name: str) -> str:
+        if self.async_client:
+            return self.async_client.call(self.async_client.get_head_sha(owner, name))
+        return self.client.get_head_sha(owner, name)
+
+    def _triage(self, owner: str, name: str, commit_sha: Optional[str]):
+        if self.async_client:
+            client = self.async_client
+            tree = client.call(client.get_tree(owner, name, commit_sha))
+            return self.triage.run(tree, lambda blob_sha: client.call(client.get_blob(owner, name, blob_sha)))
+        tree = self.client.get_tree(owner, name, commit_sha)
+        return self.triage.run(tree, lambda blob_sha: self.client.get_blob(owner, name, blob_sha))
+
+    def _delta(self, owner: str, name: str, repo_full_name: str, commit_sha: str) -> Optional[ScanResult]:
+        previous = self.cache.latest(repo_full_name, self.cfg_hash)
+        if not Delta.applies_to(previous):
+            return None
+        try:
+            if self.async_client:
+                client = self.async_client
+                comparison = client.call(client.compare(owner, name, previous.commit_sha, commit_sha))
+                return self.delta.run(repo_full_name, commit_sha, previous, comparison,
+                                      lambda blob_sha: client.call(client.get_blob(owner, name, blob_sha)))
+            comparison = self.client.compare(owner, name, previous.commit_sha, commit_sha)
+            return self.delta.run(repo_full_name, commit_sha, previous, comparison,
+                                  lambda blob_sha: self.client.get_blob(owner, name, blob_sha))
+        except Exception as e:
+            logger.info(f"No delta rescan for {repo_full_name} ({e}); scanning the archive")
+            return None
+
+    def _download(self, owner: str, name: str, commit_sha: Optional[str]) -> bytes:
+        if self.async_client:
+            url = self.async_client.get_archive_url(owner, name, commit_sha)
+            with scan_metrics.stage("download"):
+                data = self.async_client.call(self.async_client.download_archive(url))
+            scan_metrics.count("bytes_downloaded", len(data))
+            return data
+        return self.fetcher.download_archive(self.client.get_archive_url(owner, name, commit_sha))
+
+    def _fetch_and_scan(self, cpu_pool: ProcessPoolExecutor, repo_full_name: str) -> ScanResult:
+        if not self.collect_metrics:
+            return self._fetch_and_scan_one(cpu_pool, repo_full_name, None)
+        path = scan_metrics.profile_path(self.profile_dir, repo_full_name) if self.profile_dir else None
+        with scan_metrics.collect(path) as metrics:
+            result = self._fetch_and_scan_one(cpu_pool, repo_full_name, path)
+        # Worker-side stages (walk, scan, classify) join the download thread's
+        metrics.merge(result.metrics)
+        result.metrics = metrics.as_dict()
+        return result
+
+    def _fetch_and_scan_one(self, cpu_pool: ProcessPoolExecutor, repo_full_name: str,
+                            profile_path: Optional[str]) -> ScanResult:
+        try:
+            if "/" not in repo_full_name:
+                raise ValueError(f"Invalid repo name: {repo_full_name}. Must be owner/repo.")
+            owner, name = repo_full_name.split("/")
+
+            commit_sha = None
+            if self.cache:
+                with scan_metrics.stage("metadata"):
+                    commit_sha = self._head_sha(owner, name)
+                cached = self.cache.get(repo_full_name, commit_sha, self.cfg_hash,
+                                        triaged=self.triage is not None, stopped_early=self.fast)
+                if cached:
+                    logger.info(f"Using cached result for {repo_full_name}@{commit_sha[:7]}")
+                    # Already archived when it was scanned
+                    cached.from_cache = True
+                    return cached
+
+            if self.delta:
+                with scan_metrics.stage("delta"):
+                    result = self._delta(owner, name, repo_full_name, commit_sha)
+                if result is not None:
+                    self.cache.put(result, self.cfg_hash)
+                    return result
+
+            if self.triage:
+                with scan_metrics.stage("triage"):
+                    outcome = self._triage(owner, name, commit_sha)
+                if not outcome.passed:
+                    logger.info(f"Triage score {outcome.score:.2f} for {repo_full_name}; skipping archive download")
+                    result = outcome.to_result(self.config, repo_full_name, commit_sha)
+                    if self.cache:
+                        self.cache.put(result, self.cfg_hash)
+                    return result
+
+            data = self._download(owner, name, commit_sha)
+            # The download thread waits for its scan, so a slot is held until the
+            # archive is released.
+            result = cpu_pool.submit(_scan_archive, repo_full_name, data, self.collect_metrics, profile_path).result()
+            result.commit_sha = commit_sha or result.commit_sha
+            if self.cache:
+                self.cache.put(result, self.cfg_hash)
+            return result
+        except Exception as e:
+            error_msg = str(e)
+            if "404" in error_msg:
+                error_msg += " (Hint: Repo might be Private? Check token/typo.)"
+            logger.error(f"Failed to scan {repo_full_name}: {error_msg}")
+            return ScanResult(repository=repo_full_name, classification="ERROR")
+
+    def open_pool(self) -> ProcessPoolExecutor:
+        """Worker processes that build their scanners once, for scan() and scan_path()."""
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.config, self.languages, self.fast, self.memo_path))
+
+    def scan(self, cpu_pool: ProcessPoolExecutor, repo_full_name: str) -> ScanResult:
+        """Fetches and scans one repository on cpu_pool (see open_pool); never raises."""
+        return self._fetch_and_scan(cpu_pool, repo_full_name)
+
+    def scan_path(self, cpu_pool: ProcessPoolExecutor, path: str) -> ScanResult:
+        """Scans a local directory on cpu_pool; never raises."""
+        try:
+            if not os.path.isdir(path):
+                raise ValueError(f"Path not found: {path}")
+            profile_path = scan_metrics.profile_path(self.profile_dir, path) if self.profile_dir else None
+            return cpu_pool.submit(_scan_path, path, self.collect_metrics, profile_path).result()
+        except Exception as e:
+            logger.error(f"Failed to scan {path}: {e}")
+            return ScanResult(repository=path, classification="ERROR")
+
+    def run(self, repo_names: Iterable[str]) -> Generator[ScanResult, None, None]:
+        """Yields one ScanResult per repository, in completion order."""
+        names = iter(repo_names)
+        exhausted = False
+        pending = set()
+
+        with self.open_pool() as cpu_pool, \
+                ThreadPoolExecutor(self.max_in_flight) as io_pool:
+            while pending or not exhausted:
+                # Backpressure: only pull the next repo name when a slot is free
+                while not exhausted and len(pending) < self.max_in_flight:
+                    name = next(names, None)
+                    if name is None:
+                        exhausted = True
+                        break
+                    pending.add(io_pool.submit(self._fetch_and_scan, cpu_pool, name))
+
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from .config_snapshot import code_fingerprint
+from .indicator_store import CompactIndicator
+from .result import FileData
+from .result_cache import config_hash
+from .utils import logger
+
+# Config sections that decide which indicators a file produces. Weights and
+# thresholds only matter when classifying, so tuning them keeps the memo.
+RULE_KEYS = ("keywords", "patterns", "dependencies")
+
+# Pending writes and hit timestamps are flushed in one transaction per this many
+PENDING_LIMIT = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    rules TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    name TEXT NOT NULL,
+    indicators TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (rules, blob, name)
+);
+CREATE INDEX IF NOT EXISTS blobs_used ON blobs (used);
+"""
+
+
+def blob_sha(content: str) -> str:
+    """Git blob SHA-1 of content as read (UTF-8, normalized newlines)."""
+    data = content.encode("utf-8", errors="ignore")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class BlobMemo:
+    """
+    Content-addressed memo of per-file indicators, shared by every repository
+    of a sweep and kept on disk for the next one.
+
+    Entries are keyed by the file's git blob SHA, its file name (which decides
+    the scanners and pattern scopes that apply, see ScanRouter) and a hash of
+    the rules (see rules_hash). Stored indicators omit the file path and get
+    it back on lookup, so a file vendored or forked into many repositories is
+    scanned once. Streamed large files are not memoized.
+
+    The store is one SQLite database, so the worker processes of a batch
+    share it; each opens its own connection on first use. Writes and hit
+    timestamps are buffered and written by flush(). Beyond max_entries the
+    least recently used entries are evicted. Any database error disables the
+    memo for the process and the scan goes on without it.
+    """
+
+    def __init__(self, path: str, rules: str, max_entries: int = 500_000):
+        self.path = path
+        self.rules = rules
+        self.max_entries = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._touched: Dict[Tuple[str, str], None] = {}
+
+    @classmethod
+    def for_config(cls, path: str, config: Dict, languages: Dict) -> "BlobMemo":
+        return cls(path, cls.rules_hash(config, languages))
+
+    @staticmethod
+    def rules_hash(config: Dict, languages: Dict) -> str:
+        """Hash of everything that decides a file's indicators: rules, languages and scanner code."""
+        return config_hash({k: config.get(k) for k in RULE_KEYS}, languages, code_fingerprint())
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=30)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.executescript(_SCHEMA)
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                self._fail(e)
+        return self._db
+
+    def _fail(self, error: Exception):
+        logger.warning(f"Blob memo {self.path} unavailable, scanning without it: {error}")
+        self._disabled = True
+        self._pending.clear()
+        self._touched.clear()
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+            self._db = None
+
+    @staticmethod
+    def key(file_data: FileData) -> Tuple[str, str]:
+        """(blob SHA, file name) of a file, for get() and put()."""
+        return blob_sha(file_data.content), os.path.basename(file_data.path)
+
+    def get(self, key: Tuple[str, str], file_path: str) -> Optional[List[CompactIndicator]]:
+        """The memoized indicators for key, rebound to file_path, or None."""
+        db = self._connect()
+        if db is None:
+            return None
+        stored = self._pending.get(key)
+        if stored is None:
+            try:
+                row = db.execute("SELECT indicators FROM blobs WHERE rules = ? AND blob = ? AND name = ?",
+                                 (self.rules,) + key).fetchone()
+            except sqlite3.Error as e:
+                self._fail(e)
+                return None
+            if row is None:
+                return None
+            stored = row[0]
+            self._touched[key] = None
+        return [CompactIndicator.from_dict(ind, file=file_path) for ind in json.loads(stored)]
+
+    def put(self, key: Tuple[str, str], indicators: List[CompactIndicator]):
+        if self._disabled:
+            return
+        records = []
+        for ind in indicators:
+            data = ind.as_dict()
+            del data["file"]
+            records.append(data)
+        self._pending[key] = json.dumps(records)
+        if len(self._pending) + len(self._touched) >= PENDING_LIMIT:
+            self.flush()
+
+    def flush(self):
+        """Writes buffered entries and hit timestamps, then evicts beyond max_entries."""
+        if not self._pending and not self._touched:
+            return
+        db = self._connect()
+        if db is None:
+            return
+        now = time.time()
+        try:
+            with db:
+                db.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                               [(self.rules, blob, name, stored, now)
+                                for (blob, name), stored in self._pending.items()])
+                db.executemany("UPDATE blobs SET used = ? WHERE rules = ? AND blob = ? AND name = ?",
+                               [(now, self.rules, blob, name) for blob, name in self._touched])
+                excess = db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    # By rowid: a flush stamps all its rows with the same time, so
+                    # a cut by timestamp would drop whole batches
+                    db.execute("DELETE FROM blobs WHERE rowid IN (SELECT rowid FROM blobs ORDER BY used LIMIT ?)",
+                               (excess,))
+        except sqlite3.Error as e:
+            self._fail(e)
+            return
+        self._pending.clear()
+        self._touched.clear()
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -9,8 +9,18 @@ class Classifier:
         self.server_threshold = self.thresholds.get("SERVER", 0.6)
         self.client_threshold = self.thresholds.get("CLIENT", 0.6)
 
+        # Early termination is only sound while scores can never go down
+        dependencies = config.get("dependencies", {})
+        self.monotonic = (
+            all(p.get("score", 1.0) >= 0 for p in config.get("patterns", []))
+            and all(d.get("score", 0.0) >= 0 for d in dependencies.get("packages", []) + dependencies.get("prefixes", []))
+            and all(w >= 0 for w in config.get("weights", {}).values())
+        )
+
     def classify(self, indicators: List[Indicator]) -> str:
-        scores = self.scorer.calculate_score(indicators)
+        return self.label(self.scorer.calculate_score(indicators))
+
+    def label(self, scores: Dict[str, float]) -> str:
         server_score = scores.get("SERVER", 0.0)
         client_score = scores.get("CLIENT", 0.0)
         
@@ -34,6 +44,14 @@ class Classifier:
             
         return "UNKNOWN"
 
+    def is_settled(self, scores: Dict[str, float]) -> bool:
+        """
+        True once more indicators can no longer change the label. SERVER is
+        checked first and scores only grow, so reaching the high threshold for
+        SERVER is final; every other label can still be overtaken.
+        """
+        return self.monotonic and scores.get("SERVER", 0.0) >= self.thresholds.get("high", 8.0)
+
     def get_confidence(self, indicators: List[Indicator]) -> float:
         scores = self.scorer.calculate_score(indicators)
         return max(scores.values())
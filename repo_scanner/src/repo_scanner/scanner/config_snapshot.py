@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from .pipeline import build_scanners
+from .result_cache import config_hash
+from .scanners.base import BaseScanner
+from .utils import logger, load_config, parse_config
+
+# Bumped when the stored layout changes; old snapshots are then ignored
+SNAPSHOT_VERSION = 2
+# Snapshots kept per directory, for switching between a few config files
+MAX_SNAPSHOTS = 8
+
+_SCANNERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scanners")
+
+
+def code_fingerprint() -> str:
+    """Size and mtime of the scanner modules, so cached scanner output never outlives its code."""
+    parts = []
+    for name in sorted(os.listdir(_SCANNERS_DIR)):
+        if name.endswith(".py"):
+            st = os.stat(os.path.join(_SCANNERS_DIR, name))
+            parts.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+    return ";".join(parts)
+
+
+class ConfigSnapshot:
+    """
+    The parsed scanner and languages configs plus what is built from them
+    once per process: the config hash and the scanners (with their compiled
+    rule set and keyword automaton).
+
+    load() stores the parsed configs and their hash as JSON under
+    snapshot_dir, keyed by the contents of both config files, the Python
+    version and the scanner code, so a warm start skips YAML parsing. Only
+    plain data is stored; the scanners are built when first used, which is
+    much cheaper than the YAML parse. Snapshot files are only read when they
+    belong to the current user and neither they nor their directory are
+    writable by others.
+    """
+
+    def __init__(self, config: Dict, languages: Dict, cfg_hash: Optional[str] = None):
+        self.config = config
+        self.languages = languages
+        self.config_hash = cfg_hash or config_hash(config, languages)
+        self._scanners: Optional[List[BaseScanner]] = None
+
+    @property
+    def scanners(self) -> List[BaseScanner]:
+        if self._scanners is None:
+            self._scanners = build_scanners(self.config, self.languages)
+        return self._scanners
+
+    @classmethod
+    def load(cls, config_path: str, languages_path: str, snapshot_dir: Optional[str] = None) -> "ConfigSnapshot":
+        try:
+            texts = cls._read(config_path), cls._read(languages_path)
+        except OSError:
+            # Missing file: load_config reports it; nothing worth caching
+            return cls(load_config(config_path) or {}, load_config(languages_path) or {})
+        if not snapshot_dir:
+            return cls(parse_config(texts[0], config_path) or {}, parse_config(texts[1], languages_path) or {})
+
+        path = os.path.join(snapshot_dir, f"{cls._key(texts)}.json")
+        snapshot = cls._read_snapshot(path)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = cls(parse_config(texts[0], config_path) or {}, parse_config(texts[1], languages_path) or {})
+        if snapshot.config and snapshot.languages:
+            snapshot._write(path)
+        return snapshot
+
+    @staticmethod
+    def _read(path: str) -> str:
+        with open(path, "r") as f:
+            return f.read()
+
+    @staticmethod
+    def _key(texts: Tuple[str, str]) -> str:
+        digest = hashlib.sha256()
+        for part in (str(SNAPSHOT_VERSION), sys.version, code_fingerprint()) + texts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def _trusted(path: str) -> bool:
+        """False if path or its directory could have been planted or changed by another user."""
+        if not hasattr(os, "getuid"):
+            return True
+        for p in (os.path.dirname(path), path):
+            st = os.stat(p)
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                logger.debug(f"Ignoring config snapshot {path}: {p} is not private to this user")
+                return False
+        return True
+
+    @classmethod
+    def _read_snapshot(cls, path: str) -> Optional["ConfigSnapshot"]:
+        try:
+            if not cls._trusted(path):
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable config snapshot {path}: {e}")
+            return None
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return None
+        config, languages, cfg_hash = data.get("config"), data.get("languages"), data.get("config_hash")
+        if not isinstance(config, dict) or not isinstance(languages, dict) or not isinstance(cfg_hash, str):
+            return None
+        return cls(config, languages, cfg_hash)
+
+    def _write(self, path: str):
+        data = {"version": SNAPSHOT_VERSION, "config": self.config, "languages": self.languages,
+                "config_hash": self.config_hash}
+        try:
+            text = json.dumps(data)
+        except (TypeError, ValueError):
+            return
+        # Configs that JSON cannot hold as they are (e.g. non-string keys) are not snapshotted
+        if json.loads(text) != data:
+            return
+        snapshot_dir = os.path.dirname(path)
+        tmp_path = None
+        try:
+            os.makedirs(snapshot_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to write config snapshot {path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._prune(snapshot_dir)
+
+    @staticmethod
+    def _prune(snapshot_dir: str):
+        entries = []
+        with os.scandir(snapshot_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pickle"):
+                    # Left by versions that pickled the scanners
+                    ConfigSnapshot._remove(entry.path)
+                elif entry.name.endswith((".json", ".tmp")):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        for _, path in sorted(entries, reverse=True)[MAX_SNAPSHOTS:]:
+            ConfigSnapshot._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,99 @@
+import io
+import os
+import posixpath
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Optional, Union
+from .result import FileData, ScanResult
+from .indicator_store import CompactIndicator
+from .file_filter import FileFilter
+from .pipeline import build_result, build_scanners, scan_files
+from .streaming import LargeFile
+from .scanners.base import BaseScanner
+from .utils import logger
+
+# GitHub lists at most this many files per comparison; a full list may be cut off
+MAX_COMPARE_FILES = 300
+
+# Comparison statuses whose file list leads from the stored commit to the head.
+# "diverged" (force push) diffs against the merge base instead.
+_LINEAR = ("ahead", "identical")
+
+
+class Delta:
+    """
+    Rescan of a repository from its stored result and a GitHub comparison
+    (compare/<stored commit>...<head>) instead of the whole archive.
+
+    Only added, modified, copied and renamed files that pass the FileFilter
+    are fetched (by blob SHA) and scanned; blobs above max_file_size are
+    streamed in windows, as the archive scan streams them. Indicators of
+    removed, modified and renamed-away files are dropped from the stored
+    result, and the merged set is classified again. run() returns None when the comparison
+    cannot stand in for a full scan: the head is not a descendant of the
+    stored commit, the file list may be truncated, or more than
+    `delta.max_files` files changed.
+    """
+
+    def __init__(self, config: Dict, languages: Dict, scanners: Optional[List[BaseScanner]] = None):
+        self.config = config
+        self.max_files = min(config.get("delta", {}).get("max_files", 100), MAX_COMPARE_FILES - 1)
+        self.file_filter = FileFilter.from_config(languages, config)
+        self.scanners = scanners or build_scanners(config, languages)
+        # Scanner caches are not thread-safe; batch scans call run() from several threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def applies_to(previous: Optional[ScanResult]) -> bool:
+        """
+        True if previous is a complete scan whose indicator paths are relative
+        to the repository root (archive scans; not triaged or stopped early).
+        """
+        if previous is None or not previous.commit_sha or previous.triaged or previous.stopped_early:
+            return False
+        return not any(ind.file and os.path.isabs(ind.file) for ind in previous.indicators)
+
+    def run(self, repository: str, commit_sha: str, previous: ScanResult, comparison: Dict,
+            read_blob: Callable[[str], bytes]) -> Optional[ScanResult]:
+        """comparison is a compare API response; read_blob fetches a blob by SHA."""
+        if comparison.get("status") not in _LINEAR:
+            logger.debug(f"{repository} is {comparison.get('status')} of {previous.commit_sha[:7]}; no delta")
+            return None
+        changes = comparison.get("files", [])
+        if len(changes) > self.max_files:
+            logger.debug(f"{len(changes)} files changed in {repository}; no delta")
+            return None
+
+        dropped = set()
+        removed = added = 0
+        files: List[Union[FileData, LargeFile]] = []
+        for change in changes:
+            path, status = change["filename"], change.get("status")
+            old_path = change.get("previous_filename", path) if status == "renamed" else path
+            if status != "added" and status != "copied":
+                dropped.add(old_path)
+                removed += self.file_filter.accepts(old_path)
+            if status == "removed" or not self.file_filter.accepts(path):
+                continue
+            raw = read_blob(change["sha"])
+            if self.file_filter.is_too_large(len(raw)):
+                continue
+            added += 1
+            extension = posixpath.splitext(path)[1]
+            if self.file_filter.is_large(len(raw)):
+                files.append(LargeFile(path, extension, len(raw), self.file_filter.chunk_size,
+                                       opener=partial(io.BytesIO, raw)))
+            else:
+                files.append(FileData(path=path, content=FileFilter.decode(raw), extension=extension))
+
+        with self._lock:
+            scanned, _, extensions = scan_files(self.scanners, files)
+        kept = [CompactIndicator.from_dict(ind.model_dump()) for ind in previous.indicators if ind.file not in dropped]
+
+        logger.info(f"Delta rescan of {repository}: {len(changes)} file(s) changed since "
+                    f"{previous.commit_sha[:7]}, {len(files)} scanned")
+        result = build_result(self.config, repository, kept + list(scanned),
+                              max(0, previous.files_scanned + added - removed),
+                              set(previous.languages_detected) | extensions)
+        result.commit_sha = commit_sha
+        return result
@@ -1,40 +1,259 @@
 import os
-from typing import Generator, List, Dict
+import zipfile
+from functools import partial
+from typing import Generator, List, Dict, Optional, Tuple, Union
 from repo_scanner.scanner.utils import logger
 from repo_scanner.scanner.result import FileData
+from repo_scanner.scanner.ignore import IgnoreRules
+from repo_scanner.scanner.streaming import LargeFile
+from repo_scanner.scanner import metrics as scan_metrics
+
+# Used when no `ignore` config is given: hidden directories and node_modules/venv
+DEFAULT_IGNORE_GLOBS = [".*/", "node_modules/", "venv/", "__pycache__/"]
 
 class FileFilter:
-    def __init__(self, languages_config: Dict, max_file_size: int = 100 * 1024):
+    def __init__(self, languages_config: Dict, max_file_size: int = 100 * 1024, ignore_config: Optional[Dict] = None,
+                 large_files_config: Optional[Dict] = None):
         self.languages = languages_config
         self.max_file_size = max_file_size
         self.allowed_extensions = set()
         self.special_files = set()
+        self.entrypoints = set()
         
         for lang_config in self.languages.values():
             self.allowed_extensions.update(lang_config.get('extensions', []))
             self.special_files.update(lang_config.get('special_files', []))
+            self.entrypoints.update(lang_config.get('entrypoints', []))
+
+        ignore_config = ignore_config or {}
+        self.ignore_rules = IgnoreRules.from_lines(ignore_config.get('globs', DEFAULT_IGNORE_GLOBS))
+        self.use_gitignore = ignore_config.get('gitignore', False)
+
+        # Files above max_file_size are streamed in windows instead of skipped
+        large_files_config = large_files_config or {}
+        self.stream_large = large_files_config.get('stream', False)
+        self.stream_max_size = large_files_config.get('max_size', 100 * 1024 * 1024)
+        self.chunk_size = large_files_config.get('chunk_size', 1024 * 1024)
+
+    @classmethod
+    def from_config(cls, languages: Dict, config: Dict) -> "FileFilter":
+        """FileFilter for a loaded languages.yaml and scanner_config.yaml."""
+        return cls(languages.get('languages', {}), ignore_config=config.get('ignore'),
+                   large_files_config=config.get('large_files'))
+
+    def is_large(self, size: int) -> bool:
+        return size > self.max_file_size
+
+    def is_too_large(self, size: int) -> bool:
+        if not self.is_large(size):
+            return False
+        return not self.stream_large or size > self.stream_max_size
+
+    def _read_gitignore(self, path: str, rel_dir: str, rules: IgnoreRules) -> IgnoreRules:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return rules.extend(f.read().splitlines(), rel_dir)
+        except OSError as e:
+            logger.warning(f"Error reading {path}: {e}")
+            return rules
+
+    def _is_ignored_dir(self, dir_path: str, seen: Dict[str, bool]) -> bool:
+        """True if dir_path or any of its parents is ignored; memoized in seen."""
+        if not dir_path:
+            return False
+        if dir_path not in seen:
+            parent = dir_path.rpartition('/')[0]
+            seen[dir_path] = self._is_ignored_dir(parent, seen) or self.ignore_rules.ignored(dir_path, True)
+        return seen[dir_path]
+
+    def is_candidate(self, filename: str) -> bool:
+        _, ext = os.path.splitext(filename)
+        return ext in self.allowed_extensions or filename in self.special_files
+
+    def accepts(self, rel_path: str) -> bool:
+        """True if a file at rel_path ('/'-separated, from the repository root) passes the name and ignore rules."""
+        dir_path, _, name = rel_path.rpartition('/')
+        return (self.is_candidate(name) and not self._is_ignored_dir(dir_path, {})
+                and not self.ignore_rules.ignored(rel_path, False))
+
+    @staticmethod
+    def decode(raw: bytes) -> str:
+        """Same decoding and newline handling as open(..., 'r', errors='ignore')."""
+        return raw.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+    def priority(self, rel_path: str) -> Tuple[int, int, str]:
+        """Sort key: manifests, then entrypoints, then everything else; shallow first."""
+        parts = rel_path.replace(os.sep, '/').split('/')
+        name = parts[-1]
+        if name in self.special_files:
+            rank = 0
+        elif name in self.entrypoints:
+            rank = 1
+        else:
+            rank = 2
+        return rank, len(parts), rel_path
+
+    def iter_candidates(self, root_path: str) -> Generator[Tuple[str, str, os.stat_result], None, None]:
+        """
+        Yields (path, extension, stat) for every file that passes the filter,
+        without reading any content. With streaming enabled this includes
+        files above max_file_size (see is_large).
+
+        Walks with os.scandir in the same order as os.walk (a directory's
+        files, then its subdirectories depth-first). Ignored directories are
+        pruned before they are listed, and the stat comes from the DirEntry.
+        With gitignore enabled, each directory's .gitignore applies to its
+        subtree on top of the configured globs.
+        """
+        metrics = scan_metrics.current()
+        stack = [(root_path, "", self.ignore_rules)]
+        while stack:
+            dir_path, rel_dir, rules = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.debug(f"Cannot list {dir_path}: {e}")
+                continue
+
+            if self.use_gitignore:
+                for entry in entries:
+                    if entry.name == '.gitignore' and entry.is_file():
+                        rules = self._read_gitignore(entry.path, rel_dir, rules)
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, symlinked directories are listed but not followed
+                    if entry.is_symlink():
+                        continue
+                    if rules.ignored(rel_path, True):
+                        if metrics is not None:
+                            metrics.skip("ignored_dir")
+                        continue
+                    subdirs.append((entry.path, rel_path, rules))
+                    continue
 
-    def walk_repo(self, root_path: str) -> Generator[FileData, None, None]:
-        for root, dirs, files in os.walk(root_path):
-            # Skip hidden directories and node_modules/venv
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ('node_modules', 'venv', '__pycache__')]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                
                 # Check extension and filename
-                _, ext = os.path.splitext(file)
-                if ext not in self.allowed_extensions and file not in self.special_files:
+                if not self.is_candidate(entry.name):
+                    if metrics is not None:
+                        metrics.skip("extension")
+                    continue
+                if rules.ignored(rel_path, False):
+                    if metrics is not None:
+                        metrics.skip("ignored")
                     continue
+                _, ext = os.path.splitext(entry.name)
                 
                 # Check size
                 try:
-                    if os.path.getsize(file_path) > self.max_file_size:
-                        logger.debug(f"Skipping large file: {file_path}")
-                        continue
-                        
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        yield FileData(path=file_path, content=content, extension=ext)
-                except Exception as e:
-                    logger.warning(f"Error reading file {file_path}: {e}")
+                    st = entry.stat()
+                except OSError as e:
+                    logger.warning(f"Error reading file {entry.path}: {e}")
+                    if metrics is not None:
+                        metrics.skip("read_error")
+                    continue
+                if self.is_too_large(st.st_size):
+                    logger.debug(f"Skipping large file: {entry.path}")
+                    if metrics is not None:
+                        metrics.skip("too_large")
+                    continue
+                yield entry.path, ext, st
+
+            stack.extend(reversed(subdirs))
+
+    @staticmethod
+    def read_file(file_path: str) -> str:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+
+    def walk_repo(self, root_path: str, prioritize: bool = False) -> Generator[Union[FileData, LargeFile], None, None]:
+        metrics = scan_metrics.current()
+        candidates = self.iter_candidates(root_path)
+        if prioritize:
+            candidates = sorted(candidates, key=lambda c: self.priority(os.path.relpath(c[0], root_path)))
+        for file_path, ext, st in candidates:
+            if self.is_large(st.st_size):
+                if metrics is not None:
+                    metrics.count("files_streamed")
+                    metrics.count("bytes_streamed", st.st_size)
+                yield LargeFile(file_path, ext, st.st_size, self.chunk_size)
+                continue
+            try:
+                content = self.read_file(file_path)
+            except Exception as e:
+                logger.warning(f"Error reading file {file_path}: {e}")
+                if metrics is not None:
+                    metrics.skip("read_error")
+                continue
+            if metrics is not None:
+                metrics.count("files_read")
+                metrics.count("bytes_read", st.st_size)
+            yield FileData(path=file_path, content=content, extension=ext)
+
+    def walk_zip(self, archive: zipfile.ZipFile, prioritize: bool = False) -> Generator[Union[FileData, LargeFile], None, None]:
+        """
+        Yields FileData straight from the members of an archive. Extension,
+        special-file, directory and size rules are applied to the central
+        directory entries, so rejected members are never decompressed.
+        Paths are relative to the archive's single top-level folder, if any.
+        With prioritize, manifests and entrypoints come first. The configured
+        ignore globs apply; .gitignore files do not, since an archive only
+        holds committed files.
+        """
+        members = [info for info in archive.infolist() if not info.is_dir()]
+
+        # GitHub zipballs wrap everything in one "owner-repo-sha/" folder
+        prefix = ""
+        tops = {info.filename.split('/', 1)[0] for info in members}
+        if len(tops) == 1 and all('/' in info.filename for info in members):
+            prefix = tops.pop() + '/'
+
+        if prioritize:
+            members.sort(key=lambda info: self.priority(info.filename[len(prefix):]))
+
+        metrics = scan_metrics.current()
+        ignored_dirs: Dict[str, bool] = {}
+        for info in members:
+            rel_path = info.filename[len(prefix):]
+            dir_path, _, file = rel_path.rpartition('/')
+            if not self.is_candidate(file):
+                if metrics is not None:
+                    metrics.skip("extension")
+                continue
+            if self._is_ignored_dir(dir_path, ignored_dirs) or self.ignore_rules.ignored(rel_path, False):
+                if metrics is not None:
+                    metrics.skip("ignored")
+                continue
+
+            if self.is_too_large(info.file_size):
+                logger.debug(f"Skipping large file: {rel_path}")
+                if metrics is not None:
+                    metrics.skip("too_large")
+                continue
+            if self.is_large(info.file_size):
+                _, ext = os.path.splitext(file)
+                if metrics is not None:
+                    metrics.count("files_streamed")
+                    metrics.count("bytes_streamed", info.file_size)
+                yield LargeFile(rel_path, ext, info.file_size, self.chunk_size, opener=partial(archive.open, info))
+                continue
+
+            try:
+                raw = archive.read(info)
+            except Exception as e:
+                logger.warning(f"Error reading archive member {rel_path}: {e}")
+                if metrics is not None:
+                    metrics.skip("read_error")
+                continue
+            if metrics is not None:
+                metrics.count("files_read")
+                metrics.count("bytes_read", len(raw))
+            content = self.decode(raw)
+            _, ext = os.path.splitext(file)
+            yield FileData(path=rel_path, content=content, extension=ext)
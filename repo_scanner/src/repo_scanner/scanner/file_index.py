@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from .indicator_store import CompactIndicator, IndicatorStore
+from .file_filter import FileFilter
+from .streaming import LargeFile
+from .result import FileData
+from .config_snapshot import code_fingerprint
+from .pipeline import ScanRouter, scan_one
+from .scanners.base import BaseScanner
+from .utils import logger
+
+INDEX_VERSION = 1
+
+# Files modified this recently are not trusted on size/mtime alone
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def _without_file(data: Dict) -> Dict:
+    del data["file"]
+    return data
+
+
+class FileIndex:
+    """
+    On-disk per-file index for one local checkout:
+    path -> (size, mtime, content hash, indicators).
+
+    Stored indicators omit the file path and get it back on load, so the same
+    index works whichever way the root was spelled on the command line. The
+    whole index is discarded when the rule configuration or the scanner code
+    changes.
+    """
+
+    def __init__(self, index_path: str, cfg_hash: str):
+        self.index_path = index_path
+        self.cfg_hash = cfg_hash
+        self.code = code_fingerprint()
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self._load()
+
+    @classmethod
+    def for_root(cls, cache_dir: str, root_path: str, cfg_hash: str) -> "FileIndex":
+        root_key = hashlib.sha256(os.path.abspath(root_path).encode("utf-8")).hexdigest()[:16]
+        return cls(os.path.join(cache_dir, "local", f"{root_key}.json"), cfg_hash)
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable index {self.index_path}: {e}")
+            return
+        if (data.get("version") == INDEX_VERSION and data.get("config_hash") == self.cfg_hash
+                and data.get("code") == self.code):
+            self.entries = data.get("files", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        data = {"version": INDEX_VERSION, "config_hash": self.cfg_hash, "code": self.code, "files": self.entries}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.index_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to write index {self.index_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get(self, rel_path: str) -> Optional[Dict]:
+        return self.entries.get(rel_path)
+
+    def put(self, rel_path: str, size: int, mtime_ns: int, content_hash: str, indicators: List[CompactIndicator]):
+        self.entries[rel_path] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "hash": content_hash,
+            "indicators": [_without_file(ind.as_dict()) for ind in indicators],
+        }
+        self.dirty = True
+
+    def touch(self, rel_path: str, size: int, mtime_ns: int):
+        entry = self.entries[rel_path]
+        entry["size"] = size
+        entry["mtime_ns"] = mtime_ns
+        self.dirty = True
+
+    def prune(self, seen: Set[str]) -> int:
+        """Drops entries for files that no longer exist (or no longer pass the filter)."""
+        stale = [p for p in self.entries if p not in seen]
+        for p in stale:
+            del self.entries[p]
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+    @staticmethod
+    def indicators_of(entry: Dict, file_path: str) -> List[CompactIndicator]:
+        return [CompactIndicator.from_dict(ind, file=file_path) for ind in entry["indicators"]]
+
+
+class IncrementalScanner:
+    """
+    Scans a local checkout through a FileIndex: files whose size and mtime are
+    unchanged are not read at all, files whose content hash is unchanged are
+    not rescanned, and only the rest go through the scanners.
+    """
+
+    def __init__(self, scanners: List[BaseScanner], file_filter: FileFilter, index: FileIndex):
+        self.scanners = scanners
+        self.router = ScanRouter(scanners)
+        self.file_filter = file_filter
+        self.index = index
+
+    def scan(self, root_path: str) -> Tuple[IndicatorStore, int, Set[str], int]:
+        """Returns (indicators, files scanned, extensions, files changed since the last scan)."""
+        all_indicators = IndicatorStore()
+        files_scanned = 0
+        file_extensions_seen = set()
+        changed = 0
+        seen = set()
+        racy_before = time.time_ns() - RACY_WINDOW_NS
+
+        for file_path, ext, st in self.file_filter.iter_candidates(root_path):
+            rel_path = os.path.relpath(file_path, root_path)
+            seen.add(rel_path)
+            files_scanned += 1
+            file_extensions_seen.add(ext)
+
+            entry = self.index.get(rel_path)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                all_indicators.extend(FileIndex.indicators_of(entry, file_path))
+                continue
+
+            large = None
+            try:
+                if self.file_filter.is_large(st.st_size):
+                    large = LargeFile(file_path, ext, st.st_size, self.file_filter.chunk_size)
+                    content_hash = large.sha256()
+                else:
+                    content = self.file_filter.read_file(file_path)
+                    content_hash = hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
+            except Exception as e:
+                logger.warning(f"Error reading file {file_path}: {e}")
+                files_scanned -= 1
+                seen.discard(rel_path)
+                continue
+
+            # A file modified within the mtime granularity of this scan could change
+            # again without its stat changing; store no mtime so it gets hashed next time.
+            mtime_ns = st.st_mtime_ns if st.st_mtime_ns < racy_before else 0
+
+            if entry and entry["hash"] == content_hash:
+                # Touched but not modified (checkout, touch, rebase)
+                self.index.touch(rel_path, st.st_size, mtime_ns)
+                all_indicators.extend(FileIndex.indicators_of(entry, file_path))
+                continue
+
+            indicators = scan_one(self.router.route(file_path, ext), large or FileData(path=file_path, content=content, extension=ext))
+            self.index.put(rel_path, st.st_size, mtime_ns, content_hash, indicators)
+            all_indicators.extend(indicators)
+            changed += 1
+
+        changed += self.index.prune(seen)
+        self.index.save()
+        return all_indicators, files_scanned, file_extensions_seen, changed
@@ -1,23 +1,47 @@
+import base64
 import requests
 import time
 from typing import List, Generator, Optional
 from .result import RepoMetadata
+from .http_cache import HttpCache
 from .utils import logger
 
 class GitHubClient:
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, token: str = None):
+    def __init__(self, token: str = None, cache_dir: str = None, base_url: str = None):
         self.token = token
+        # Another API root, e.g. GitHub Enterprise or a local stub for tests
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
         self.session = requests.Session()
         if token:
             self.session.headers.update({"Authorization": f"token {token}"})
         self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
+        # Conditional requests: 304 answers don't count against the rate limit
+        self.http_cache = HttpCache(cache_dir, token or "") if cache_dir else None
+
+    def _request(self, method: str, endpoint: str, params: dict = None, headers: dict = None) -> requests.Response:
+        # Pagination hands back absolute "next" URLs
+        url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        headers = dict(headers or {})
+
+        cache_key = None
+        if self.http_cache and method == "GET":
+            full_url = requests.Request(method, url, params=params).prepare().url
+            cache_key = f"{headers.get('Accept', self.session.headers['Accept'])} {full_url}"
+            headers.update(self.http_cache.validators(cache_key))
 
-    def _request(self, method: str, endpoint: str, params: dict = None) -> requests.Response:
-        url = f"{self.BASE_URL}{endpoint}"
         while True:
-            response = self.session.request(method, url, params=params)
+            response = self.session.request(method, url, params=params, headers=headers)
+            
+            if response.status_code == 304 and cache_key:
+                cached = self.http_cache.replay(cache_key, response)
+                if cached is not None:
+                    return cached
+                # Entry vanished between the lookup and now; ask again unconditionally
+                headers.pop("If-None-Match", None)
+                headers.pop("If-Modified-Since", None)
+                continue
             
             # Handle Rate Limiting
             if response.status_code == 403 and "x-ratelimit-remaining" in response.headers:
@@ -30,6 +54,8 @@ class GitHubClient:
                     continue
             
             response.raise_for_status()
+            if cache_key:
+                self.http_cache.store(cache_key, response)
             return response
 
     def get_repo_metadata(self, owner: str, repo: str) -> RepoMetadata:
@@ -47,6 +73,27 @@ class GitHubClient:
             updated_at=data["updated_at"]
         )
 
+    def get_head_sha(self, owner: str, repo: str, ref: str = None) -> str:
+        """Returns the commit SHA of ref, or of the default branch head when ref is None."""
+        endpoint = f"/repos/{owner}/{repo}/commits/{ref or 'HEAD'}"
+        response = self._request("GET", endpoint, headers={"Accept": "application/vnd.github.sha"})
+        return response.text.strip()
+
+    def get_tree(self, owner: str, repo: str, ref: str = None) -> dict:
+        """Recursive git tree listing: {"tree": [{"path", "type", "sha", "size"}], "truncated": bool}."""
+        endpoint = f"/repos/{owner}/{repo}/git/trees/{ref or 'HEAD'}"
+        return self._request("GET", endpoint, params={"recursive": "1"}).json()
+
+    def get_blob(self, owner: str, repo: str, blob_sha: str) -> bytes:
+        endpoint = f"/repos/{owner}/{repo}/git/blobs/{blob_sha}"
+        data = self._request("GET", endpoint).json()
+        return base64.b64decode(data["content"]) if data.get("encoding") == "base64" else data["content"].encode("utf-8")
+
+    def compare(self, owner: str, repo: str, base: str, head: str) -> dict:
+        """Comparison of two commits: {"status", "files": [{"filename", "status", "sha", ...}], ...}."""
+        endpoint = f"/repos/{owner}/{repo}/compare/{base}...{head}"
+        return self._request("GET", endpoint).json()
+
     def get_user_repos(self, username: str) -> Generator[RepoMetadata, None, None]:
         endpoint = f"/users/{username}/repos"
         yield from self._paginate_repos(endpoint)
@@ -56,13 +103,10 @@ class GitHubClient:
         yield from self._paginate_repos(endpoint)
 
     def _paginate_repos(self, endpoint: str) -> Generator[RepoMetadata, None, None]:
-        params = {"per_page": 100, "page": 1}
-        while True:
-            data = self._request("GET", endpoint, params=params).json()
-            if not data:
-                break
-            
-            for repo_data in data:
+        params = {"per_page": 100}
+        while endpoint:
+            response = self._request("GET", endpoint, params=params)
+            for repo_data in response.json():
                  yield RepoMetadata(
                     name=repo_data["name"],
                     owner=repo_data["owner"]["login"],
@@ -75,12 +119,14 @@ class GitHubClient:
                     updated_at=repo_data["updated_at"]
                 )
             
-            params["page"] += 1
+            # Follow Link: rel="next"; its URL already carries the query string
+            endpoint = response.links.get("next", {}).get("url")
+            params = None
 
     def get_archive_url(self, owner: str, repo: str, ref: str = None) -> str:
         # If ref is None, we need to know the default branch. 
         # But efficiently, we usually just want the default.
         # https://api.github.com/repos/OWNER/REPO/zipball/REF
         if ref:
-            return f"{self.BASE_URL}/repos/{owner}/{repo}/zipball/{ref}"
-        return f"{self.BASE_URL}/repos/{owner}/{repo}/zipball"
+            return f"{self.base_url}/repos/{owner}/{repo}/zipball/{ref}"
+        return f"{self.base_url}/repos/{owner}/{repo}/zipball"
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from .utils import logger
+
+# Response headers worth replaying from a cached entry
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+# Size eviction trims the cache to this fraction of max_bytes (see ResultCache)
+EVICT_TO = 0.9
+
+
+class HttpCache:
+    """
+    On-disk ETag/Last-Modified cache for GET requests.
+
+    validators() returns the conditional headers for a request key (URL plus
+    Accept header); a 304 answer is then turned back into the stored response
+    by replay(). Keys are combined with a hash of the credentials, so
+    responses are never shared between tokens.
+
+    Entries unused for max_age seconds are dropped, and beyond max_bytes the
+    least recently used ones are evicted. As in ResultCache, the size is
+    tracked as entries are stored and the directory is only scanned on the
+    first store and when the budget is exceeded.
+    """
+
+    def __init__(self, cache_dir: str, identity: str = "", max_bytes: int = 128 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.identity = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # Estimated size of the entries, None until the first evict()
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(f"{self.identity}\0{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("key") == key else None
+
+    def validators(self, key: str) -> Dict[str, str]:
+        entry = self._load(key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def replay(self, key: str, not_modified: requests.Response) -> Optional[requests.Response]:
+        """Builds a 200 response from the stored entry for a 304 answer."""
+        entry = self._load(key)
+        if not entry:
+            return None
+        # Bump mtime so size eviction drops the least recently used entries first
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        response = requests.Response()
+        response.status_code = 200
+        response.url = not_modified.url
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        # Rate-limit headers are only meaningful on the live answer
+        for name, value in not_modified.headers.items():
+            if name.lower().startswith("x-ratelimit"):
+                response.headers[name] = value
+        response._content = entry["body"].encode("utf-8")
+        return response
+
+    def store(self, key: str, response: requests.Response):
+        headers = {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+        entry = {"key": key, "headers": headers, "body": response.text}
+        path = self._path(key)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to cache {key}: {e}")
+            if tmp_path:
+                self._remove(tmp_path)
+            return
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+            if self._total is None or self._total > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """
+        Removes entries unused for max_age, then, beyond max_bytes, the least
+        recently used ones down to EVICT_TO of it.
+        """
+        entries = []
+        now = time.time()
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    self._remove(entry.path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                self._remove(path)
+                total -= size
+        self._total = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
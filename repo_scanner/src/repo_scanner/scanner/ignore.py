@@ -0,0 +1,104 @@
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+# (compiled pattern, negated, directories only)
+Rule = Tuple[Pattern, bool, bool]
+
+
+def _translate(pattern: str) -> str:
+    """Regex body for one gitignore glob (without anchoring)."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                before = i == 0 or pattern[i - 1] == '/'
+                after = i + 2 == n or pattern[i + 2] == '/'
+                if before and after:
+                    if i + 2 == n:
+                        out.append('.*')  # "a/**": everything inside a
+                    else:
+                        out.append('(?:.*/)?')  # "**/" matches zero or more directories
+                        i += 1
+                    i += 2
+                    continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = pattern.find(']', i + 2 if pattern.startswith(('[!', '[^'), i) else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def parse_rule(line: str, base: str = "") -> Optional[Rule]:
+    """
+    One rule in .gitignore syntax. base is the directory (relative to the
+    walk root, "/"-separated, "" for the root) the rule is relative to.
+    """
+    line = line.rstrip('\n\r')
+    # Trailing spaces are ignored unless escaped
+    while line.endswith(' ') and not line.endswith('\\ '):
+        line = line[:-1]
+    if not line or line.startswith('#'):
+        return None
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to base; otherwise it
+    # matches a name at any depth below base
+    anchored = '/' in line
+    body = _translate(line.lstrip('/'))
+    prefix = re.escape(base + '/') if base else ''
+    if not anchored:
+        prefix += '(?:.*/)?'
+    return re.compile(prefix + body + r'\Z', re.DOTALL), negate, dir_only
+
+
+class IgnoreRules:
+    """
+    Ordered gitignore-style rules; the last rule matching a path decides.
+    Instances are immutable, so a walker can hand the same rules to every
+    directory and only build a new set where a nested .gitignore adds some.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], base: str = "") -> "IgnoreRules":
+        return cls(()).extend(lines, base)
+
+    def extend(self, lines: Iterable[str], base: str = "") -> "IgnoreRules":
+        added: List[Rule] = [r for r in (parse_rule(line, base) for line in lines) if r]
+        return IgnoreRules(self.rules + tuple(added)) if added else self
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """rel_path is relative to the walk root and "/"-separated."""
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+        return False
@@ -0,0 +1,156 @@
+import json
+import os
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .result import ScanResult
+from .utils import logger
+
+# Column files, one unsigned 32-bit integer per (repo row, file, feature) entry
+COLUMNS = ("rows", "files", "features", "counts")
+
+
+class IndicatorArchive:
+    """
+    Append-only columnar store of raw scan indicators, for re-scoring without
+    re-scanning (see rescore.py).
+
+    Each archived ScanResult becomes one repo row plus one entry per distinct
+    (file, feature) with its hit count. A feature is an indicator stripped of
+    file, line and context: (type, value, score, classification, pattern),
+    where pattern is the config pattern name behind a pattern_match so its
+    score and classification can be swapped for new ones later.
+
+    Layout under archive_dir:
+      rows.u32, files.u32, features.u32, counts.u32  - the entry columns
+      features.jsonl, files.jsonl                     - id -> feature / path
+      repos.jsonl                                     - one line per repo row
+
+    Vocabulary lines and columns are written before the repo line that
+    refers to them, and each repo line records the column length after it,
+    so a scan interrupted half-way is simply ignored on the next load.
+    Only one process should append at a time.
+    """
+
+    def __init__(self, archive_dir: str, config: Optional[Dict] = None):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+        names = [p.get("name", "unknown") for p in (config or {}).get("patterns", [])]
+        # Longest first, so a name that is a prefix of another cannot shadow it
+        self.pattern_names = sorted(set(names), key=len, reverse=True)
+        self.features: List[List] = self._read_jsonl("features.jsonl")
+        self.files: List[str] = self._read_jsonl("files.jsonl")
+        self.repos: List[Dict] = self._read_jsonl("repos.jsonl")
+        self.feature_ids = {tuple(f): i for i, f in enumerate(self.features)}
+        self.file_ids = {path: i for i, path in enumerate(self.files)}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, name)
+
+    def _read_jsonl(self, name: str) -> List:
+        items = []
+        valid = 0
+        try:
+            with open(self._path(name), "r+b") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete line")
+                        items.append(json.loads(line))
+                    except ValueError:
+                        # Torn last line from an interrupted write; cut it off so
+                        # the next append starts on a clean line
+                        f.truncate(valid)
+                        break
+                    valid += len(line)
+        except FileNotFoundError:
+            pass
+        return items
+
+    @staticmethod
+    def _append_jsonl(f, items: List):
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+
+    @property
+    def size(self) -> int:
+        """Number of committed entries in the columns."""
+        return self.repos[-1]["end"] if self.repos else 0
+
+    def pattern_of(self, ind) -> Optional[str]:
+        if ind.type != "pattern_match":
+            return None
+        for name in self.pattern_names:
+            if ind.value.startswith(name + ": "):
+                return name
+        return None
+
+    def _feature_id(self, ind, new_features: List) -> int:
+        key = (ind.type, ind.value, ind.score, ind.classification, self.pattern_of(ind))
+        fid = self.feature_ids.get(key)
+        if fid is None:
+            fid = self.feature_ids[key] = len(self.features)
+            self.features.append(list(key))
+            new_features.append(list(key))
+        return fid
+
+    def _file_id(self, path: Optional[str], new_files: List) -> int:
+        path = path or ""
+        fid = self.file_ids.get(path)
+        if fid is None:
+            fid = self.file_ids[path] = len(self.files)
+            self.files.append(path)
+            new_files.append(path)
+        return fid
+
+    def append(self, result: ScanResult):
+        new_features, new_files = [], []
+        counts = Counter(
+            (self._file_id(ind.file, new_files), self._feature_id(ind, new_features))
+            for ind in result.indicators
+        )
+        row = len(self.repos)
+        start = self.size
+        columns = {name: array("I") for name in COLUMNS}
+        for (file_id, feature_id), count in counts.items():
+            columns["rows"].append(row)
+            columns["files"].append(file_id)
+            columns["features"].append(feature_id)
+            columns["counts"].append(count)
+
+        try:
+            with open(self._path("features.jsonl"), "a", encoding="utf-8") as f:
+                self._append_jsonl(f, new_features)
+            with open(self._path("files.jsonl"), "a", encoding="utf-8") as f:
+                self._append_jsonl(f, new_files)
+            for name in COLUMNS:
+                path = self._path(f"{name}.u32")
+                with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                    # Overwrite anything past the last committed entry
+                    f.seek(start * columns[name].itemsize)
+                    columns[name].tofile(f)
+                    f.truncate()
+            repo = {
+                "row": row,
+                "repository": result.repository,
+                "commit_sha": result.commit_sha,
+                "classification": result.classification,
+                "confidence": result.confidence,
+                "files_scanned": result.files_scanned,
+                "partial": result.triaged or result.stopped_early,
+                "timestamp": result.timestamp,
+                "end": start + len(counts),
+            }
+            with open(self._path("repos.jsonl"), "a", encoding="utf-8") as f:
+                self._append_jsonl(f, [repo])
+            self.repos.append(repo)
+        except OSError as e:
+            logger.warning(f"Failed to archive indicators for {result.repository}: {e}")
+
+    def latest_rows(self) -> Dict[str, int]:
+        """Repository name -> its most recent repo row."""
+        return {repo["repository"]: repo["row"] for repo in self.repos}
+
+    def column_paths(self) -> Tuple[int, Dict[str, str]]:
+        """Committed entry count and the path of each column file."""
+        return self.size, {name: self._path(f"{name}.u32") for name in COLUMNS}
@@ -0,0 +1,122 @@
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .result import Indicator
+
+# Field order matches the Indicator model, so serialized output is unchanged
+FIELDS = ("type", "value", "file", "line", "context", "score", "classification")
+
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    return sys.intern(s) if s is not None else None
+
+
+class CompactIndicator:
+    """
+    Lightweight stand-in for the Indicator model used while scanning.
+
+    Has the same attributes as Indicator but no per-instance dict or
+    validation, and interns the strings that repeat across hits (type,
+    value, file, classification). Converted to dicts only when a
+    ScanResult is serialized. model_dump() and model_copy() mirror the
+    Indicator model, and a record equals an Indicator with the same fields,
+    so code reading ScanResult.indicators works with either.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, type: str, value: str, file: Optional[str] = None, line: Optional[int] = None,
+                 context: Optional[str] = None, score: float = 0.0, classification: Optional[str] = None):
+        self.type = sys.intern(type)
+        self.value = sys.intern(value)
+        self.file = _intern(file)
+        self.line = line
+        self.context = context
+        self.score = float(score)
+        self.classification = _intern(classification)
+
+    def __getstate__(self):
+        return tuple(getattr(self, f) for f in FIELDS)
+
+    def __setstate__(self, state):
+        # Re-intern after unpickling in the parent process
+        self.__init__(*state)
+
+    def __eq__(self, other):
+        if isinstance(other, CompactIndicator):
+            return self.__getstate__() == other.__getstate__()
+        from .result import Indicator
+        if isinstance(other, Indicator):
+            return self.as_dict() == other.model_dump()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.__getstate__())
+
+    def __repr__(self):
+        return f"CompactIndicator(type={self.type!r}, value={self.value!r}, file={self.file!r}, line={self.line!r})"
+
+    def as_dict(self) -> Dict:
+        return {f: getattr(self, f) for f in FIELDS}
+
+    def model_dump(self, include: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None,
+                   **kwargs: Any) -> Dict:
+        """Indicator.model_dump() for the plain fields; other options have nothing to act on."""
+        data = self.as_dict()
+        if include is not None:
+            data = {f: v for f, v in data.items() if f in include}
+        if exclude is not None:
+            data = {f: v for f, v in data.items() if f not in exclude}
+        return data
+
+    def model_copy(self, update: Optional[Dict] = None, deep: bool = False) -> "CompactIndicator":
+        return CompactIndicator(**dict(self.as_dict(), **(update or {})))
+
+    def to_indicator(self) -> "Indicator":
+        from .result import Indicator
+        return Indicator(**self.as_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict, file: Optional[str] = None) -> "CompactIndicator":
+        """Builds a record from a serialized indicator, optionally overriding its file."""
+        if file is not None:
+            data = dict(data, file=file)
+        return cls(**{f: data[f] for f in FIELDS if f in data})
+
+
+class IndicatorStore:
+    """
+    Append-only list of CompactIndicator records for one scan, with
+    duplicate removal and per-(value, file) aggregation for summaries.
+    """
+
+    def __init__(self, records: Iterable[CompactIndicator] = ()):
+        self.records: List[CompactIndicator] = list(records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[CompactIndicator]:
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def extend(self, records: Iterable[CompactIndicator]):
+        self.records.extend(records)
+
+    def aggregate(self) -> List[Tuple[CompactIndicator, int]]:
+        """
+        One (first record, hit count) pair per (type, value, file), in first-seen
+        order. Repeated hits of the same pattern in a file collapse into one row.
+        """
+        groups: Dict[Tuple[str, str, Optional[str]], List] = {}
+        for record in self.records:
+            key = (record.type, record.value, record.file)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [record, 1]
+            else:
+                group[1] += 1
+        return [(record, count) for record, count in groups.values()]
@@ -0,0 +1,192 @@
+import cProfile
+import os
+import pstats
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, Optional
+from .utils import logger, safe_filename
+
+# Metrics of the scan running in the current thread/context, if any. Hot paths
+# look it up once and skip all bookkeeping when it is None.
+_current: ContextVar[Optional["ScanMetrics"]] = ContextVar("scan_metrics", default=None)
+
+
+def current() -> Optional["ScanMetrics"]:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Adds the time spent in the block to stage `name` of the active metrics."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, perf_counter() - start)
+
+
+def count(name: str, n: int = 1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.count(name, n)
+
+
+class ScanMetrics:
+    """
+    Timers and counters for one repository scan, stored in ScanResult.metrics.
+
+    stages     seconds per pipeline stage (metadata, delta, download, extract, triage, walk,
+               scan, classify); "walk" includes reading/decompressing files
+    counters   bytes_downloaded, bytes_read, files_read, files_streamed,
+               memo_hits, memo_misses, ...
+    skipped    files (and pruned directories) not scanned, by reason
+    scanners   per scanner class: seconds, files, indicators
+    patterns   per keyword pattern: files it was a candidate for after the
+               literal prefilter, and seconds for patterns that run on their
+               own; "(prefilter)" and "(combined)" hold the time of the
+               literal check and of the shared combined-regex pass
+    indicators indicator count per type
+
+    Metrics from worker processes are merged by adding them up, so with
+    --jobs the scanner and pattern seconds are CPU time summed over workers.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+        self.scanners: Dict[str, Dict[str, float]] = {}
+        self.patterns: Dict[str, Dict[str, float]] = {}
+        self.indicators: Dict[str, int] = {}
+        self.profile: Optional[str] = None
+
+    @contextmanager
+    def activate(self) -> Iterator["ScanMetrics"]:
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def skip(self, reason: str, n: int = 1):
+        self.skipped[reason] = self.skipped.get(reason, 0) + n
+
+    def add_scanner(self, name: str, seconds: float, indicators: int):
+        entry = self.scanners.setdefault(name, {"seconds": 0.0, "files": 0, "indicators": 0})
+        entry["seconds"] += seconds
+        entry["files"] += 1
+        entry["indicators"] += indicators
+
+    def add_pattern(self, name: str, seconds: float = 0.0, files: int = 0):
+        entry = self.patterns.setdefault(name, {"seconds": 0.0, "files": 0})
+        entry["seconds"] += seconds
+        entry["files"] += files
+
+    def timed(self, items: Iterable, stage_name: str) -> Iterator:
+        """Yields from items, adding the time spent producing each one to a stage."""
+        it = iter(items)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    self.add_stage(stage_name, perf_counter() - start)
+                yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close:
+                close()
+
+    def count_indicators(self, indicators: Iterable):
+        for ind in indicators:
+            self.indicators[ind.type] = self.indicators.get(ind.type, 0) + 1
+
+    def merge(self, data: Optional[Dict[str, Any]]):
+        """Adds the as_dict() output of another ScanMetrics into this one."""
+        if not data:
+            return
+        for table in ("stages", "counters", "skipped", "indicators"):
+            mine = getattr(self, table)
+            for key, value in data.get(table, {}).items():
+                mine[key] = mine.get(key, 0) + value
+        for table in ("scanners", "patterns"):
+            mine = getattr(self, table)
+            for key, values in data.get(table, {}).items():
+                entry = mine.setdefault(key, dict.fromkeys(values, 0))
+                for field, value in values.items():
+                    entry[field] = entry.get(field, 0) + value
+        self.profile = self.profile or data.get("profile")
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+            "skipped": dict(self.skipped),
+            "scanners": {k: dict(v, seconds=round(v["seconds"], 6)) for k, v in self.scanners.items()},
+            "patterns": {k: dict(v, seconds=round(v["seconds"], 6)) for k, v in self.patterns.items()},
+            "indicators": dict(self.indicators),
+        }
+        if self.profile:
+            data["profile"] = self.profile
+        return data
+
+
+@contextmanager
+def collect(profile_path: Optional[str] = None) -> Iterator[ScanMetrics]:
+    """
+    Activates a fresh ScanMetrics for the enclosed scan. With profile_path,
+    the block also runs under cProfile and the stats are written there; if
+    the file already exists (another process profiled part of the same
+    scan), both are combined.
+    """
+    metrics = ScanMetrics()
+    profiler = cProfile.Profile() if profile_path else None
+    with metrics.activate():
+        if profiler is None:
+            yield metrics
+            return
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler is already running (e.g. a concurrent scan)
+            logger.debug(f"Not profiling: {e}")
+            yield metrics
+            return
+        metrics.profile = profile_path
+        try:
+            yield metrics
+        finally:
+            profiler.disable()
+            save_profile(profiler, profile_path)
+
+
+def profile_path(profile_dir: str, repository: str) -> str:
+    """Where the cProfile stats of one scan of repository go."""
+    timestamp = datetime.utcnow().isoformat().replace(":", "-").split(".")[0]
+    return os.path.join(profile_dir, f"{safe_filename(repository)}_{timestamp}.pstats")
+
+
+def save_profile(profiler: cProfile.Profile, path: str):
+    stats = pstats.Stats(profiler)
+    if os.path.exists(path):
+        try:
+            stats.add(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    stats.dump_stats(path)
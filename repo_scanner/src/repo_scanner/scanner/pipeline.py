@@ -0,0 +1,254 @@
+import os
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future
+from itertools import groupby, islice
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from .result import FileData, ScanResult
+from .indicator_store import CompactIndicator, IndicatorStore
+from .streaming import LargeFile
+from .utils import logger
+from .scanners.base import BaseScanner
+from .scanners.keyword_scanner import KeywordScanner
+from .scanners.dependency_scanner import DependencyScanner
+from .scanners.ast_scanner import ASTScanner
+from .classifier import Classifier
+from .scorer import ScoreAccumulator
+from . import metrics as scan_metrics
+
+
+def build_scanners(config: Dict, languages: Optional[Dict] = None) -> List[BaseScanner]:
+    return [
+        KeywordScanner(config, languages),
+        DependencyScanner(config),
+        ASTScanner()
+    ]
+
+
+class ScanRouter:
+    """
+    Dispatch index from a file to the scanners that read it, per the
+    scanners' extensions/filenames (see BaseScanner). Built once per scanner
+    list: file names are indexed up front, extensions on first sight.
+    Scanners keep their order, so indicators come out as if every scanner
+    had run on every file.
+    """
+
+    def __init__(self, scanners: List[BaseScanner]):
+        self.scanners = list(scanners)
+        names = set().union(*(s.filenames or () for s in self.scanners))
+        self.by_name: Dict[str, List[BaseScanner]] = {
+            name: self._select(name, os.path.splitext(name)[1]) for name in names
+        }
+        self.by_extension: Dict[str, List[BaseScanner]] = {}
+
+    def _select(self, name: str, extension: str) -> List[BaseScanner]:
+        return [s for s in self.scanners
+                if (s.extensions is None and s.filenames is None)
+                or extension in (s.extensions or ()) or name in (s.filenames or ())]
+
+    def route(self, path: str, extension: str) -> List[BaseScanner]:
+        scanners = self.by_name.get(os.path.basename(path))
+        if scanners is None:
+            scanners = self.by_extension.get(extension)
+            if scanners is None:
+                scanners = self.by_extension[extension] = self._select("", extension)
+        return scanners
+
+
+class EarlyStop:
+    """
+    Stop condition for scan_files: keeps a running score and fires as soon as
+    the classification can no longer change (see Classifier.is_settled).
+    """
+
+    def __init__(self, config: Dict):
+        self.classifier = Classifier(config)
+        self.accumulator = ScoreAccumulator(self.classifier.scorer)
+        self.triggered = False
+
+    def __call__(self, indicators: List[CompactIndicator]) -> bool:
+        self.triggered = self.classifier.is_settled(self.accumulator.add(indicators))
+        return self.triggered
+
+
+def scan_one(scanners: List[BaseScanner], file_data: Union[FileData, LargeFile]) -> List[CompactIndicator]:
+    """Indicators for one file; LargeFiles go through the scanners that can stream."""
+    metrics = scan_metrics.current()
+    if not isinstance(file_data, LargeFile):
+        indicators = []
+        for scanner in scanners:
+            if metrics is None:
+                indicators.extend(scanner.scan(file_data.path, file_data.content))
+                continue
+            start = perf_counter()
+            found = scanner.scan(file_data.path, file_data.content)
+            metrics.add_scanner(type(scanner).__name__, perf_counter() - start, len(found))
+            indicators.extend(found)
+        return indicators
+
+    indicators = []
+    for scanner in scanners:
+        if not scanner.window_overlap:
+            continue
+        start = perf_counter()
+        found = []
+        try:
+            with file_data.windows(scanner.window_overlap) as windows:
+                found = scanner.scan_windows(file_data.path, windows)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Error streaming file {file_data.path}: {e}")
+        if metrics is not None:
+            metrics.add_scanner(type(scanner).__name__, perf_counter() - start, len(found))
+        indicators.extend(found)
+    return indicators
+
+
+def _scan_routed(router: ScanRouter, file_data: Union[FileData, LargeFile], memo) -> List[CompactIndicator]:
+    if memo is None or isinstance(file_data, LargeFile):
+        return scan_one(router.route(file_data.path, file_data.extension), file_data)
+    key = memo.key(file_data)
+    indicators = memo.get(key, file_data.path)
+    if indicators is not None:
+        scan_metrics.count("memo_hits")
+        return indicators
+    scan_metrics.count("memo_misses")
+    indicators = scan_one(router.route(file_data.path, file_data.extension), file_data)
+    memo.put(key, indicators)
+    return indicators
+
+
+def scan_files(scanners: List[BaseScanner], files: Iterable[Union[FileData, LargeFile]],
+               stop: Optional[Callable[[List[CompactIndicator]], bool]] = None,
+               memo=None) -> Tuple[IndicatorStore, int, Set[str]]:
+    """
+    Runs the scanners over a stream of FileData (and LargeFiles, see
+    scan_one), each file only through the scanners ScanRouter picks for it.
+    stop, if given, is called with each file's indicators and ends
+    the scan early by returning True. With a BlobMemo, files whose content
+    was scanned before (in any repository) take their indicators from it.
+    """
+    all_indicators = IndicatorStore()
+    files_scanned = 0
+    file_extensions_seen = set()
+    router = ScanRouter(scanners)
+    metrics = scan_metrics.current()
+    if metrics is not None:
+        # Time spent in the walker (listing, reading, decompressing) is "walk"
+        files = metrics.timed(files, "walk")
+
+    for file_data in files:
+        files_scanned += 1
+        file_extensions_seen.add(file_data.extension)
+
+        if metrics is None:
+            file_indicators = _scan_routed(router, file_data, memo)
+        else:
+            start = perf_counter()
+            file_indicators = _scan_routed(router, file_data, memo)
+            metrics.add_stage("scan", perf_counter() - start)
+        all_indicators.extend(file_indicators)
+
+        if stop and stop(file_indicators):
+            # Release the walker (and any open archive members) right away
+            if hasattr(files, "close"):
+                files.close()
+            break
+
+    return all_indicators, files_scanned, file_extensions_seen
+
+
+# Per-process scanners for scan_files_parallel, built once by _init_file_worker
+_file_worker = {}
+
+
+def _init_file_worker(config: Dict, languages: Optional[Dict], memo_path: Optional[str]):
+    _file_worker["scanners"] = build_scanners(config, languages)
+    _file_worker["memo"] = None
+    if memo_path:
+        from .blob_memo import BlobMemo
+        _file_worker["memo"] = BlobMemo.for_config(memo_path, config, languages or {})
+
+
+def _scan_batch(batch: List[FileData], collect_metrics: bool = False) -> Tuple[List[CompactIndicator], Optional[Dict]]:
+    memo = _file_worker["memo"]
+    with scan_metrics.collect() if collect_metrics else nullcontext() as metrics:
+        indicators, _, _ = scan_files(_file_worker["scanners"], batch, memo=memo)
+        if memo is not None:
+            memo.flush()
+    return indicators.records, metrics.as_dict() if metrics is not None else None
+
+
+def scan_files_parallel(config: Dict, files: Iterable[FileData], jobs: int, batch_size: int = 64,
+                        languages: Optional[Dict] = None,
+                        memo_path: Optional[str] = None) -> Tuple[IndicatorStore, int, Set[str]]:
+    """
+    Same as scan_files, but spreads batches of files over a process pool.
+    Batches are merged in the order they were read, so the indicator list is
+    identical to a sequential scan. At most 2 * jobs batches are in flight.
+    Large archive members cannot be sent to a worker and are streamed here.
+    Worker metrics, if collected, are added to the active ScanMetrics. With
+    memo_path, every worker uses the BlobMemo stored there.
+    """
+    # Imported here: multiprocessing is only needed with --jobs
+    from concurrent.futures import ProcessPoolExecutor
+
+    all_indicators = IndicatorStore()
+    files_scanned = 0
+    file_extensions_seen = set()
+    metrics = scan_metrics.current()
+    files = iter(files) if metrics is None else metrics.timed(files, "walk")
+    local_scanners = None
+
+    with ProcessPoolExecutor(jobs, initializer=_init_file_worker, initargs=(config, languages, memo_path)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < jobs * 2:
+                batch = list(islice(files, batch_size))
+                if not batch:
+                    break
+                files_scanned += len(batch)
+                file_extensions_seen.update(f.extension for f in batch)
+                for local, group in groupby(batch, key=lambda f: isinstance(f, LargeFile) and not f.picklable):
+                    group = list(group)
+                    if not local:
+                        pending.append(pool.submit(_scan_batch, group, metrics is not None))
+                        continue
+                    local_scanners = local_scanners or build_scanners(config, languages)
+                    done = Future()
+                    done.set_result((scan_files(local_scanners, group)[0].records, None))
+                    pending.append(done)
+            if not pending:
+                break
+            records, worker_metrics = pending.popleft().result()
+            all_indicators.extend(records)
+            if metrics is not None:
+                metrics.merge(worker_metrics)
+
+    return all_indicators, files_scanned, file_extensions_seen
+
+
+def build_result(config: Dict, repository: str, indicators: Iterable[CompactIndicator], files_scanned: int, extensions: Set[str]) -> ScanResult:
+    """
+    Classifies the collected indicators and wraps everything in a ScanResult.
+    The result keeps the compact records as they are (model_construct skips
+    validation), so no Indicator model is built per hit; they are turned into
+    plain dicts when the result is serialized. ScanResult.indicators admits
+    both kinds, and CompactIndicator offers the Indicator read API.
+    """
+    indicators = list(indicators)
+    with scan_metrics.stage("classify"):
+        classifier = Classifier(config)
+        result = ScanResult.model_construct(
+            repository=repository,
+            classification=classifier.classify(indicators),
+            confidence=classifier.get_confidence(indicators),
+            indicators=indicators,
+            languages_detected=list(extensions),
+            files_scanned=files_scanned
+        )
+    metrics = scan_metrics.current()
+    if metrics is not None:
+        metrics.count_indicators(indicators)
+    return result
@@ -5,8 +5,9 @@ import tempfile
 import shutil
 import os
 from repo_scanner.scanner.utils import logger
+from repo_scanner.scanner import metrics as scan_metrics
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 
 class RepoFetcher:
     def __init__(self, token: str = None):
@@ -39,14 +40,18 @@ class RepoFetcher:
 
         logger.info(f"Downloading repository from {url}...")
         try:
-            response = requests.get(url, headers=self._get_headers(), stream=True)
-            response.raise_for_status()
+            with scan_metrics.stage("download"):
+                response = requests.get(url, headers=self._get_headers(), stream=True)
+                response.raise_for_status()
+                content = response.content
+            scan_metrics.count("bytes_downloaded", len(content))
             
             with tempfile.TemporaryDirectory() as temp_dir:
                 try:
-                    with zipfile.ZipFile(io.BytesIO(response.content)) as z:
+                    with zipfile.ZipFile(io.BytesIO(content)) as z:
                         # Security check for zip slip could go here
-                        z.extractall(temp_dir)
+                        with scan_metrics.stage("extract"):
+                            z.extractall(temp_dir)
                         
                         # GitHub zips usually have a top-level folder (repo-branch)
                         # We want to yield that inner folder if it exists
@@ -61,3 +66,42 @@ class RepoFetcher:
         except requests.RequestException as e:
             logger.error(f"Network error downloading repo: {e}")
             raise
+
+    def download_archive(self, url: str) -> bytes:
+        """Downloads a repo ZIP from GitHub and returns the raw bytes."""
+        logger.info(f"Downloading repository from {url}...")
+        try:
+            with scan_metrics.stage("download"):
+                response = requests.get(url, headers=self._get_headers())
+                response.raise_for_status()
+                content = response.content
+            scan_metrics.count("bytes_downloaded", len(content))
+            return content
+        except requests.RequestException as e:
+            logger.error(f"Network error downloading repo: {e}")
+            raise
+
+    @staticmethod
+    def open_archive(data: bytes) -> zipfile.ZipFile:
+        try:
+            return zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile:
+            logger.error("Failed to open repository archive.")
+            raise ValueError("Invalid ZIP file")
+
+    @staticmethod
+    def archive_commit_sha(archive: zipfile.ZipFile) -> Optional[str]:
+        """GitHub stores the commit SHA of a zipball in the archive comment."""
+        comment = archive.comment.decode("ascii", errors="ignore").strip()
+        if len(comment) == 40 and all(c in "0123456789abcdef" for c in comment):
+            return comment
+        return None
+
+    @contextmanager
+    def fetch_repo_archive(self, url: str) -> Generator[zipfile.ZipFile, None, None]:
+        """
+        Downloads a repo ZIP from GitHub and yields it as an open in-memory ZipFile.
+        Nothing is extracted to disk; use FileFilter.walk_zip to read the members.
+        """
+        with self.open_archive(self.download_archive(url)) as archive:
+            yield archive
@@ -0,0 +1,124 @@
+from typing import Dict, List
+from .indicator_archive import IndicatorArchive
+from .indicator_store import CompactIndicator
+from .scorer import Scorer
+from .scanners.dependency_scanner import DependencyIndex
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for rescoring (pip install .[rescore])
+    np = None
+
+
+class RescoreResult:
+    """Per-repository scores and labels under one config, row-aligned with repos."""
+
+    def __init__(self, repos: List[Dict], categories: List[str], scores, labels, confidence):
+        self.repos = repos
+        self.categories = categories
+        self.scores = scores
+        self.labels = labels
+        self.confidence = confidence
+
+    def changed(self) -> List[int]:
+        """Indices of repositories whose label differs from the archived one."""
+        return [i for i, repo in enumerate(self.repos) if repo["classification"] != self.labels[i]]
+
+
+class Rescorer:
+    """
+    Recomputes Scorer/Classifier output for every archived repository under
+    a new config, without touching the network or the scanners.
+
+    Every archived feature is weighed once with Scorer.weigh (pattern_match
+    features take their score and classification from the new config's
+    pattern of the same name, dependency features from its known-package
+    index), giving a weight vector and a category vector.
+    Per-repository category scores are then a single weighted bincount over
+    the entry columns, and labels come from vectorized threshold checks that
+    mirror Classifier.label. Patterns added to the config since the scan
+    cannot be picked up this way; those need a rescan.
+    """
+
+    def __init__(self, config: Dict):
+        if np is None:
+            raise RuntimeError("rescore needs numpy: pip install numpy (or the [rescore] extra)")
+        self.config = config
+        self.scorer = Scorer(config)
+        self.patterns = {p.get("name", "unknown"): p for p in config.get("patterns", [])}
+        self.dependencies = DependencyIndex(config)
+        thresholds = config.get("thresholds", {}).get("classification", {})
+        self.high = thresholds.get("high", 8.0)
+        self.medium = thresholds.get("medium", 5.0)
+
+    def weigh_features(self, features: List[List]):
+        """(category index per feature, -1 for none; weight per feature; category names)."""
+        categories = ["SERVER", "CLIENT"]
+        category_ids = {"SERVER": 0, "CLIENT": 1}
+        feature_categories = np.full(len(features), -1, dtype=np.int64)
+        weights = np.zeros(len(features), dtype=np.float64)
+
+        for i, (type_, value, score, classification, pattern) in enumerate(features):
+            if pattern is not None:
+                p = self.patterns.get(pattern)
+                if p is None:
+                    # Pattern dropped from the config
+                    continue
+                score = p.get("score", 1.0)
+                classification = p.get("classification", "UNKNOWN")
+            elif type_ == "dependency":
+                entry = self.dependencies.lookup(value)
+                if entry is None:
+                    # No longer a known package
+                    continue
+                score = entry.get("score", 0.0)
+                classification = entry.get("classification")
+            category, weight = self.scorer.weigh(
+                CompactIndicator(type_, value, score=score, classification=classification)
+            )
+            if not category:
+                continue
+            if category not in category_ids:
+                category_ids[category] = len(categories)
+                categories.append(category)
+            feature_categories[i] = category_ids[category]
+            weights[i] = weight
+        return feature_categories, weights, categories
+
+    def run(self, archive: IndicatorArchive, latest_only: bool = True) -> RescoreResult:
+        size, paths = archive.column_paths()
+        columns = {name: np.fromfile(path, dtype=np.uint32, count=size) if size else np.zeros(0, dtype=np.uint32)
+                   for name, path in paths.items()}
+
+        if latest_only:
+            repos = [archive.repos[row] for row in archive.latest_rows().values()]
+        else:
+            repos = list(archive.repos)
+        # Archive row -> output position (-1 for rows not reported)
+        position = np.full(len(archive.repos), -1, dtype=np.int64)
+        position[np.array([repo["row"] for repo in repos], dtype=np.int64)] = np.arange(len(repos))
+
+        feature_categories, weights, categories = self.weigh_features(archive.features)
+        k = len(categories)
+
+        repo_pos = position[columns["rows"]]
+        feature = columns["features"].astype(np.int64)
+        category = feature_categories[feature]
+        keep = (repo_pos >= 0) & (category >= 0)
+        cell = repo_pos[keep] * k + category[keep]
+
+        scores = np.bincount(
+            cell, weights=columns["counts"][keep] * weights[feature[keep]], minlength=len(repos) * k
+        ).reshape(len(repos), k)
+        # Scorer only reports SERVER, CLIENT and categories actually seen
+        seen = np.bincount(cell, minlength=len(repos) * k).reshape(len(repos), k) > 0
+        seen[:, :2] = True
+        confidence = np.where(seen, scores, -np.inf).max(axis=1) if len(repos) else np.zeros(0)
+
+        server, client = scores[:, 0], scores[:, 1]
+        labels = np.select(
+            [server >= self.high, server >= self.medium, client >= self.high],
+            ["SERVER", "PROTOCOL_RELATED", "CLIENT"],
+            default="UNKNOWN"
+        )
+        return RescoreResult(repos, categories, scores, labels.tolist(), confidence)
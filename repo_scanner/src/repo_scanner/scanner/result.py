@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
+from typing import List, Dict, Optional, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, model_serializer
+from .indicator_store import CompactIndicator
 
 class Indicator(BaseModel):
     type: str # 'keyword', 'dependency', 'ast', 'filename'
@@ -12,14 +13,32 @@ class Indicator(BaseModel):
     classification: Optional[str] = None # SERVER, CLIENT
 
 class ScanResult(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     repository: str
     classification: str = "UNKNOWN" # SERVER, CLIENT, PROTOCOL_RELATED, UNKNOWN
     confidence: float = 0.0
-    indicators: List[Indicator] = []
+    indicators: List[Union[Indicator, CompactIndicator]] = [] # CompactIndicator from a scan (see build_result), Indicator when loaded
     languages_detected: List[str] = []
     files_scanned: int = 0
     commit_sha: Optional[str] = None
+    triaged: bool = False # True when only manifests were scanned and the archive was skipped
+    stopped_early: bool = False # True when --fast ended the scan once the label was settled
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    metrics: Optional[Dict[str, Any]] = None # ScanMetrics.as_dict() when scanned with --metrics/--profile
+    from_cache: bool = Field(default=False, exclude=True) # Set by BatchScanner on a ResultCache hit; never serialized
+
+    @field_serializer("indicators")
+    def _serialize_indicators(self, indicators) -> List[Dict[str, Any]]:
+        return [ind.model_dump() if isinstance(ind, BaseModel) else ind.as_dict() for ind in indicators]
+
+    @model_serializer(mode="wrap")
+    def _drop_empty_metrics(self, handler) -> Dict[str, Any]:
+        # Results scanned without metrics serialize exactly as before
+        data = handler(self)
+        if data.get("metrics") is None:
+            data.pop("metrics", None)
+        return data
 
 class RepoMetadata(BaseModel):
     name: str
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from .result import ScanResult
+from .utils import logger
+
+# Size eviction trims the cache to this fraction of max_bytes, so that the
+# next full directory scan is only needed after that much has been written
+EVICT_TO = 0.9
+
+
+def config_hash(*configs: Dict) -> str:
+    """Stable hash of the rule configuration; any change invalidates cached results."""
+    blob = json.dumps(configs, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    On-disk cache of ScanResults keyed by (full_name, commit_sha, config hash).
+
+    Each entry is one JSON file and records the scanner code that produced
+    it (code_fingerprint()); entries from other code, or older than max_age
+    seconds, are treated as misses and removed. When the cache grows beyond
+    max_bytes the least recently used entries are evicted. The size is tracked as entries
+    are written, so the directory is only scanned on the first write and
+    when the budget is exceeded. latest() finds the result of the most
+    recently stored commit of a repository, for delta rescans; its pointer
+    files live under latest/ and are not counted or evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, max_age: float = 30 * 24 * 3600):
+        # config_snapshot imports this module
+        from .config_snapshot import code_fingerprint
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # Estimated size of the entries, None until the first evict()
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+        self._code = code_fingerprint()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, full_name: str, commit_sha: str, cfg_hash: str) -> str:
+        key = hashlib.sha256(f"{full_name}\0{commit_sha}\0{cfg_hash}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _latest_path(self, full_name: str, cfg_hash: str) -> str:
+        key = hashlib.sha256(f"{full_name}\0{cfg_hash}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "latest", f"{key}.json")
+
+    def get(self, full_name: str, commit_sha: str, cfg_hash: str, triaged: bool = False,
+            stopped_early: bool = False) -> Optional[ScanResult]:
+        """
+        The stored result, or None. Partial results are only returned to
+        callers that would have produced them: one built from the manifests
+        alone when triaged is set, one from a --fast scan that stopped early
+        when stopped_early is set. Any other caller scans in full and
+        replaces the entry.
+        """
+        path = self._path(full_name, commit_sha, cfg_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+
+        if time.time() - entry.get("cached_at", 0) > self.max_age or entry.get("code") != self._code:
+            self._remove(path)
+            return None
+        stored = entry["result"]
+        if (stored.get("triaged") and not triaged) or (stored.get("stopped_early") and not stopped_early):
+            return None
+
+        # Bump mtime so size eviction drops the least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ScanResult.model_validate(entry["result"])
+
+    def latest(self, full_name: str, cfg_hash: str) -> Optional[ScanResult]:
+        """The last result stored for full_name under cfg_hash, whatever its commit, or None."""
+        try:
+            with open(self._latest_path(full_name, cfg_hash), "r", encoding="utf-8") as f:
+                commit_sha = json.load(f)["commit_sha"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return self.get(full_name, commit_sha, cfg_hash)
+
+    def put(self, result: ScanResult, cfg_hash: str):
+        if not result.commit_sha or result.classification == "ERROR":
+            return
+        path = self._path(result.repository, result.commit_sha, cfg_hash)
+        # Metrics describe the run that produced the result, not a cache hit
+        entry = {"cached_at": time.time(), "code": self._code, "result": result.model_dump(exclude={"metrics"})}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            self._remove(tmp_path)
+            return
+        self._write_latest(result, cfg_hash)
+        with self._lock:
+            if self._total is not None:
+                self._total += size
+            if self._total is None or self._total > self.max_bytes:
+                self.evict()
+
+    def _write_latest(self, result: ScanResult, cfg_hash: str):
+        path = self._latest_path(result.repository, cfg_hash)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"commit_sha": result.commit_sha}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache pointer {path}: {e}")
+            if tmp_path:
+                self._remove(tmp_path)
+
+    def evict(self):
+        """
+        Removes expired entries, then, beyond max_bytes, the least recently
+        used ones down to EVICT_TO of it.
+        """
+        entries = []
+        now = time.time()
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                # mtime is refreshed on every hit, so this only catches entries
+                # that were neither written nor read within max_age
+                if now - st.st_mtime > self.max_age:
+                    self._remove(entry.path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                self._remove(path)
+                total -= size
+        self._total = total
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
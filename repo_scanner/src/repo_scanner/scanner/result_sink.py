@@ -0,0 +1,50 @@
+import gzip
+import sys
+from typing import IO
+from .result import ScanResult
+
+
+class NDJSONSink:
+    """
+    Long-lived writer that streams ScanResults as newline-delimited JSON: one
+    compact line per result, all into one file instead of one indented file
+    per repository.
+
+    path "-" writes to stdout; a path ending in ".gz" is gzip-compressed.
+    Plain output is flushed after every result so the file can be followed
+    while a batch runs; gzip output is only complete once close() wrote the
+    trailer.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.compressed = path.endswith(".gz")
+        if path == "-":
+            self._file: IO[str] = sys.stdout
+        elif self.compressed:
+            self._file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    @property
+    def to_stdout(self) -> bool:
+        return self.path == "-"
+
+    def write(self, result: ScanResult):
+        self._file.write(result.model_dump_json() + "\n")
+        self.count += 1
+        if not self.compressed:
+            self._file.flush()
+
+    def close(self):
+        if self.to_stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,67 @@
+from collections import deque
+from typing import Dict, Iterable, Generator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Multi-keyword automaton: finds every occurrence of every keyword in a
+    single pass over the text, independent of how many keywords there are.
+
+    Failure links are folded into the transition table at build time, so the
+    scan loop is a single dict lookup per character.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        # transitions[state] maps a character to the next state; missing means root
+        self.transitions: List[Dict[str, int]] = [{}]
+        # outputs[state] lists indices into self.keywords ending at this state
+        self.outputs: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for kw in keywords:
+            if not kw or kw in seen:
+                continue
+            seen.add(kw)
+            self._add(kw, len(self.keywords))
+            self.keywords.append(kw)
+        self._build()
+
+    def _add(self, keyword: str, index: int):
+        state = 0
+        for ch in keyword:
+            nxt = self.transitions[state].get(ch)
+            if nxt is None:
+                nxt = len(self.transitions)
+                self.transitions.append({})
+                self.outputs.append(())
+                self.transitions[state][ch] = nxt
+            state = nxt
+        self.outputs[state] += (index,)
+
+    def _build(self):
+        fail = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            # The row of state still holds only trie edges here, while shallower
+            # states (fail[state] included) already have complete rows.
+            for ch, child in self.transitions[state].items():
+                fail[child] = self.transitions[fail[state]].get(ch, 0)
+                self.outputs[child] += self.outputs[fail[child]]
+                queue.append(child)
+            # Inherit the fallback state's transitions for characters with no own edge
+            for ch, target in self.transitions[fail[state]].items():
+                self.transitions[state].setdefault(ch, target)
+
+    def iter_matches(self, text: str) -> Generator[Tuple[int, int], None, None]:
+        """Yields (start offset, keyword index) for every occurrence, overlaps included."""
+        transitions = self.transitions
+        outputs = self.outputs
+        keywords = self.keywords
+        state = 0
+        for pos, ch in enumerate(text):
+            state = transitions[state].get(ch, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield pos - len(keywords[index]) + 1, index
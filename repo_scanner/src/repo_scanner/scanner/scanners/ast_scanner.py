@@ -1,37 +1,104 @@
 import ast
-from typing import List
-from ..result import Indicator
+import gc
+import hashlib
+import re
+from collections import OrderedDict
+from typing import List, Tuple
+from ..indicator_store import CompactIndicator
 from .base import BaseScanner
 from repo_scanner.scanner.utils import logger
 
+# Every Import, ImportFrom and ClassDef needs one of these keywords, so a file
+# without them cannot produce AST indicators and is not parsed at all
+_RELEVANT = re.compile(r"\b(?:import|class)\b")
+
+# Parse results by content hash, shared by all ASTScanner instances in the
+# process, so files repeated across repositories (vendored packages, forks,
+# templates) are parsed once
+PARSE_CACHE_SIZE = 4096
+_parse_cache: "OrderedDict[bytes, Tuple[Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
+
+
+def analyze_python(content: str, file_path: str = "<unknown>") -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    (imports, classes) of a Python source, in source order; both empty if the
+    file does not parse.
+    """
+    if not _RELEVANT.search(content):
+        return (), ()
+
+    key = hashlib.sha1(content.encode("utf-8", errors="surrogatepass")).digest()
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        _parse_cache.move_to_end(key)
+        return cached
+
+    result = (), ()
+    try:
+        tree = _parse(content)
+        analyzer = PythonAnalyzer()
+        analyzer.visit(tree)
+        result = tuple(analyzer.imports), tuple(analyzer.classes)
+    except SyntaxError:
+        logger.debug(f"Syntax error parsing {file_path}")
+    except Exception as e:
+        logger.warning(f"AST parse error {file_path}: {e}")
+
+    _parse_cache[key] = result
+    if len(_parse_cache) > PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)
+    return result
+
+
+def _parse(content: str) -> ast.Module:
+    # ast.parse allocates one object per node; with the collector running it
+    # keeps scanning the half-built tree, which costs about a third of the parse
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return ast.parse(content)
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class ASTScanner(BaseScanner):
-    def scan(self, file_path: str, content: str) -> List[Indicator]:
+    extensions = frozenset({".py"})
+
+    def scan(self, file_path: str, content: str) -> List[CompactIndicator]:
         indicators = []
         if file_path.endswith(".py"):
-            try:
-                tree = ast.parse(content)
-                analyzer = PythonAnalyzer()
-                analyzer.visit(tree)
-                
-                for imp in analyzer.imports:
-                    indicators.append(Indicator(type="ast_import", value=imp, file=file_path))
-                
-                for cls in analyzer.classes:
-                    indicators.append(Indicator(type="ast_class", value=cls, file=file_path))
-                    
-            except SyntaxError:
-                logger.debug(f"Syntax error parsing {file_path}")
-            except Exception as e:
-                logger.warning(f"AST parse error {file_path}: {e}")
-                
+            imports, classes = analyze_python(content, file_path)
+
+            for imp in imports:
+                indicators.append(CompactIndicator(type="ast_import", value=imp, file=file_path))
+
+            for cls in classes:
+                indicators.append(CompactIndicator(type="ast_class", value=cls, file=file_path))
+
         # Future: Add JS parser using other tools
         return indicators
 
+# Node lists that hold statements; imports and class definitions cannot occur
+# anywhere else (expressions, including lambdas, never contain statements).
+# match statements (and ast.match_case) only exist from Python 3.10.
+_STATEMENT_TYPES = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+
+
 class PythonAnalyzer(ast.NodeVisitor):
     def __init__(self):
         self.imports = []
         self.classes = []
 
+    def generic_visit(self, node):
+        # Only descend into statement bodies; visiting every expression node
+        # was as expensive as the parse itself
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list) and value and isinstance(value[0], _STATEMENT_TYPES):
+                for child in value:
+                    self.visit(child)
+
     def visit_Import(self, node):
         for alias in node.names:
             self.imports.append(alias.name)
@@ -41,8 +108,8 @@ class PythonAnalyzer(ast.NodeVisitor):
         if node.module:
             self.imports.append(node.module)
         self.generic_visit(node)
-        
+
     def visit_ClassDef(self, node):
         self.classes.append(node.name)
-        # Check base classes too
+        # Nested classes and imports in the body
         self.generic_visit(node)
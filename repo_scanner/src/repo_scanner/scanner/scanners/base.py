@@ -1,11 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import List
-from ..result import Indicator
+from typing import FrozenSet, Iterable, List, Optional
+from ..indicator_store import CompactIndicator
+from ..streaming import Window
 
 class BaseScanner(ABC):
     @abstractmethod
-    def scan(self, file_path: str, content: str) -> List[Indicator]:
+    def scan(self, file_path: str, content: str) -> List[CompactIndicator]:
         """
         Scans a single file and returns a list of indicators found.
         """
         pass
+
+    # File types the scanner reads, for the dispatch index in pipeline
+    # (ScanRouter): extensions and/or exact file names. None for both means
+    # every file.
+    extensions: Optional[FrozenSet[str]] = None
+    filenames: Optional[FrozenSet[str]] = None
+
+    # Lookahead (in characters) a window needs past the part it owns so no
+    # match is cut at a window boundary; 0 means the scanner cannot stream.
+    window_overlap = 0
+
+    def scan_windows(self, file_path: str, windows: Iterable[Window]) -> List[CompactIndicator]:
+        """
+        Scans a file too large to load, given as consecutive Windows.
+        Scanners that need the whole file (e.g. to parse it) keep the default.
+        """
+        return []
@@ -1,45 +1,78 @@
 import os
 import re
-from typing import List, Dict
-from repo_scanner.scanner.result import Indicator
+from typing import Dict, List, Optional
+from repo_scanner.scanner.indicator_store import CompactIndicator
 from .base import BaseScanner
+from .manifests import PARSERS
+
+_SEPARATORS = re.compile(r"[-_.]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case- and separator-insensitive package name (PEP 503 style, applied to every ecosystem)."""
+    return _SEPARATORS.sub("-", name.strip().lower())
+
+
+class DependencyIndex:
+    """
+    Known MCP packages from the `dependencies` config: a hash table of exact
+    names and one of prefixes, keyed by normalized name. A lookup costs one
+    probe for the exact table plus one per distinct prefix length.
+    """
+
+    def __init__(self, config: Dict):
+        dep_config = config.get("dependencies", {})
+        self.exact: Dict[str, Dict] = {}
+        self.prefixes: Dict[str, Dict] = {}
+        for entry in dep_config.get("packages", []):
+            self.exact[normalize_name(entry["name"])] = entry
+        for entry in dep_config.get("prefixes", []):
+            self.prefixes[normalize_name(entry["prefix"])] = entry
+        # Longest first, so the most specific prefix wins
+        self.prefix_lengths = sorted({len(p) for p in self.prefixes}, reverse=True)
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        key = normalize_name(name)
+        entry = self.exact.get(key)
+        if entry is not None:
+            return entry
+        for length in self.prefix_lengths:
+            if length < len(key):
+                entry = self.prefixes.get(key[:length])
+                if entry is not None:
+                    return entry
+        return None
+
 
 class DependencyScanner(BaseScanner):
-    def __init__(self):
-        # Maps filenames to simple regex patterns for extraction
-        self.parsers = {
-            "requirements.txt": re.compile(r"^([a-zA-Z0-9_\-]+)", re.MULTILINE),
-            "package.json": re.compile(r"\"(.*?)\"\s*:", re.MULTILINE), # Very naive, good enough for signal
-            # Add more per language
-        }
-        
-        # In a real impl, we'd cross reference these parsed deps against a list of known server/client libs in config
-        # For now, we just extract them. The Classification/Scoring step will decide if they are "server" or "client".
-        # OR we can do it here. The prompt says "Match against configurable patterns".
-        # Let's assume passed config has known libs.
-
-    def scan(self, file_path: str, content: str) -> List[Indicator]:
+    """
+    Parses dependency manifests (see manifests.PARSERS) and reports only the
+    declared dependencies found in the DependencyIndex.
+    """
+
+    filenames = frozenset(PARSERS)
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.index = DependencyIndex(config or {})
+        self.parsers = PARSERS
+
+    def scan(self, file_path: str, content: str) -> List[CompactIndicator]:
         indicators = []
         filename = os.path.basename(file_path)
-        
-        if filename in self.parsers:
-            matches = self.parsers[filename].findall(content)
-            for match in matches:
-                # In a real system, we'd filter this list against known "interesting" dependencies
-                # For this MVP, we report EVERYTHING as a dependency found, 
-                # and let the scorer/classifier filter for "flask", "django", "requests", etc.
-                # Actually, reporting everything is too noisy.
-                # Let's just create an indicator "dependency" with value "dependency_name".
-                
-                # To be useful without hardcoding, we rely on the Config to tell us what is interesting.
-                # But the prompt says "Dependency Scanner: Extract package names... Match against configurable patterns".
-                # I will assume the Classifier will scan the list of indicators.
-                
-                # For efficiency, let's just emit them.
-                indicators.append(Indicator(
-                    type="dependency",
-                    value=match,
-                    file=file_path
-                ))
-                
+        parser = self.parsers.get(filename)
+        if parser is None:
+            return indicators
+
+        # A package declared in several sections is reported once per manifest
+        for name in dict.fromkeys(parser(content)):
+            entry = self.index.lookup(name)
+            if entry is None:
+                continue
+            indicators.append(CompactIndicator(
+                type="dependency",
+                value=name,
+                file=file_path,
+                score=entry.get("score", 0.0),
+                classification=entry.get("classification")
+            ))
         return indicators
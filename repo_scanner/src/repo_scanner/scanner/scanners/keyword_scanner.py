@@ -1,62 +1,144 @@
 import re
-from typing import List, Dict
-from repo_scanner.scanner.result import Indicator
+from bisect import bisect_right
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+from repo_scanner.scanner.indicator_store import CompactIndicator
+from repo_scanner.scanner.streaming import Window, WINDOW_LEAD
 from .base import BaseScanner
+from .ruleset import RuleSet, RuleScanState
+from .aho_corasick import AhoCorasick
+
+# Every boundary str.splitlines() splits on
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
 
 class KeywordScanner(BaseScanner):
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, languages: Optional[Dict] = None):
         self.keywords = config.get("keywords", {})
         self.server_keywords = set(self.keywords.get("server_indicators", []))
         self.client_keywords = set(self.keywords.get("client_indicators", []))
+
+        # Legacy keywords go into one automaton; each keyword remembers which
+        # classifications it signals (a keyword may be listed under both).
+        self.keyword_classes: Dict[str, List[str]] = {}
+        for classification, key in (("SERVER", "server_indicators"), ("CLIENT", "client_indicators")):
+            for kw in self.keywords.get(key, []):
+                if kw and not _LINE_BREAK.search(kw) and classification not in self.keyword_classes.get(kw, []):
+                    self.keyword_classes.setdefault(kw, []).append(classification)
+        self.automaton = AhoCorasick(self.keyword_classes)
         
-        # Load patterns
-        self.compiled_patterns = []
-        patterns = config.get("patterns", [])
-        for p in patterns:
-            try:
-                self.compiled_patterns.append({
-                    "regex": re.compile(p["regex"]),
-                    "score": p.get("score", 1.0),
-                    "classification": p.get("classification", "UNKNOWN"),
-                    "name": p.get("name", "unknown")
-                })
-            except re.error as e:
-                pass # Log error in real app
-
-    def scan(self, file_path: str, content: str) -> List[Indicator]:
+        # Load patterns into a single combined matcher; languages resolves the
+        # patterns' `languages` scopes
+        self.ruleset = RuleSet(config.get("patterns", []), languages)
+
+        # Streamed windows look ahead by the longest possible match; unbounded
+        # patterns (e.g. '[^"]+') are capped at large_files.max_overlap
+        max_overlap = config.get("large_files", {}).get("max_overlap", 64 * 1024)
+        longest = max([self.ruleset.max_width] + [len(kw) for kw in self.automaton.keywords])
+        self.window_overlap = min(longest, max_overlap) + WINDOW_LEAD
+
+    def scan(self, file_path: str, content: str) -> List[CompactIndicator]:
         indicators = []
         
         # 1. Regex Patterns Scan
-        for p in self.compiled_patterns:
-            matches = p["regex"].findall(content)
-            if matches:
-                # Limit matches per file to avoid explosion?
-                # Taking set of matches to avoid double counting same word multiple times? 
-                # Or imply frequency matters? User says "+5 points: dependency entry".
-                # If dependency entry appears once, +5. If 5 times, +25?
-                # Proper scoring usually caps per file or counts unique.
-                # Let's count unique matches per pattern per file.
-                unique_matches = set(matches) if isinstance(matches[0], str) else set([m[0] for m in matches])
-                
-                for m in unique_matches:
-                     indicators.append(Indicator(
-                        type="pattern_match",
-                        value=f"{p['name']}: {m[:50]}",
-                        file=file_path,
-                        score=p["score"],
-                        classification=p["classification"]
-                    ))
+        # One pass over the file for all patterns; unique matches per pattern per file.
+        indicators.extend(self._pattern_indicators(file_path, self.ruleset.scan(content, self.ruleset.rules_for(file_path))))
 
         # 2. Legacy Keyword Scan (if any left in config)
-        if self.server_keywords or self.client_keywords:
-            lines = content.splitlines()
-            for i, line in enumerate(lines):
-                line_lower = line.lower()
-                for kw in self.server_keywords:
-                    if kw in line_lower:
-                        indicators.append(Indicator(type="keyword", value=kw, file=file_path, line=i+1, context=line.strip()[:100], classification="SERVER", score=0.1))
-                for kw in self.client_keywords:
-                    if kw in line_lower:
-                        indicators.append(Indicator(type="keyword", value=kw, file=file_path, line=i+1, context=line.strip()[:100], classification="CLIENT", score=0.1))
-                    
+        if self.automaton.keywords:
+            indicators.extend(self._scan_keywords(file_path, content))
+
+        return indicators
+
+    def scan_windows(self, file_path: str, windows: Iterable[Window]) -> List[CompactIndicator]:
+        """Same indicators as scan() on the whole file, fed one Window at a time."""
+        state = RuleScanState()
+        per_line: Dict[int, Set[int]] = {}
+        contexts: Dict[int, str] = {}
+        line = 0
+        rules = self.ruleset.rules_for(file_path)
+        for window in windows:
+            self.ruleset.scan_window(window.text, window.start, window.end, window.offset, state, rules)
+            if self.automaton.keywords:
+                line = self._window_keywords(window, line, per_line, contexts)
+
+        indicators = self._pattern_indicators(file_path, state.values())
+        indicators.extend(self._keyword_indicators(file_path, per_line, contexts))
+        return indicators
+
+    def _pattern_indicators(self, file_path: str, matches: Dict[int, List[str]]) -> List[CompactIndicator]:
+        indicators = []
+        for rule in self.ruleset.rules:
+            for m in matches.get(rule.index, ()):
+                indicators.append(CompactIndicator(
+                    type="pattern_match",
+                    value=f"{rule.name}: {m[:50]}",
+                    file=file_path,
+                    score=rule.score,
+                    classification=rule.classification
+                ))
+        return indicators
+
+    def _scan_keywords(self, file_path: str, content: str) -> List[CompactIndicator]:
+        """
+        Runs the automaton once over the lowercased file and reports each
+        keyword at most once per line, with the line number and context.
+        """
+        lowered = content.lower()
+        hits = {}
+        for start, index in self.automaton.iter_matches(lowered):
+            hits.setdefault(start, set()).add(index)
+        if not hits:
+            return []
+
+        # str.lower() never adds or removes line breaks, so line numbers found in
+        # the lowered text index straight into content.splitlines().
+        line_starts = [0] + [m.end() for m in _LINE_BREAK.finditer(lowered)]
+        per_line: Dict[int, set] = {}
+        for start, found in hits.items():
+            per_line.setdefault(bisect_right(line_starts, start) - 1, set()).update(found)
+
+        lines = content.splitlines()
+        contexts = {line_no: lines[line_no].strip()[:100] for line_no in per_line}
+        return self._keyword_indicators(file_path, per_line, contexts)
+
+    def _window_keywords(self, window: Window, line: int, per_line: Dict[int, Set[int]], contexts: Dict[int, str]) -> int:
+        """
+        Collects keyword hits starting in the window's own part; line is the
+        line number at window.start. Returns the line number at window.end.
+        """
+        text = window.text
+        # Lowered piecewise: str.lower() can change lengths (e.g. 'İ'), so the own
+        # part's bounds are only known this way
+        head, own = text[:window.start].lower(), text[window.start:window.end].lower()
+        lowered = head + own + text[window.end:].lower()
+        own_start, own_end = len(head), len(head) + len(own)
+
+        # Streamed text has its newlines normalized, so every break is one
+        # character; lower() keeps them, in the same order
+        breaks = [m.end() for m in _LINE_BREAK.finditer(lowered, own_start, own_end)]
+        text_break_ends = [m.end() for m in _LINE_BREAK.finditer(text)]
+        first = bisect_right(text_break_ends, window.start)
+        for start, index in self.automaton.iter_matches(lowered):
+            if start < own_start or start >= own_end:
+                continue
+            nth = bisect_right(breaks, start)
+            line_no = line + nth
+            per_line.setdefault(line_no, set()).add(index)
+            if line_no not in contexts:
+                # The line as far as this window can see it
+                i = first + nth
+                line_start = text_break_ends[i - 1] if i else 0
+                line_end = text_break_ends[i] - 1 if i < len(text_break_ends) else len(text)
+                contexts[line_no] = text[line_start:line_end].strip()[:100]
+        return line + len(breaks)
+
+    def _keyword_indicators(self, file_path: str, per_line: Dict[int, Set[int]], contexts: Dict[int, str]) -> List[CompactIndicator]:
+        keywords = self.automaton.keywords
+        indicators = []
+        for line_no in sorted(per_line):
+            context = contexts[line_no]
+            for classification in ("SERVER", "CLIENT"):
+                for index in sorted(per_line[line_no]):
+                    kw = keywords[index]
+                    if classification in self.keyword_classes[kw]:
+                        indicators.append(CompactIndicator(type="keyword", value=kw, file=file_path, line=line_no+1, context=context, classification=classification, score=0.1))
         return indicators
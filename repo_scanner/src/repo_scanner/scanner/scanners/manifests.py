@@ -0,0 +1,151 @@
+import json
+import re
+from typing import Callable, Dict, Iterable, List
+from repo_scanner.scanner.utils import logger
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Distribution name at the start of a PEP 508 requirement ("mcp[cli]>=1.2")
+_PEP508_NAME = re.compile(r"\s*([A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)")
+_EGG = re.compile(r"[#&]egg=([A-Za-z0-9][A-Za-z0-9._-]*)")
+_COMMENT = re.compile(r"(?:^|\s)#.*$")
+
+
+def _requirement_name(spec: str):
+    match = _PEP508_NAME.match(spec)
+    return match.group(1) if match else None
+
+
+def parse_requirements(content: str) -> List[str]:
+    """Distribution names from a pip requirements file."""
+    names = []
+    for line in content.replace("\\\n", "").splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            continue
+        egg = _EGG.search(line)
+        if egg:
+            # -e git+https://...#egg=name, or a bare VCS/URL requirement
+            names.append(egg.group(1))
+            continue
+        line = _COMMENT.sub("", line).strip()
+        if not line or line.startswith("-") or "://" in line.split("@")[0]:
+            # Options (-r, -c, --index-url, ...) and unnamed URLs
+            continue
+        name = _requirement_name(line)
+        if name:
+            names.append(name)
+    return names
+
+
+def parse_package_json(content: str) -> List[str]:
+    """Package names from the dependency sections of an npm package.json."""
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        logger.debug(f"Invalid package.json: {e}")
+        return []
+    if not isinstance(data, dict):
+        return []
+    names = []
+    for section in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies"):
+        deps = data.get(section)
+        if isinstance(deps, dict):
+            names.extend(deps)
+    for section in ("bundleDependencies", "bundledDependencies"):
+        deps = data.get(section)
+        if isinstance(deps, list):
+            names.extend(d for d in deps if isinstance(d, str))
+    return names
+
+
+def _load_toml(content: str, kind: str) -> Dict:
+    if tomllib is None:
+        logger.debug(f"Skipping {kind}: no TOML parser (pip install tomli)")
+        return {}
+    try:
+        return tomllib.loads(content)
+    except ValueError as e:  # TOMLDecodeError
+        logger.debug(f"Invalid {kind}: {e}")
+        return {}
+
+
+def _table(data, *keys) -> Dict:
+    for key in keys:
+        data = data.get(key) if isinstance(data, dict) else None
+    return data if isinstance(data, dict) else {}
+
+
+def _specs(items) -> Iterable[str]:
+    return (i for i in items if isinstance(i, str)) if isinstance(items, list) else ()
+
+
+def parse_pyproject(content: str) -> List[str]:
+    """Distribution names from PEP 621, PEP 735 and Poetry dependency tables."""
+    data = _load_toml(content, "pyproject.toml")
+    specs = list(_specs(_table(data, "project").get("dependencies")))
+    for group in _table(data, "project", "optional-dependencies").values():
+        specs.extend(_specs(group))
+    for group in _table(data, "dependency-groups").values():
+        specs.extend(_specs(group))  # {include-group = ...} entries are skipped
+    names = [name for name in map(_requirement_name, specs) if name]
+
+    poetry = _table(data, "tool", "poetry")
+    tables = [_table(poetry, "dependencies"), _table(poetry, "dev-dependencies")]
+    tables.extend(_table(group, "dependencies") for group in _table(poetry, "group").values())
+    for table in tables:
+        names.extend(name for name in table if name.lower() != "python")
+    return names
+
+
+def parse_cargo_toml(content: str) -> List[str]:
+    """Crate names from a Cargo manifest, following `package = "..."` renames."""
+    data = _load_toml(content, "Cargo.toml")
+    sections = ("dependencies", "dev-dependencies", "build-dependencies")
+    tables = [_table(data, s) for s in sections]
+    tables.append(_table(data, "workspace", "dependencies"))
+    for target in _table(data, "target").values():
+        tables.extend(_table(target, s) for s in sections)
+
+    names = []
+    for table in tables:
+        for key, spec in table.items():
+            renamed = spec.get("package") if isinstance(spec, dict) else None
+            names.append(renamed if isinstance(renamed, str) else key)
+    return names
+
+
+def parse_go_mod(content: str) -> List[str]:
+    """Module paths from the require directives of a go.mod."""
+    names = []
+    in_block = False
+    for line in content.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if in_block:
+            if line == ")":
+                in_block = False
+            elif line:
+                names.append(line.split()[0])
+        elif line.startswith("require"):
+            rest = line[len("require"):].strip()
+            if rest == "(":
+                in_block = True
+            elif rest:
+                names.append(rest.split()[0])
+    return names
+
+
+# Manifest file name -> parser returning the declared dependency names
+PARSERS: Dict[str, Callable[[str], List[str]]] = {
+    "requirements.txt": parse_requirements,
+    "package.json": parse_package_json,
+    "pyproject.toml": parse_pyproject,
+    "Cargo.toml": parse_cargo_toml,
+    "go.mod": parse_go_mod,
+}
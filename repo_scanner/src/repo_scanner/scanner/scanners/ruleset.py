@@ -0,0 +1,342 @@
+import fnmatch
+import os
+import re
+from time import perf_counter
+from typing import FrozenSet, List, Dict, Optional, Tuple
+from repo_scanner.scanner.utils import logger
+from repo_scanner.scanner import metrics as scan_metrics
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Leading global inline flags, e.g. '(?i)'. They have to be turned into scoped
+# flags '(?i:...)' before a pattern can be embedded in the combined matcher.
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# Non-ASCII characters that IGNORECASE treats as equal to an ASCII letter but
+# that str.lower() does not map onto it.
+_CASEFOLD_FIXES = str.maketrans({"İ": "i", "ı": "i", "ſ": "s"})
+
+_MAX_COMBINED_CACHE = 256
+# Rule lists cached per file name (names matched by a `files` glob)
+_MAX_NAME_ROUTES = 1024
+
+
+def _required_literals(parsed, ignore_case: bool) -> Optional[List[str]]:
+    """
+    Returns literals of which at least one must occur in any match of the
+    parsed pattern, or None when no such set can be derived.
+    """
+    best: Optional[List[str]] = None
+    run = []
+
+    def consider(candidates):
+        nonlocal best
+        if not candidates:
+            return
+        # Prefer the set whose weakest member is the longest (fewer false positives).
+        if best is None or min(map(len, candidates)) > min(map(len, best)):
+            best = candidates
+
+    def flush():
+        if run:
+            consider(["".join(run)])
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            ch = chr(av)
+            run.append(ch.lower() if ignore_case else ch)
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            add_flags, del_flags, sub = av[1], av[2], av[3]
+            sub_ignore = (ignore_case or bool(add_flags & re.IGNORECASE)) and not (del_flags & re.IGNORECASE)
+            # The literals are looked up in the text as cased for the whole
+            # rule, so a group with scoped case flags cannot contribute
+            if sub_ignore == ignore_case:
+                consider(_required_literals(sub, ignore_case))
+        elif op is sre_parse.BRANCH:
+            alternatives = []
+            for branch in av[1]:
+                lits = _required_literals(branch, ignore_case)
+                if not lits:
+                    alternatives = None
+                    break
+                alternatives.extend(lits)
+            if alternatives:
+                # A literal that contains another alternative adds nothing to the check
+                unique = set(alternatives)
+                consider(sorted(a for a in unique if not any(b != a and b in a for b in unique)))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2], ignore_case))
+    flush()
+    return best
+
+
+class CompiledRule:
+    """A single pattern from scanner_config.yaml plus its prefilter data."""
+
+    def __init__(self, index: int, regex: re.Pattern, name: str, score: float, classification: str):
+        self.index = index
+        self.regex = regex
+        self.name = name
+        self.score = score
+        self.classification = classification
+        self.group_name = f"p{index}"
+        # File scope from `languages`/`files` (see RuleSet); None means every file
+        self.extensions: Optional[FrozenSet[str]] = None
+        self.filenames: Optional[FrozenSet[str]] = None
+        self.file_glob: Optional[re.Pattern] = None
+        self.literals: Optional[List[str]] = None
+        self.literals_ignore_case = bool(regex.flags & re.IGNORECASE)
+        # Embeddable form of the pattern, or None if it must run on its own
+        self.embedded: Optional[str] = None
+        # Longest possible match (sre's MAXREPEAT-based bound when unbounded)
+        self.max_width = 0
+
+        try:
+            parsed = sre_parse.parse(regex.pattern, regex.flags)
+        except re.error:
+            return
+        self.literals = _required_literals(parsed.data, self.literals_ignore_case)
+
+        min_width, self.max_width = parsed.getwidth()
+        has_backrefs = "(?P=" in regex.pattern or re.search(r"\\[1-9]", regex.pattern)
+        if min_width == 0 or has_backrefs or regex.groupindex:
+            return
+        body = regex.pattern
+        flags = _GLOBAL_FLAGS.match(body)
+        if flags:
+            body = f"(?{flags.group(1)}:{body[flags.end():]})"
+        try:
+            re.compile(body)
+        except re.error:
+            return
+        self.embedded = body
+
+    @property
+    def scoped(self) -> bool:
+        return self.extensions is not None
+
+    def applies_to(self, name: str, extension: str) -> bool:
+        if self.extensions is None:
+            return True
+        return (extension in self.extensions or name in self.filenames
+                or (self.file_glob is not None and self.file_glob.match(name) is not None))
+
+    def value_of(self, match: re.Match, offset: int) -> str:
+        # Mirrors findall: the first group if the pattern has groups, else the whole match
+        if self.regex.groups:
+            return match.group(offset + 1) or ""
+        return match.group(offset)
+
+
+class RuleSet:
+    """
+    All keyword patterns compiled into one combined matcher.
+
+    Each file is lowercased once and checked against the literals every rule
+    requires; only the surviving rules are walked, in a single pass, by a
+    combined regex with one named group per rule. The result per rule is the
+    same set of unique values a separate findall would have produced.
+
+    A pattern may be limited to some files with `languages` (names from the
+    languages config: their extensions and special files) and/or `files`
+    (file names, or globs like '*.toml'); rules_for() picks the rules for a
+    file path, cached per extension. Without a languages config, `languages`
+    cannot be resolved and the pattern applies to every file.
+    """
+
+    def __init__(self, patterns: List[Dict], languages: Optional[Dict] = None):
+        self.rules: List[CompiledRule] = []
+        for p in patterns:
+            try:
+                regex = re.compile(p["regex"])
+            except re.error as e:
+                logger.warning(f"Invalid pattern {p.get('name', 'unknown')}: {e}")
+                continue
+            self.rules.append(CompiledRule(
+                index=len(self.rules),
+                regex=regex,
+                name=p.get("name", "unknown"),
+                score=p.get("score", 1.0),
+                classification=p.get("classification", "UNKNOWN"),
+            ))
+            self._set_scope(self.rules[-1], p, languages)
+        self.scoped = any(r.scoped for r in self.rules)
+        # Names that can route differently from their extension
+        self.scope_names = frozenset().union(*(r.filenames for r in self.rules if r.scoped))
+        globs = [r.file_glob.pattern for r in self.rules if r.file_glob is not None]
+        self.scope_glob = re.compile("|".join(globs)) if globs else None
+        self._by_extension: Dict[str, List[CompiledRule]] = {}
+        self._by_name: Dict[str, List[CompiledRule]] = {}
+        self._combined_cache: Dict[Tuple[int, ...], Tuple[re.Pattern, List[Tuple[CompiledRule, int]]]] = {}
+
+    @staticmethod
+    def _set_scope(rule: CompiledRule, pattern: Dict, languages: Optional[Dict]):
+        names = pattern.get("languages") or []
+        files = pattern.get("files") or []
+        if not names and not files:
+            return
+        if names and not languages:
+            return
+        table = (languages or {}).get("languages", {})
+        extensions, filenames, globs = set(), set(), []
+        for lang in names:
+            entry = table.get(lang)
+            if entry is None:
+                logger.warning(f"Pattern {rule.name}: unknown language '{lang}'")
+                continue
+            extensions.update(entry.get("extensions", []))
+            filenames.update(entry.get("special_files", []))
+        for name in files:
+            if any(c in name for c in "*?["):
+                globs.append(fnmatch.translate(name))
+            else:
+                filenames.add(name)
+        if not extensions and not filenames and not globs:
+            logger.warning(f"Pattern {rule.name}: empty file scope, applying it to every file")
+            return
+        rule.extensions = frozenset(extensions)
+        rule.filenames = frozenset(filenames)
+        rule.file_glob = re.compile("|".join(globs)) if globs else None
+
+    def rules_for(self, file_path: str) -> List[CompiledRule]:
+        """Rules whose file scope covers file_path."""
+        if not self.scoped:
+            return self.rules
+        name = os.path.basename(file_path)
+        extension = os.path.splitext(name)[1]
+        if name in self.scope_names or (self.scope_glob is not None and self.scope_glob.match(name)):
+            routes, key = self._by_name, name
+        else:
+            routes, key = self._by_extension, extension
+        rules = routes.get(key)
+        if rules is None:
+            if len(routes) >= _MAX_NAME_ROUTES:
+                routes.clear()
+            rules = routes[key] = [r for r in self.rules if r.applies_to(name, extension)]
+        return rules
+
+    def candidates(self, content: str, rules: Optional[List[CompiledRule]] = None) -> List[CompiledRule]:
+        """Rules (of rules, default all) whose required literals appear in content."""
+        lowered = None
+        selected = []
+        for rule in self.rules if rules is None else rules:
+            if rule.literals:
+                if not rule.literals_ignore_case:
+                    haystack = content
+                else:
+                    if lowered is None:
+                        lowered = content.lower() if content.isascii() else content.translate(_CASEFOLD_FIXES).lower()
+                    haystack = lowered
+                if not any(lit in haystack for lit in rule.literals):
+                    continue
+            selected.append(rule)
+        return selected
+
+    def _combined(self, rules: List[CompiledRule]):
+        key = tuple(r.index for r in rules)
+        cached = self._combined_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # (?=A|B|...) only stops where at least one rule matches; each optional
+        # lookahead group then records every rule matching at that position.
+        gate = "|".join(r.embedded for r in rules)
+        captures = "".join(f"(?:(?=(?P<{r.group_name}>{r.embedded}))|)" for r in rules)
+        combined = re.compile(f"(?=(?:{gate})){captures}")
+        offsets = [(r, combined.groupindex[r.group_name]) for r in rules]
+
+        if len(self._combined_cache) >= _MAX_COMBINED_CACHE:
+            self._combined_cache.clear()
+        self._combined_cache[key] = (combined, offsets)
+        return combined, offsets
+
+    @property
+    def max_width(self) -> int:
+        """Longest match any rule can produce (very large if a rule is unbounded)."""
+        return max((r.max_width for r in self.rules), default=0)
+
+    def scan(self, content: str, rules: Optional[List[CompiledRule]] = None) -> Dict[int, List[str]]:
+        """
+        Returns {rule index: unique matched values in first-seen order} for every
+        rule (of rules, default all) that matched.
+        """
+        state = RuleScanState()
+        self.scan_window(content, 0, len(content), 0, state, rules)
+        return state.values()
+
+    def scan_window(self, text: str, start: int, end: int, offset: int, state: "RuleScanState",
+                    rules: Optional[List[CompiledRule]] = None):
+        """
+        Scans the matches starting in text[start:end] into state. offset is the
+        position of text[0] in the whole file; state carries the per-rule end
+        of the last accepted match across windows, so a match that overlaps one
+        accepted in an earlier window is dropped exactly like findall does.
+        """
+        results = state.results
+        metrics = scan_metrics.current()
+        if metrics is not None:
+            started = perf_counter()
+        candidates = self.candidates(text, rules)
+        if metrics is not None:
+            metrics.add_pattern("(prefilter)", perf_counter() - started, 1)
+            for rule in candidates:
+                metrics.add_pattern(rule.name, files=1)
+            started = perf_counter()
+        embedded = [r for r in candidates if r.embedded]
+        # findall also reports an empty match at the very end of the text,
+        # which only the last window (the one reaching the end) sees
+        limit = end if end < len(text) else end + 1
+
+        if embedded:
+            combined, offsets = self._combined(embedded)
+            # Per-rule end of the last accepted match, relative to text
+            next_pos = [state.next_pos.get(rule.index, 0) - offset for rule, _ in offsets]
+            for m in combined.finditer(text, start):
+                pos = m.start()
+                if pos >= limit:
+                    break
+                for i, (rule, group) in enumerate(offsets):
+                    group_end = m.end(group)
+                    if group_end < 0 or pos < next_pos[i]:
+                        continue
+                    next_pos[i] = group_end
+                    results.setdefault(rule.index, {})[rule.value_of(m, group)] = None
+            for i, (rule, _) in enumerate(offsets):
+                if next_pos[i] + offset > state.next_pos.get(rule.index, 0):
+                    state.next_pos[rule.index] = next_pos[i] + offset
+            if metrics is not None:
+                metrics.add_pattern("(combined)", perf_counter() - started, 1)
+
+        for rule in candidates:
+            if rule.embedded:
+                continue
+            if metrics is not None:
+                started = perf_counter()
+            pos = max(start, state.next_pos.get(rule.index, 0) - offset)
+            values = None
+            for m in rule.regex.finditer(text, pos):
+                if m.start() >= limit:
+                    break
+                if values is None:
+                    values = results.setdefault(rule.index, {})
+                values[rule.value_of(m, 0)] = None
+                state.next_pos[rule.index] = offset + m.end()
+            if metrics is not None:
+                metrics.add_pattern(rule.name, perf_counter() - started)
+
+
+class RuleScanState:
+    """Matches collected so far for one file, possibly over several windows."""
+
+    def __init__(self):
+        self.results: Dict[int, Dict[str, None]] = {}
+        self.next_pos: Dict[int, int] = {}
+
+    def values(self) -> Dict[int, List[str]]:
+        return {index: list(values) for index, values in self.results.items()}
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from repo_scanner.scanner.result import Indicator
 from repo_scanner.scanner.utils import logger
 
@@ -11,37 +11,50 @@ class Scorer:
         self.weight_dependency = self.weights.get("dependency_match", 0.5)
         self.weight_ast = self.weights.get("ast_match", 0.8)
 
+    def weigh(self, ind: Indicator) -> Tuple[Optional[str], float]:
+        """Returns (category, weight) for a single indicator; category may be None."""
+        weight = ind.score
+        if weight == 0.0:
+             # Fallback to default config weights if no explicit score on indicator
+            if ind.type == "keyword":
+                weight = self.weight_keyword
+            elif ind.type == "dependency":
+                weight = self.weight_dependency
+            elif ind.type.startswith("ast"):
+                weight = self.weight_ast
+        
+        # Use classification if provided, else simple heuristic strings
+        category = ind.classification
+        if not category:
+            val_lower = ind.value.lower()
+            if "server" in val_lower or "listen" in val_lower or "bind" in val_lower:
+                category = "SERVER"
+            elif "client" in val_lower or "connect" in val_lower:
+                category = "CLIENT"
+        return category, weight
+
     def calculate_score(self, indicators: List[Indicator]) -> Dict[str, float]:
         """
         Calculates scores for SERVER and CLIENT based on indicators.
         Returns a dict: {"SERVER": float, "CLIENT": float}
         """
-        scores = {"SERVER": 0.0, "CLIENT": 0.0}
-        
+        accumulator = ScoreAccumulator(self)
+        accumulator.add(indicators)
+        return accumulator.scores
+
+
+class ScoreAccumulator:
+    """Running per-category scores, fed one file's indicators at a time."""
+
+    def __init__(self, scorer: Scorer):
+        self.scorer = scorer
+        self.scores = {"SERVER": 0.0, "CLIENT": 0.0}
+
+    def add(self, indicators: List[Indicator]) -> Dict[str, float]:
+        scores = self.scores
         for ind in indicators:
-            weight = ind.score
-            if weight == 0.0:
-                 # Fallback to default config weights if no explicit score on indicator
-                if ind.type == "keyword":
-                    weight = self.weight_keyword
-                elif ind.type == "dependency":
-                    weight = self.weight_dependency
-                elif ind.type.startswith("ast"):
-                    weight = self.weight_ast
-            
-            # Use classification if provided, else simple heuristic strings
-            category = ind.classification
-            if not category:
-                val_lower = ind.value.lower()
-                if "server" in val_lower or "listen" in val_lower or "bind" in val_lower:
-                    category = "SERVER"
-                elif "client" in val_lower or "connect" in val_lower:
-                    category = "CLIENT"
-            
-            if category in scores:
-                scores[category] += weight
-            elif category:
+            category, weight = self.scorer.weigh(ind)
+            if category:
                 # Auto-initialize if new category found (e.g. PROTOCOL_RELATED)
                 scores[category] = scores.get(category, 0.0) + weight
-
         return scores
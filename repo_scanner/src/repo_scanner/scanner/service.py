@@ -0,0 +1,375 @@
+import errno
+import json
+import os
+import stat
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .batch import BatchScanner
+from .github_client import GitHubClient
+from .repo_fetcher import RepoFetcher
+from .result import ScanResult
+from .result_cache import config_hash
+from .utils import load_config, logger
+
+# Job kinds, also the keys of a POST /scan request body
+KINDS = ("repo", "path")
+# Largest request body accepted, in bytes
+MAX_BODY = 64 * 1024
+
+
+class Job:
+    """One scan request: a GitHub repository (owner/name) or a local directory."""
+
+    def __init__(self, kind: str, target: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.target = target
+        self.status = "queued"  # queued -> running -> done
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[ScanResult] = None
+        self.done = threading.Event()
+
+    def as_dict(self, with_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "target": self.target,
+            "status": self.status,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.result is not None:
+            data["classification"] = self.result.classification
+            data["confidence"] = self.result.confidence
+            if with_result:
+                data["result"] = self.result.model_dump(mode="json")
+        return data
+
+
+class _Generation:
+    """A config snapshot with its BatchScanner and warm worker pool."""
+
+    def __init__(self, config: Dict, languages: Dict, batch: BatchScanner):
+        self.config = config
+        self.languages = languages
+        self.hash = config_hash(config, languages)
+        self.batch = batch
+        self.pool: ProcessPoolExecutor = batch.open_pool()
+        self.active = 0
+        self.retired = False
+
+
+class ScanService:
+    """
+    Long-running scanner behind the `serve` command.
+
+    Worker processes build their scanners (compiled patterns, file filter)
+    once per config and keep them for every job; the GitHubClient keeps its
+    HTTP session and ETag cache across jobs. Jobs are submitted with
+    submit() and run on a thread pool that downloads and hands the scanning
+    to the worker processes (see BatchScanner.scan / scan_path).
+
+    The config files are checked for changes at most every reload_interval
+    seconds when a job is submitted, and on reload(). A changed config starts
+    a new worker pool; jobs already running finish on the old one, which is
+    shut down once they are done. Finished jobs are kept for lookup until
+    more than max_jobs are stored.
+    """
+
+    def __init__(self, config_path: str, languages_path: str, client: GitHubClient, fetcher: RepoFetcher,
+                 workers: int = 2, max_jobs: int = 1000, reload_interval: float = 2.0,
+                 batch_options: Optional[Dict] = None,
+                 on_result: Optional[Callable[[ScanResult, Dict], None]] = None):
+        self.config_path = config_path
+        self.languages_path = languages_path
+        self.client = client
+        self.fetcher = fetcher
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self.reload_interval = reload_interval
+        self.batch_options = batch_options or {}
+        self.on_result = on_result
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._result_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._threads = ThreadPoolExecutor(self.workers * 2)
+        self._mtimes = self._config_mtimes()
+        self._checked = time.monotonic()
+        config, languages = self._load_configs()
+        self._generation = self._start_generation(config, languages)
+
+    def _config_mtimes(self) -> Tuple[float, float]:
+        def mtime(path):
+            try:
+                return os.stat(path).st_mtime
+            except OSError:
+                return 0.0
+        return mtime(self.config_path), mtime(self.languages_path)
+
+    def _load_configs(self) -> Tuple[Dict, Dict]:
+        return load_config(self.config_path) or {}, load_config(self.languages_path) or {}
+
+    def _start_generation(self, config: Dict, languages: Dict) -> _Generation:
+        batch = BatchScanner(config, languages, self.client, self.fetcher, workers=self.workers, **self.batch_options)
+        generation = _Generation(config, languages, batch)
+        logger.info(f"Scanner config {generation.hash} loaded ({self.workers} worker(s))")
+        return generation
+
+    @property
+    def config_hash(self) -> str:
+        return self._generation.hash
+
+    def reload(self, force: bool = False) -> bool:
+        """Starts a new generation if the config files changed (or force); True if it did."""
+        with self._reload_lock:
+            return self._reload(force)
+
+    def _reload(self, force: bool) -> bool:
+        mtimes = self._config_mtimes()
+        if not force and mtimes == self._mtimes:
+            return False
+        self._mtimes = mtimes
+        config, languages = self._load_configs()
+        if not config or not languages:
+            logger.error("Config reload failed; keeping the current config")
+            return False
+        if config_hash(config, languages) == self._generation.hash:
+            return False
+
+        generation = self._start_generation(config, languages)
+        with self._lock:
+            old, self._generation = self._generation, generation
+            old.retired = True
+            idle = old.active == 0
+        if idle:
+            old.pool.shutdown(wait=False)
+        return True
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        try:
+            self.reload()
+        except Exception as e:
+            logger.error(f"Config reload failed: {e}")
+
+    def submit(self, kind: str, target: str) -> Job:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown job kind '{kind}' (choose from {', '.join(KINDS)})")
+        if kind == "repo" and target.count("/") != 1:
+            raise ValueError(f"Invalid repo name: {target}. Must be owner/repo.")
+        self._maybe_reload()
+
+        job = Job(kind, target)
+        with self._lock:
+            generation = self._generation
+            generation.active += 1
+            self.jobs[job.id] = job
+            self._trim_jobs()
+        self._threads.submit(self._run, job, generation)
+        return job
+
+    def _trim_jobs(self):
+        # Oldest finished jobs go first; queued and running ones are kept
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self.jobs.values() if j.done.is_set()][:excess]:
+            del self.jobs[job_id]
+
+    def _run(self, job: Job, generation: _Generation):
+        job.status = "running"
+        job.started = time.time()
+        try:
+            if job.kind == "repo":
+                result = generation.batch.scan(generation.pool, job.target)
+            else:
+                result = generation.batch.scan_path(generation.pool, job.target)
+            if self.on_result:
+                with self._result_lock:
+                    self.on_result(result, generation.config)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            result = ScanResult(repository=job.target, classification="ERROR")
+        finally:
+            with self._lock:
+                generation.active -= 1
+                idle = generation.retired and generation.active == 0
+            if idle:
+                generation.pool.shutdown(wait=False)
+        job.result = result
+        job.finished = time.time()
+        job.status = "done"
+        job.done.set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def health(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.list_jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "ok",
+            "config_hash": self.config_hash,
+            "workers": self.workers,
+            "uptime": round(time.time() - self.started, 3),
+            "jobs": counts,
+        }
+
+    def close(self):
+        self._threads.shutdown(wait=True)
+        self._generation.pool.shutdown(wait=True)
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    JSON API of the scan service:
+
+      POST /scan      {"repo": "owner/name"} or {"path": "/dir"}; with
+                      "wait": seconds (or true) the response waits for the
+                      result, otherwise it returns the queued job (202)
+      GET  /jobs      all stored jobs, without results
+      GET  /jobs/<id> one job, with its ScanResult once done
+      POST /reload    re-read the config files
+      GET  /health    config hash, uptime and job counts
+    """
+
+    server_version = "repo-scanner"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ScanService:
+        return self.server.service
+
+    def _send(self, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> str:
+        return self.path.split("?", 1)[0].rstrip("/") or "/"
+
+    def _read_json(self) -> Dict:
+        """The request body as a JSON object; raises _RequestError with the status to answer."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise _RequestError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            raise _RequestError(413, f"Request body over {MAX_BODY} bytes")
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            raise _RequestError(400, f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise _RequestError(400, "Invalid JSON: Request body must be a JSON object")
+        return data
+
+    def do_GET(self):
+        route = self._route()
+        if route == "/health":
+            self._send(200, self.service.health())
+        elif route == "/jobs":
+            self._send(200, [job.as_dict(with_result=False) for job in self.service.list_jobs()])
+        elif route.startswith("/jobs/"):
+            job = self.service.get(route[len("/jobs/"):])
+            if job is None:
+                self._send(404, {"error": "Unknown job"})
+            else:
+                self._send(200, job.as_dict())
+        else:
+            self._send(404, {"error": f"Unknown endpoint {route}"})
+
+    def do_POST(self):
+        route = self._route()
+        try:
+            body = self._read_json()
+        except _RequestError as e:
+            # The body may be left unread, so the connection cannot be reused
+            self.close_connection = True
+            self._send(e.status, {"error": str(e)})
+            return
+
+        if route == "/reload":
+            reloaded = self.service.reload(force=True)
+            self._send(200, {"reloaded": reloaded, "config_hash": self.service.config_hash})
+            return
+        if route != "/scan":
+            self._send(404, {"error": f"Unknown endpoint {route}"})
+            return
+
+        kind = next((k for k in KINDS if k in body), None)
+        if kind is None or not isinstance(body[kind], str):
+            self._send(400, {"error": "Expected {\"repo\": \"owner/name\"} or {\"path\": \"/dir\"}"})
+            return
+        try:
+            job = self.service.submit(kind, body[kind])
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        wait = body.get("wait")
+        if wait is True:
+            job.done.wait()
+        elif isinstance(wait, (int, float)) and wait > 0:
+            job.done.wait(wait)
+        self._send(200 if job.done.is_set() else 202, job.as_dict())
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.command} {self.path}: {format % args}")
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: ScanService, host: str = "127.0.0.1", port: int = 8765,
+                socket_path: Optional[str] = None):
+    """
+    HTTP server for service on host:port, or on a Unix socket at socket_path.
+    A socket left at socket_path by an earlier run is replaced; any other
+    file there raises FileExistsError.
+    """
+    if socket_path:
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(errno.EEXIST, "Not a socket; refusing to replace it", socket_path)
+            os.unlink(socket_path)  # stale socket from an earlier run
+        server = _UnixHTTPServer(socket_path, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    server.service = service
+    return server
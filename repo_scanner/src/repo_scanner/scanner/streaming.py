@@ -0,0 +1,105 @@
+import codecs
+import hashlib
+import io
+import mmap
+from contextlib import contextmanager
+from typing import Callable, Generator, IO, Iterator, Optional
+
+# Characters kept in front of each window so lookbehinds and \b at the
+# window start see the same text as in a whole-file scan
+WINDOW_LEAD = 64
+
+
+class Window:
+    """
+    One slice of a streamed file. text[start:end] is the part this window
+    owns; text[:start] repeats the end of the previous window and text[end:]
+    is lookahead that the next window owns. offset is the position of text[0]
+    in the whole (decoded) file.
+    """
+
+    __slots__ = ("text", "start", "end", "offset")
+
+    def __init__(self, text: str, start: int, end: int, offset: int):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.offset = offset
+
+
+def iter_windows(read: Callable[[int], bytes], chunk_size: int, overlap: int) -> Generator[Window, None, None]:
+    """
+    Splits a byte stream into Windows of chunk_size characters plus overlap
+    characters of lookahead. Decoding and newline handling are the same as
+    open(..., 'r', encoding='utf-8', errors='ignore'), done incrementally, so
+    at most about chunk_size + overlap characters are held at a time.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(errors="ignore"), translate=True)
+    buf = ""
+    buf_offset = 0  # file position of buf[0]
+    start = 0  # start of the next window's own part, relative to buf
+    eof = False
+
+    while True:
+        while not eof and len(buf) - start < chunk_size + overlap:
+            data = read(chunk_size)
+            if not data:
+                buf += decoder.decode(b"", final=True)
+                eof = True
+            else:
+                buf += decoder.decode(data)
+
+        end = len(buf) if eof else start + chunk_size
+        if end > start or start == 0:
+            yield Window(buf, start, end, buf_offset)
+        if eof:
+            return
+
+        cut = max(0, end - WINDOW_LEAD)
+        buf = buf[cut:]
+        buf_offset += cut
+        start = end - cut
+
+
+class LargeFile:
+    """
+    A file above FileFilter.max_file_size, scanned in windows instead of being
+    loaded whole. Files on disk are memory-mapped; archive members pass an
+    opener that returns a binary stream.
+    """
+
+    def __init__(self, path: str, extension: str, size: int, chunk_size: int,
+                 opener: Optional[Callable[[], IO[bytes]]] = None):
+        self.path = path
+        self.extension = extension
+        self.size = size
+        self.chunk_size = chunk_size
+        self.opener = opener
+
+    @property
+    def picklable(self) -> bool:
+        """Files on disk can be handed to worker processes; archive members cannot."""
+        return self.opener is None
+
+    @contextmanager
+    def _reader(self) -> Iterator[Callable[[int], bytes]]:
+        if self.opener is not None:
+            with self.opener() as stream:
+                yield stream.read
+            return
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm.read
+
+    @contextmanager
+    def windows(self, overlap: int) -> Iterator[Iterator[Window]]:
+        with self._reader() as read:
+            yield iter_windows(read, self.chunk_size, overlap)
+
+    def sha256(self) -> str:
+        """Hash of the decoded text, matching a hash of the fully read content."""
+        digest = hashlib.sha256()
+        with self.windows(0) as windows:
+            for window in windows:
+                digest.update(window.text[window.start:window.end].encode("utf-8", errors="ignore"))
+        return digest.hexdigest()
@@ -0,0 +1,80 @@
+import posixpath
+from typing import Callable, Dict, List, Optional, Set
+from .result import ScanResult
+from .indicator_store import CompactIndicator
+from .scorer import Scorer
+from .scanners.keyword_scanner import KeywordScanner
+from .scanners.dependency_scanner import DependencyScanner
+from .pipeline import build_result
+from .utils import logger
+
+DEFAULT_TRIAGE_FILES = ["package.json", "requirements.txt", "pyproject.toml", "go.mod", "Cargo.toml"]
+
+
+class TriageOutcome:
+    def __init__(self, passed: bool, score: float, indicators: List[CompactIndicator], files_scanned: int, extensions: Set[str]):
+        self.passed = passed
+        self.score = score
+        self.indicators = indicators
+        self.files_scanned = files_scanned
+        self.extensions = extensions
+
+    def to_result(self, config: Dict, repository: str, commit_sha: Optional[str] = None) -> ScanResult:
+        """Result for a repository whose archive was skipped after triage."""
+        result = build_result(config, repository, self.indicators, self.files_scanned, self.extensions)
+        result.commit_sha = commit_sha
+        result.triaged = True
+        return result
+
+
+class Triage:
+    """
+    Cheap first stage of a repository scan.
+
+    Looks at the git tree listing, fetches only the high-signal manifests
+    named in the `triage.files` config, and runs the keyword and dependency
+    scanners on them. The full archive is only worth downloading when the
+    resulting score reaches `triage.cutoff`, when the tree was truncated, or
+    (by default) when the repository has none of the manifests at all.
+    """
+
+    def __init__(self, config: Dict):
+        triage_config = config.get("triage", {})
+        self.cutoff = triage_config.get("cutoff", 1.0)
+        self.max_files = triage_config.get("max_files", 10)
+        self.files = set(triage_config.get("files", DEFAULT_TRIAGE_FILES))
+        self.fetch_without_manifests = triage_config.get("fetch_without_manifests", True)
+        self.scanners = [KeywordScanner(config), DependencyScanner(config)]
+        self.scorer = Scorer(config)
+
+    def select(self, tree: List[Dict]) -> List[Dict]:
+        """Manifest blobs from a tree listing, shallowest first."""
+        manifests = [
+            entry for entry in tree
+            if entry.get("type") == "blob" and posixpath.basename(entry["path"]) in self.files
+        ]
+        manifests.sort(key=lambda e: (e["path"].count("/"), e["path"]))
+        return manifests[:self.max_files]
+
+    def run(self, tree: Dict, read_blob: Callable[[str], bytes]) -> TriageOutcome:
+        """tree is a recursive git tree response; read_blob fetches a blob by SHA."""
+        if tree.get("truncated"):
+            logger.debug("Tree listing truncated; skipping triage.")
+            return TriageOutcome(True, 0.0, [], 0, set())
+
+        manifests = self.select(tree.get("tree", []))
+        if not manifests:
+            return TriageOutcome(self.fetch_without_manifests, 0.0, [], 0, set())
+
+        indicators = []
+        extensions = set()
+        for entry in manifests:
+            path = entry["path"]
+            content = read_blob(entry["sha"]).decode("utf-8", errors="ignore")
+            extensions.add(posixpath.splitext(path)[1])
+            for scanner in self.scanners:
+                indicators.extend(scanner.scan(path, content))
+
+        scores = self.scorer.calculate_score(indicators)
+        score = max(scores.get("SERVER", 0.0), scores.get("CLIENT", 0.0))
+        return TriageOutcome(score >= self.cutoff, score, indicators, len(manifests), extensions)
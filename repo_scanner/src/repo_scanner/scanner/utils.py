@@ -1,6 +1,19 @@
 import logging
 import sys
-from rich.logging import RichHandler
+
+class _LazyRichHandler(logging.Handler):
+    """RichHandler built on the first record, so rich is only imported once something is logged."""
+
+    def __init__(self):
+        super().__init__()
+        self._handler = None
+
+    def emit(self, record: logging.LogRecord):
+        if self._handler is None:
+            from rich.logging import RichHandler
+            self._handler = RichHandler(rich_tracebacks=True)
+            self._handler.setFormatter(self.formatter)
+        self._handler.handle(record)
 
 def setup_logger(name: str = "repo_scanner", level: int = logging.INFO) -> logging.Logger:
     """Sets up a logger with RichHandler."""
@@ -8,20 +21,29 @@ def setup_logger(name: str = "repo_scanner", level: int = logging.INFO) -> loggi
         level=level,
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)]
+        handlers=[_LazyRichHandler()]
     )
     return logging.getLogger(name)
 
-logger = setup_logger()
+# Configured by the CLI (setup_logger); importing the library installs no handlers
+logger = logging.getLogger("repo_scanner")
+
+def safe_filename(name: str) -> str:
+    """Repository name or local path as a file name component."""
+    return name.replace("/", "_").replace("\\", "_").replace(":", "")
 
 def load_config(path: str) -> dict:
-    import yaml
     try:
         with open(path, 'r') as f:
-            return yaml.safe_load(f)
+            return parse_config(f.read(), path)
     except FileNotFoundError:
         logger.error(f"Config file not found: {path}")
         return {}
+
+def parse_config(text: str, path: str = "<config>") -> dict:
+    import yaml
+    try:
+        return yaml.safe_load(text)
     except yaml.YAMLError as e:
         logger.error(f"Error parsing config file {path}: {e}")
         return {}
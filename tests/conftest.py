@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "repo_scanner", "src")
+CONFIG_DIR = os.path.join(SRC_DIR, "repo_scanner", "config")
+
+# Run against the source tree when the package is not installed
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture(scope="session")
+def config():
+    from repo_scanner.scanner.utils import load_config
+    return load_config(os.path.join(CONFIG_DIR, "scanner_config.yaml"))
+
+
+@pytest.fixture(scope="session")
+def languages():
+    from repo_scanner.scanner.utils import load_config
+    return load_config(os.path.join(CONFIG_DIR, "languages.yaml"))
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from repo_scanner.scanner.scanners.aho_corasick import AhoCorasick
+from repo_scanner.scanner.scanners.keyword_scanner import KeywordScanner
+
+
+def naive(keywords, text):
+    """Every (start, keyword) occurrence, overlaps included, by repeated str.find."""
+    found = set()
+    for kw in dict.fromkeys(k for k in keywords if k):
+        start = text.find(kw)
+        while start != -1:
+            found.add((start, kw))
+            start = text.find(kw, start + 1)
+    return found
+
+
+def matches(keywords, text):
+    automaton = AhoCorasick(keywords)
+    return {(start, automaton.keywords[index]) for start, index in automaton.iter_matches(text)}
+
+
+@pytest.mark.parametrize("keywords, text", [
+    # Overlapping occurrences of one keyword
+    (["aa"], "aaaa"),
+    # Shared prefixes
+    (["mcp", "mcp_server", "mcpserver", "mc"], "use mcp_server and mcpserver, not mc"),
+    # One keyword a suffix or infix of another
+    (["he", "she", "his", "hers"], "ushers shehis"),
+    (["server", "ver", "e"], "mcpserver"),
+    # Failure links through several levels
+    (["abcd", "bcde", "cdef", "c"], "abcdefabcde"),
+    # Duplicates and empty keywords are ignored
+    (["mcp", "mcp", ""], "mcp mcp"),
+    ([], "anything"),
+    (["x"], ""),
+    # Non-ASCII
+    (["é", "ée", "日本"], "éée 日本語 e"),
+])
+def test_matches_naive_search(keywords, text):
+    assert matches(keywords, text) == naive(keywords, text)
+
+
+def test_random_against_naive_search():
+    rng = random.Random(99)
+    for _ in range(500):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 60)))
+        assert matches(keywords, text) == naive(keywords, text), (keywords, text)
+
+
+def test_matching_is_case_sensitive():
+    assert matches(["MCP", "mcp"], "mcp Mcp MCP") == {(0, "mcp"), (8, "MCP")}
+
+
+def legacy_keywords(server, client, file_path, content):
+    """The per-line substring search the automaton replaced in KeywordScanner."""
+    indicators = []
+    for i, line in enumerate(content.splitlines()):
+        line_lower = line.lower()
+        for classification, keywords in (("SERVER", server), ("CLIENT", client)):
+            for kw in dict.fromkeys(keywords):
+                if kw in line_lower:
+                    indicators.append(("keyword", kw, file_path, i + 1, line.strip()[:100], classification, 0.1))
+    return sorted(indicators)
+
+
+def test_keyword_scanner_matches_the_per_line_search():
+    server = ["server", "listen", "mcp", "Upper"]
+    client = ["client", "connect", "mcp"]
+    scanner = KeywordScanner({"keywords": {"server_indicators": server, "client_indicators": client}})
+    rng = random.Random(5)
+    pieces = ["server", "SERVER", "Listen", "mcp", "MCP", "client", "connect", "Upper", " ", "\n", "\r\n", "x", "İ"]
+    for _ in range(300):
+        content = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        found = sorted((i.type, i.value, i.file, i.line, i.context, i.classification, i.score)
+                       for i in scanner.scan("a.py", content))
+        assert found == legacy_keywords(server, client, "a.py", content), content
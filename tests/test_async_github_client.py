@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from repo_scanner.scanner.async_github_client import AsyncGitHubClient
+
+
+class StubAPI:
+    """
+    Local stand-in for the GitHub API. answer(token, path) returns
+    (status, headers) for each request; every request is recorded as
+    (arrival time, token, path).
+    """
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                token = (self.headers.get("Authorization") or "token -").split()[-1]
+                stub.requests.append((time.time(), token, self.path))
+                status, headers = stub.answer(token, self.path)
+                body = json.dumps({"path": self.path}).encode("utf-8")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def make(answer):
+        servers.append(StubAPI(answer))
+        return servers[-1]
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def client_for(server, tokens, **kwargs):
+    return AsyncGitHubClient(tokens, base_url=server.url, **kwargs)
+
+
+def test_requests_are_paced_over_the_window(stub):
+    reset = time.time() + 2
+    # 14 left with a reserve of 10: 4 requests spread over the 2 seconds to the reset
+    server = stub(lambda token, path: (200, {"x-ratelimit-remaining": 14, "x-ratelimit-reset": reset}))
+    client = client_for(server, ["a"])
+    try:
+        for i in range(4):
+            client.call(client.request("GET", f"/r{i}"))
+    finally:
+        client.close()
+    arrivals = [t for t, _, _ in server.requests]
+    gaps = [b - a for a, b in zip(arrivals[1:], arrivals[2:])]
+    assert all(gap >= 0.35 for gap in gaps), gaps
+
+
+def test_exhausted_token_is_rotated_out(stub):
+    reset = time.time() + 60
+
+    def answer(token, path):
+        if token == "a":
+            return 403, {"x-ratelimit-remaining": 0, "x-ratelimit-reset": reset}
+        return 200, {"x-ratelimit-remaining": 4000, "x-ratelimit-reset": reset}
+
+    server = stub(answer)
+    client = client_for(server, ["a", "b"])
+    try:
+        for i in range(3):
+            assert client.call(client.request("GET", f"/r{i}")).json() == {"path": f"/r{i}"}
+    finally:
+        client.close()
+    tokens = [token for _, token, _ in server.requests]
+    # At most one request per path on "a" before it is parked until the reset
+    assert tokens.count("a") == 1
+    assert tokens[-3:] == ["b", "b", "b"]
+
+
+def test_retry_after_pauses_the_token(stub):
+    seen = []
+
+    def answer(token, path):
+        seen.append(path)
+        if len(seen) == 1:
+            return 429, {"retry-after": 1}
+        return 200, {}
+
+    server = stub(answer)
+    client = client_for(server, ["a"])
+    try:
+        started = time.time()
+        client.call(client.request("GET", "/r"))
+        elapsed = time.time() - started
+    finally:
+        client.close()
+    assert len(server.requests) == 2
+    assert elapsed >= 0.9
+
+
+def test_retries_give_up_with_an_error(stub):
+    server = stub(lambda token, path: (429, {"retry-after": 0}))
+    client = client_for(server, ["a"], max_retries=2)
+    try:
+        with pytest.raises(RuntimeError, match="Giving up"):
+            client.call(client.request("GET", "/r"))
+    finally:
+        client.close()
+    assert len(server.requests) == 3
+
+
+def test_concurrent_callers_share_one_loop(stub):
+    server = stub(lambda token, path: (200, {}))
+    client = client_for(server, ["a"])
+    loops = set()
+
+    def one(i):
+        loops.add(id(client.start()))
+        return client.call(client.request("GET", f"/r{i}")).json()["path"]
+
+    try:
+        with ThreadPoolExecutor(16) as pool:
+            paths = list(pool.map(one, range(64), timeout=30))
+    finally:
+        client.close()
+    assert len(loops) == 1
+    assert paths == [f"/r{i}" for i in range(64)]
@@ -0,0 +1,90 @@
+import io
+import random
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from repo_scanner.scanner.batch import BatchScanner
+from repo_scanner.scanner.github_client import GitHubClient
+from repo_scanner.scanner.repo_fetcher import RepoFetcher
+
+PIECES = [
+    "from mcp.server import Server\n", "import mcp\n", "server = Server('x')\n", "listTools()\n",
+    "const t = new StdioServerTransport();\n", "client.connect(t);\n", "x = 1\n", "def f():\n    return 2\n",
+]
+# Above the default max_file_size, so it is streamed in windows
+LARGE = "x = 1\n" * 20000 + "@modelcontextprotocol/server-filesystem\n"
+
+
+def make_repo(seed: int):
+    rng = random.Random(seed)
+    files = {}
+    for i in range(rng.randint(5, 25)):
+        ext = rng.choice([".py", ".js", ".ts", ".go", ".md"])
+        files[f"src/m{i}{ext}"] = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+    if seed % 2:
+        files["requirements.txt"] = "mcp\nrequests\n"
+        files["package.json"] = '{"dependencies": {"@modelcontextprotocol/sdk": "1"}}'
+    if seed % 3 == 0:
+        files[f"src/big{seed}.py"] = LARGE
+    return files
+
+
+def zip_bytes(name: str, files) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        for path, content in files.items():
+            archive.writestr(f"{name}-0000000/{path}", content)
+    return buf.getvalue()
+
+
+REPOS = {f"acme/r{i}": make_repo(i) for i in range(8)}
+
+
+@pytest.fixture(scope="module")
+def stub():
+    archives = {name: zip_bytes(name.replace("/", "-"), files) for name, files in REPOS.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path[len("/repos/"):].rsplit("/zipball", 1)[0]
+            body = archives.get(name)
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body or b"")))
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def records(indicators):
+    return [ind.as_dict() for ind in indicators]
+
+
+def batch_results(url, config, languages, workers, fast):
+    batch = BatchScanner(config, languages, GitHubClient(base_url=url), RepoFetcher(), workers=workers, fast=fast)
+    results = list(batch.run(REPOS))
+    assert [r.classification for r in results].count("ERROR") == 0
+    return sorted(results, key=lambda r: r.repository)
+
+
+@pytest.mark.parametrize("fast", [False, True], ids=["full", "fast"])
+def test_batch_workers_match_serial(stub, config, languages, fast):
+    serial = batch_results(stub, config, languages, 1, fast)
+    parallel = batch_results(stub, config, languages, 3, fast)
+    assert [r.repository for r in serial] == sorted(REPOS)
+    assert any(r.stopped_early for r in serial) is fast
+    for one, many in zip(serial, parallel):
+        assert (many.classification, many.confidence, many.files_scanned, many.stopped_early) == \
+            (one.classification, one.confidence, one.files_scanned, one.stopped_early)
+        assert sorted(many.languages_detected) == sorted(one.languages_detected)
+        assert records(many.indicators) == records(one.indicators)
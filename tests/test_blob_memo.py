@@ -0,0 +1,62 @@
+import sqlite3
+
+from repo_scanner.scanner.blob_memo import BlobMemo, blob_sha
+from repo_scanner.scanner.indicator_store import CompactIndicator
+from repo_scanner.scanner.result import FileData
+
+
+def indicator(value: str) -> CompactIndicator:
+    return CompactIndicator(type="pattern_match", value=value, file="a/server.py", score=5.0, classification="SERVER")
+
+
+def file_data(content: str, path: str = "a/server.py") -> FileData:
+    return FileData(path=path, content=content, extension=".py")
+
+
+def count(path: str) -> int:
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+
+def test_blob_sha_matches_git():
+    # git hash-object of "hello\n"
+    assert blob_sha("hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_hit_is_rebound_to_the_file_path(tmp_path):
+    memo = BlobMemo(str(tmp_path / "memo.db"), "rules")
+    key = BlobMemo.key(file_data("x = 1\n"))
+    assert memo.get(key, "a/server.py") is None
+    memo.put(key, [indicator("MCP SDK: mcp")])
+    memo.close()
+
+    memo = BlobMemo(str(tmp_path / "memo.db"), "rules")
+    hits = memo.get(BlobMemo.key(file_data("x = 1\n", "fork/server.py")), "fork/server.py")
+    assert [(h.value, h.file) for h in hits] == [("MCP SDK: mcp", "fork/server.py")]
+    # Other rules, other entries
+    assert BlobMemo(str(tmp_path / "memo.db"), "other").get(key, "a/server.py") is None
+
+
+def test_eviction_removes_only_the_excess(tmp_path):
+    path = str(tmp_path / "memo.db")
+    memo = BlobMemo(path, "rules", max_entries=100)
+    for i in range(100):
+        memo.put(BlobMemo.key(file_data(f"v = {i}\n")), [indicator(f"p: {i}")])
+    memo.flush()
+    assert count(path) == 100
+    # One flush stamps all its rows with the same time; only 10 may go
+    for i in range(100, 110):
+        memo.put(BlobMemo.key(file_data(f"v = {i}\n")), [])
+    memo.flush()
+    assert count(path) == 100
+    memo.close()
+
+
+def test_unusable_path_disables_the_memo(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    memo = BlobMemo(str(blocker / "memo.db"), "rules")
+    key = BlobMemo.key(file_data("x"))
+    assert memo.get(key, "x.py") is None
+    memo.put(key, [indicator("p: x")])
+    memo.close()
@@ -0,0 +1,23 @@
+import copy
+
+import pytest
+
+from repo_scanner.scanner.classifier import Classifier
+
+
+def test_shipped_config_allows_early_stopping(config):
+    assert Classifier(config).monotonic
+
+
+@pytest.mark.parametrize("section, key", [
+    ("patterns", None),
+    ("dependencies", "packages"),
+    ("dependencies", "prefixes"),
+])
+def test_a_negative_score_disables_early_stopping(config, section, key):
+    config = copy.deepcopy(config)
+    entries = config[section][key] if key else config[section]
+    entries[0]["score"] = -1.0
+    classifier = Classifier(config)
+    assert not classifier.monotonic
+    assert not classifier.is_settled({"SERVER": 100.0})
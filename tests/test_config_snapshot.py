@@ -0,0 +1,73 @@
+import os
+import shutil
+
+import pytest
+
+from repo_scanner.scanner import config_snapshot
+from repo_scanner.scanner.config_snapshot import ConfigSnapshot
+from conftest import CONFIG_DIR
+
+
+@pytest.fixture
+def config_files(tmp_path):
+    paths = []
+    for name in ("scanner_config.yaml", "languages.yaml"):
+        shutil.copy(os.path.join(CONFIG_DIR, name), tmp_path / name)
+        paths.append(str(tmp_path / name))
+    return paths
+
+
+def snapshot_files(snapshot_dir):
+    return sorted(n for n in os.listdir(snapshot_dir) if n.endswith(".json"))
+
+
+def test_warm_load_matches_cold_load(tmp_path, config_files, monkeypatch):
+    snapshot_dir = str(tmp_path / "snapshots")
+    cold = ConfigSnapshot.load(*config_files, snapshot_dir)
+    assert len(snapshot_files(snapshot_dir)) == 1
+    # A warm start does not parse YAML
+    monkeypatch.setattr(config_snapshot, "parse_config", None)
+    warm = ConfigSnapshot.load(*config_files, snapshot_dir)
+    assert warm.config == cold.config
+    assert warm.languages == cold.languages
+    assert warm.config_hash == cold.config_hash
+    content = "from mcp.server import Server\n"
+    assert [s.scan("server.py", content) for s in warm.scanners] == [s.scan("server.py", content) for s in cold.scanners]
+
+
+def test_config_edit_makes_a_new_snapshot(tmp_path, config_files):
+    snapshot_dir = str(tmp_path / "snapshots")
+    ConfigSnapshot.load(*config_files, snapshot_dir)
+    with open(config_files[0], "a") as f:
+        f.write("\n# edited\n")
+    ConfigSnapshot.load(*config_files, snapshot_dir)
+    assert len(snapshot_files(snapshot_dir)) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_snapshot_writable_by_others_is_ignored(tmp_path, config_files, monkeypatch):
+    snapshot_dir = str(tmp_path / "snapshots")
+    ConfigSnapshot.load(*config_files, snapshot_dir)
+    path = os.path.join(snapshot_dir, snapshot_files(snapshot_dir)[0])
+    planted = '{"version": 2, "config": {"planted": true}, "languages": {"planted": true}, "config_hash": "x"}'
+
+    def plant(mode):
+        with open(path, "w") as f:
+            f.write(planted)
+        os.chmod(path, mode)
+
+    plant(0o666)
+    assert "planted" not in ConfigSnapshot.load(*config_files, snapshot_dir).config
+    # Replaced by a fresh private snapshot
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    plant(0o600)
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(path).st_uid + 1)
+    assert "planted" not in ConfigSnapshot.load(*config_files, snapshot_dir).config
+
+
+def test_old_pickle_snapshots_are_removed(tmp_path, config_files):
+    snapshot_dir = tmp_path / "snapshots"
+    snapshot_dir.mkdir()
+    (snapshot_dir / "old.pickle").write_bytes(b"not a pickle")
+    ConfigSnapshot.load(*config_files, str(snapshot_dir))
+    assert not (snapshot_dir / "old.pickle").exists()
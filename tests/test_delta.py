@@ -0,0 +1,235 @@
+import base64
+import hashlib
+import io
+import json
+import re
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from repo_scanner.scanner.async_github_client import AsyncGitHubClient
+from repo_scanner.scanner.batch import BatchScanner
+from repo_scanner.scanner.delta import Delta
+from repo_scanner.scanner.github_client import GitHubClient
+from repo_scanner.scanner.repo_fetcher import RepoFetcher
+from repo_scanner.scanner.result_cache import ResultCache
+
+REPO = "acme/alpha"
+
+V1 = {
+    "server.py": "from mcp.server import Server\nserver = Server('alpha')\n",
+    "package.json": '{"dependencies": {"@modelcontextprotocol/sdk": "^1.0.0"}}\n',
+    "old_name.py": "import subprocess\nsubprocess.Popen(cmd, shell=True)\n",
+    "gone.py": "def handler():\n    return listTools()\n",
+    "utils.py": "def helper():\n    return 1\n",
+}
+
+# Modified, renamed, removed, added (including a manifest and a file above
+# max_file_size, which is streamed) and unchanged files
+V2 = {
+    "server.py": "from mcp.server import Server\nserver = Server('alpha')\nserver.registerTool('x')\n",
+    "package.json": V1["package.json"],
+    "tools/new_name.py": V1["old_name.py"],
+    "client.js": "const transport = new StdioServerTransport();\n",
+    "requirements.txt": "mcp==1.2.0\nrequests\n",
+    "utils.py": V1["utils.py"],
+    "big.py": "import os\n" + "x = 1\n" * 20000 + "from mcp.server import Server\nserver.registerTool('y')\n",
+}
+
+
+def blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def commit_sha(files) -> str:
+    digest = hashlib.sha1()
+    for path, content in sorted(files.items()):
+        digest.update(f"{path}\0{content}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StubGitHub:
+    """
+    Local stand-in for the GitHub endpoints a delta rescan uses: commits
+    (head SHA), compare, git/blobs and zipball, for one repository whose
+    head can be moved between commits. Requests are recorded by kind.
+    """
+
+    def __init__(self):
+        self.commits = {}
+        self.head = None
+        self.compare_status = "ahead"
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body, ctype = stub.answer(self.path.split("?")[0])
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def push(self, files) -> str:
+        sha = commit_sha(files)
+        self.commits[sha] = {path: content.encode("utf-8") for path, content in files.items()}
+        self.head = sha
+        return sha
+
+    def answer(self, path: str):
+        match = re.match(rf"^/repos/{REPO}/(commits|compare|git/blobs|zipball)/(.+)$", path)
+        if not match:
+            return 404, b'{"message": "Not Found"}', "application/json"
+        kind, arg = match.groups()
+        self.requests.append(kind)
+        files = self.commits[self.head]
+        if kind == "commits":
+            return 200, self.head.encode("ascii"), "text/plain"
+        if kind == "git/blobs":
+            for content in (c for commit in self.commits.values() for c in commit.values()):
+                if blob_sha(content) == arg:
+                    data = {"sha": arg, "encoding": "base64", "content": base64.b64encode(content).decode("ascii")}
+                    return 200, json.dumps(data).encode("utf-8"), "application/json"
+            return 404, b'{"message": "Not Found"}', "application/json"
+        if kind == "zipball":
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, "w") as archive:
+                for name, content in sorted(files.items()):
+                    archive.writestr(f"acme-alpha-{self.head[:7]}/{name}", content)
+                archive.comment = self.head.encode("ascii")
+            return 200, buf.getvalue(), "application/zip"
+        base, head = arg.split("...")
+        data = {"status": self.compare_status, "files": self.changes(self.commits[base], self.commits[head])}
+        return 200, json.dumps(data).encode("utf-8"), "application/json"
+
+    @staticmethod
+    def changes(old, new):
+        """The compare API's file list, with renames detected by identical content."""
+        removed = {blob_sha(old[p]): p for p in sorted(set(old) - set(new))}
+        files = []
+        for path in sorted(new):
+            sha = blob_sha(new[path])
+            if path not in old:
+                if sha in removed:
+                    files.append({"filename": path, "status": "renamed", "sha": sha,
+                                  "previous_filename": removed.pop(sha)})
+                else:
+                    files.append({"filename": path, "status": "added", "sha": sha})
+            elif old[path] != new[path]:
+                files.append({"filename": path, "status": "modified", "sha": sha})
+        files.extend({"filename": p, "status": "removed", "sha": s} for s, p in removed.items())
+        return files
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubGitHub()
+    yield server
+    server.close()
+
+
+def scan(stub, config, languages, cache_dir, delta, use_async=False, fast=False):
+    client = GitHubClient(base_url=stub.url)
+    async_client = AsyncGitHubClient(base_url=stub.url) if use_async else None
+    batch = BatchScanner(config, languages, client, RepoFetcher(), workers=1,
+                         cache=ResultCache(str(cache_dir)), async_client=async_client, delta=delta, fast=fast)
+    try:
+        return list(batch.run([REPO]))[0]
+    finally:
+        if async_client:
+            async_client.close()
+
+
+def summary(result):
+    return {
+        "classification": result.classification,
+        "confidence": result.confidence,
+        "files_scanned": result.files_scanned,
+        "languages": sorted(result.languages_detected),
+        "commit_sha": result.commit_sha,
+        "indicators": sorted(json.dumps(ind.model_dump(), sort_keys=True) for ind in result.indicators),
+    }
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_delta_equals_a_full_scan(stub, config, languages, tmp_path, use_async):
+    stub.push(V1)
+    first = scan(stub, config, languages, tmp_path / "cache", delta=True, use_async=use_async)
+    assert first.classification != "ERROR"
+    assert stub.requests.count("zipball") == 1
+
+    head = stub.push(V2)
+    stub.requests.clear()
+    delta = scan(stub, config, languages, tmp_path / "cache", delta=True, use_async=use_async)
+    assert "zipball" not in stub.requests
+    assert stub.requests.count("compare") == 1
+    # Only the modified, renamed and added files are fetched
+    assert stub.requests.count("git/blobs") == 5
+
+    full = scan(stub, config, languages, tmp_path / "fresh", delta=False)
+    assert full.indicators and full.files_scanned == len(V2)
+    assert delta.commit_sha == full.commit_sha == head
+    assert summary(delta) == summary(full)
+    files = {ind.file for ind in delta.indicators}
+    assert "old_name.py" not in files and "gone.py" not in files
+    assert {"tools/new_name.py", "client.js", "requirements.txt", "big.py"} <= files
+
+    # The delta result is cached like any other
+    stub.requests.clear()
+    assert summary(scan(stub, config, languages, tmp_path / "cache", delta=True)) == summary(full)
+    assert stub.requests == ["commits"]
+
+
+def test_diverged_history_falls_back_to_the_archive(stub, config, languages, tmp_path):
+    stub.push(V1)
+    scan(stub, config, languages, tmp_path / "cache", delta=True)
+    stub.push(V2)
+    stub.compare_status = "diverged"
+    stub.requests.clear()
+    result = scan(stub, config, languages, tmp_path / "cache", delta=True)
+    assert stub.requests.count("compare") == 1
+    assert stub.requests.count("zipball") == 1
+    assert "git/blobs" not in stub.requests
+    assert summary(result) == summary(scan(stub, config, languages, tmp_path / "fresh", delta=False))
+
+
+def test_too_many_changes_fall_back(config, languages):
+    delta = Delta(dict(config, delta={"max_files": 2}), languages)
+    comparison = {"status": "ahead", "files": StubGitHub.changes(
+        {p: c.encode() for p, c in V1.items()}, {p: c.encode() for p, c in V2.items()})}
+    previous = type("Previous", (), {"commit_sha": "0" * 40})()
+    assert delta.run(REPO, "1" * 40, previous, comparison, lambda sha: b"") is None
+
+
+def test_fast_result_is_not_served_to_a_full_scan(stub, config, languages, tmp_path):
+    stub.push(V1)
+    fast = scan(stub, config, languages, tmp_path / "cache", delta=False, fast=True)
+    assert fast.stopped_early and fast.files_scanned < len(V1)
+    # A later --fast run may reuse it
+    stub.requests.clear()
+    assert summary(scan(stub, config, languages, tmp_path / "cache", delta=False, fast=True)) == summary(fast)
+    assert stub.requests == ["commits"]
+
+    stub.requests.clear()
+    full = scan(stub, config, languages, tmp_path / "cache", delta=False)
+    assert stub.requests.count("zipball") == 1
+    assert not full.stopped_early and full.files_scanned == len(V1)
+    assert summary(full) == summary(scan(stub, config, languages, tmp_path / "fresh", delta=False))
+    # The full result replaced the partial one, and serves both kinds of run
+    stub.requests.clear()
+    assert summary(scan(stub, config, languages, tmp_path / "cache", delta=False, fast=True)) == summary(full)
+    assert stub.requests == ["commits"]
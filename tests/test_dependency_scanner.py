@@ -0,0 +1,58 @@
+import pytest
+
+from repo_scanner.scanner.scanners.dependency_scanner import DependencyIndex, DependencyScanner
+
+
+@pytest.fixture(scope="module")
+def index(config):
+    return DependencyIndex(config)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("mcp", "mcp"),
+    ("MCP", "mcp"),
+    ("FastMCP", "fastmcp"),
+    ("fastmcp", "fastmcp"),
+    ("langchain.mcp_adapters", "langchain-mcp-adapters"),
+    ("mcp-use", "mcp-use"),
+    ("@modelcontextprotocol/sdk", "@modelcontextprotocol/"),
+    ("mcp-server-git", "mcp-server-"),
+    ("mcp-server", "mcp-server"),
+    # A prefix alone is not a package
+    ("@modelcontextprotocol/", None),
+    ("mcpx", None),
+    ("requests", None),
+])
+def test_lookup(index, name, expected):
+    entry = index.lookup(name)
+    if expected is None:
+        assert entry is None
+    else:
+        assert entry.get("name", entry.get("prefix")) == expected
+
+
+def test_longest_prefix_wins():
+    index = DependencyIndex({"dependencies": {"prefixes": [
+        {"prefix": "mcp-", "score": 1.0, "classification": "CLIENT"},
+        {"prefix": "mcp-server-", "score": 5.0, "classification": "SERVER"},
+    ]}})
+    assert index.lookup("mcp-server-git")["score"] == 5.0
+    assert index.lookup("mcp-client")["score"] == 1.0
+
+
+def test_scan_reports_known_dependencies(config):
+    scanner = DependencyScanner(config)
+    content = '{"dependencies": {"@modelcontextprotocol/sdk": "^1", "zod": "^3"}, "devDependencies": {"mcp-remote": "1", "@modelcontextprotocol/sdk": "^1"}}'
+    found = [(i.type, i.value, i.file, i.score, i.classification) for i in scanner.scan("web/package.json", content)]
+    assert found == [
+        ("dependency", "@modelcontextprotocol/sdk", "web/package.json", 5.0, "SERVER"),
+        ("dependency", "mcp-remote", "web/package.json", 4.0, "CLIENT"),
+    ]
+    assert [i.value for i in scanner.scan("requirements.txt", "mcp[cli]>=1\nrequests\nmcp-use\n")] == ["mcp", "mcp-use"]
+    assert [i.value for i in scanner.scan("go.mod", "require github.com/mark3labs/mcp-go v0.8.0\n")] == ["github.com/mark3labs/mcp-go"]
+
+
+def test_scan_ignores_other_and_malformed_files(config):
+    scanner = DependencyScanner(config)
+    assert scanner.scan("server.py", "import mcp\n") == []
+    assert scanner.scan("package.json", '{"dependencies": {"@modelcontextprotocol/sdk"') == []
@@ -0,0 +1,33 @@
+from repo_scanner.scanner import file_index
+from repo_scanner.scanner.file_filter import FileFilter
+from repo_scanner.scanner.file_index import FileIndex, IncrementalScanner
+from repo_scanner.scanner.pipeline import build_scanners
+
+
+def scan(config, languages, root, index_path):
+    scanner = IncrementalScanner(build_scanners(config, languages), FileFilter.from_config(languages, config),
+                                 FileIndex(str(index_path), "cfg"))
+    indicators, files_scanned, _, changed = scanner.scan(str(root))
+    return sorted(ind.file for ind in indicators), files_scanned, changed
+
+
+def test_unchanged_files_come_from_the_index(config, languages, tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "server.py").write_text("from mcp.server import Server\n")
+    (root / "utils.py").write_text("def helper():\n    return 1\n")
+    index_path = tmp_path / "index.json"
+    first = scan(config, languages, root, index_path)
+    assert first[1:] == (2, 2)
+    assert scan(config, languages, root, index_path) == (first[0], 2, 0)
+
+
+def test_scanner_code_change_discards_the_index(config, languages, tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "server.py").write_text("from mcp.server import Server\n")
+    index_path = tmp_path / "index.json"
+    scan(config, languages, root, index_path)
+    monkeypatch.setattr(file_index, "code_fingerprint", lambda: "upgraded")
+    assert scan(config, languages, root, index_path)[2] == 1
+    assert scan(config, languages, root, index_path)[2] == 0
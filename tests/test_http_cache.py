@@ -0,0 +1,49 @@
+import os
+
+import requests
+
+from repo_scanner.scanner import http_cache
+from repo_scanner.scanner.http_cache import HttpCache
+
+
+def response(body: str, etag: str = '"v1"', status: int = 200) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.url = "https://api.github.com/x"
+    r.encoding = "utf-8"
+    r.headers["ETag"] = etag
+    r.headers["x-ratelimit-remaining"] = "42"
+    r._content = body.encode("utf-8")
+    return r
+
+
+def test_store_and_replay(tmp_path):
+    cache = HttpCache(str(tmp_path), "token")
+    cache.store("k", response('{"a": 1}'))
+    assert cache.validators("k") == {"If-None-Match": '"v1"'}
+    replayed = cache.replay("k", response("", status=304))
+    assert replayed.status_code == 200
+    assert replayed.json() == {"a": 1}
+    assert replayed.headers["x-ratelimit-remaining"] == "42"
+    # Other credentials never see the entry
+    assert HttpCache(str(tmp_path), "other").validators("k") == {}
+
+
+def test_size_is_bounded(tmp_path):
+    body = "x" * 1000
+    cache = HttpCache(str(tmp_path), max_bytes=10_000)
+    for i in range(50):
+        cache.store(f"k{i}", response(body))
+    files = [f for f in os.listdir(tmp_path) if f.endswith(".json")]
+    assert sum(os.path.getsize(os.path.join(tmp_path, f)) for f in files) <= 10_000
+    assert cache.validators("k49")
+    assert not cache.validators("k0")
+
+
+def test_failed_store_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(http_cache.json, "dump", fail)
+    HttpCache(str(tmp_path)).store("k", response("{}"))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,92 @@
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from repo_scanner.scanner.file_filter import FileFilter
+from repo_scanner.scanner.ignore import IgnoreRules
+
+
+@pytest.mark.parametrize("lines, path, is_dir, ignored", [
+    (["*.log"], "a/b/debug.log", False, True),
+    (["*.log"], "a/b/debug.log.txt", False, False),
+    (["build/"], "build", True, True),
+    (["build/"], "build", False, False),
+    (["build/"], "src/build", True, True),
+    (["/build"], "src/build", True, False),
+    (["docs/*.md"], "docs/a.md", False, True),
+    (["docs/*.md"], "docs/sub/a.md", False, False),
+    (["docs/*.md"], "x/docs/a.md", False, False),
+    (["**/fixtures"], "a/b/fixtures", True, True),
+    (["**/fixtures"], "fixtures", True, True),
+    (["a/**/b"], "a/b", True, True),
+    (["a/**/b"], "a/x/y/b", True, True),
+    (["vendor/**"], "vendor/x/y.py", False, True),
+    (["vendor/**"], "vendor", True, False),
+    (["file?.py"], "file1.py", False, True),
+    (["file?.py"], "file10.py", False, False),
+    (["file[0-9].py"], "file3.py", False, True),
+    (["file[!0-9].py"], "file3.py", False, False),
+    (["*.py", "!keep.py"], "src/keep.py", False, False),
+    (["!keep.py", "*.py"], "src/keep.py", False, True),
+    (["\\#notes"], "#notes", False, True),
+    (["# comment", ""], "# comment", False, False),
+    (["\\!important"], "!important", False, True),
+    (["trailing   "], "trailing", False, True),
+    (["trailing\\ "], "trailing ", False, True),
+])
+def test_rules(lines, path, is_dir, ignored):
+    assert IgnoreRules.from_lines(lines).ignored(path, is_dir) is ignored
+
+
+def test_base_anchors_nested_rules():
+    rules = IgnoreRules.from_lines(["/out", "tmp"], base="pkg")
+    assert rules.ignored("pkg/out", True)
+    assert not rules.ignored("out", True)
+    assert not rules.ignored("pkg/sub/out", True)
+    assert rules.ignored("pkg/sub/tmp", False)
+    assert not rules.ignored("other/tmp", False)
+
+
+# Tree and pattern pieces for the comparison with git
+TREE = [
+    "main.py", "app/server.py", "app/client.py", "app/build/gen.py", "app/tests/test_a.py",
+    "build/out.py", "docs/conf.py", "docs/api/ref.py", "lib/a/b/deep.py", "lib/keep.py",
+    "lib/vendor/x.py", "tests/fixtures/f.py", "tests/unit/test_b.py", "tmp1.py", "tmp22.py",
+]
+PIECES = [
+    "*.py", "!*.py", "build/", "/build", "app/", "!app/", "app/*.py", "!app/server.py", "**/tests",
+    "docs/**", "!docs/conf.py", "lib/**/deep.py", "tmp?.py", "tmp[0-9][0-9].py", "vendor",
+    "!lib/keep.py", "lib/*", "/main.py", "tests/", "!tests/unit/",
+]
+
+
+def git_kept(root: str):
+    env = dict(os.environ, GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_NOSYSTEM="1")
+    out = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=root, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return sorted(p for p in out.splitlines() if p.endswith(".py"))
+
+
+def walker_kept(root: str):
+    file_filter = FileFilter({"python": {"extensions": [".py"]}}, ignore_config={"globs": [".git/"], "gitignore": True})
+    return sorted(os.path.relpath(path, root).replace(os.sep, "/") for path, _, _ in file_filter.iter_candidates(root))
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_walker_agrees_with_git(tmp_path):
+    root = str(tmp_path)
+    for rel in TREE:
+        os.makedirs(os.path.dirname(os.path.join(root, rel)), exist_ok=True)
+        open(os.path.join(root, rel), "w").close()
+    subprocess.run(["git", "init", "-q", root], check=True)
+
+    rng = random.Random(42)
+    for _ in range(60):
+        with open(os.path.join(root, ".gitignore"), "w") as f:
+            f.write("\n".join(rng.sample(PIECES, rng.randint(1, 4))) + "\n")
+        with open(os.path.join(root, "lib", ".gitignore"), "w") as f:
+            f.write("\n".join(rng.sample(["deep.py", "/vendor", "!keep.py", "a/", "*.py", "b/"], 2)) + "\n")
+        assert walker_kept(root) == git_kept(root), open(os.path.join(root, ".gitignore")).read()
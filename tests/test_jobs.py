@@ -0,0 +1,44 @@
+from repo_scanner.scanner.file_filter import FileFilter
+from repo_scanner.scanner.pipeline import build_scanners, scan_files, scan_files_parallel
+from repo_scanner.scanner.repo_fetcher import RepoFetcher
+from repo_scanner.scanner.streaming import LargeFile
+from test_batch import make_repo, records, zip_bytes
+
+
+def scan_archive(config, languages, data: bytes, jobs: int):
+    file_filter = FileFilter.from_config(languages, config)
+    with RepoFetcher.open_archive(data) as archive:
+        if jobs == 1:
+            indicators, files_scanned, extensions = scan_files(build_scanners(config, languages), file_filter.walk_zip(archive))
+        else:
+            indicators, files_scanned, extensions = scan_files_parallel(
+                config, file_filter.walk_zip(archive), jobs, batch_size=4, languages=languages)
+    return records(indicators), files_scanned, extensions
+
+
+def test_jobs_match_a_sequential_scan(config, languages):
+    # Large members sit between small ones, so batches are split around them
+    files = {}
+    for seed in range(3):
+        files.update({f"{seed}/{path}": content for path, content in make_repo(seed * 3).items()})
+    data = zip_bytes("acme-mixed", files)
+    with RepoFetcher.open_archive(data) as archive:
+        walked = list(FileFilter.from_config(languages, config).walk_zip(archive))
+        assert sum(isinstance(f, LargeFile) and not f.picklable for f in walked) == 3
+
+    sequential = scan_archive(config, languages, data, 1)
+    assert sequential[0] and any(ind["file"].endswith("big0.py") for ind in sequential[0])
+    for jobs in (2, 3):
+        assert scan_archive(config, languages, data, jobs) == sequential
+
+
+def test_jobs_match_a_sequential_scan_on_disk(config, languages, tmp_path):
+    for path, content in make_repo(3).items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    file_filter = FileFilter.from_config(languages, config)
+    sequential = scan_files(build_scanners(config, languages), file_filter.walk_repo(str(tmp_path)))
+    # Large files on disk are picklable and go to the workers
+    parallel = scan_files_parallel(config, file_filter.walk_repo(str(tmp_path)), 2, batch_size=2, languages=languages)
+    assert records(parallel[0]) == records(sequential[0])
+    assert parallel[1:] == sequential[1:]
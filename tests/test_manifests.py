@@ -0,0 +1,117 @@
+import pytest
+
+from repo_scanner.scanner.scanners import manifests
+from repo_scanner.scanner.scanners.manifests import (
+    parse_cargo_toml, parse_go_mod, parse_package_json, parse_pyproject, parse_requirements,
+)
+
+needs_toml = pytest.mark.skipif(manifests.tomllib is None, reason="no TOML parser")
+
+
+def test_requirements():
+    content = (
+        "# comment\n"
+        "mcp[cli]>=1.2.0  # pinned\n"
+        "requests==2.31 ; python_version >= '3.8'\n"
+        "fastmcp \\\n"
+        "    >=0.4\n"
+        "-r other.txt\n"
+        "--index-url https://example.com/simple\n"
+        "-e git+https://github.com/acme/mcp-tools.git#egg=mcp-tools\n"
+        "https://example.com/pkg.tar.gz\n"
+        "langchain-mcp-adapters @ https://example.com/l.whl\n"
+        "\n"
+    )
+    assert parse_requirements(content) == ["mcp", "requests", "fastmcp", "mcp-tools", "langchain-mcp-adapters"]
+
+
+def test_package_json():
+    content = """{
+        "name": "app",
+        "dependencies": {"@modelcontextprotocol/sdk": "^1.0.0", "zod": "^3"},
+        "devDependencies": {"mcp-remote": "0.1"},
+        "peerDependencies": {"react": "*"},
+        "optionalDependencies": {"fsevents": "*"},
+        "bundleDependencies": ["bundled", 3],
+        "scripts": {"mcp-server-x": "node x.js"}
+    }"""
+    assert parse_package_json(content) == [
+        "@modelcontextprotocol/sdk", "zod", "mcp-remote", "react", "fsevents", "bundled",
+    ]
+
+
+@needs_toml
+def test_pyproject():
+    content = """
+[project]
+dependencies = ["mcp[cli]>=1.2", "httpx"]
+
+[project.optional-dependencies]
+dev = ["pytest>=8"]
+
+[dependency-groups]
+lint = ["ruff", {include-group = "dev"}]
+
+[tool.poetry.dependencies]
+python = "^3.10"
+fastmcp = "^0.4"
+
+[tool.poetry.group.test.dependencies]
+mcp-use = "*"
+"""
+    assert parse_pyproject(content) == ["mcp", "httpx", "pytest", "ruff", "fastmcp", "mcp-use"]
+
+
+@needs_toml
+def test_cargo_toml():
+    content = """
+[dependencies]
+rmcp = { version = "0.1", features = ["server"] }
+serde = "1"
+mcp = { package = "rust-mcp-sdk", version = "0.2" }
+
+[dev-dependencies]
+tokio = "1"
+
+[target.'cfg(unix)'.dependencies]
+nix = "0.27"
+
+[workspace.dependencies]
+anyhow = "1"
+"""
+    assert sorted(parse_cargo_toml(content)) == ["anyhow", "nix", "rmcp", "rust-mcp-sdk", "serde", "tokio"]
+
+
+def test_go_mod():
+    content = """module example.com/app
+
+go 1.22
+
+require github.com/mark3labs/mcp-go v0.8.0 // indirect
+
+require (
+    // tools
+    github.com/modelcontextprotocol/go-sdk v0.1.0
+    golang.org/x/sync v0.7.0
+)
+
+replace example.com/old => example.com/new v1.0.0
+"""
+    assert parse_go_mod(content) == [
+        "github.com/mark3labs/mcp-go", "github.com/modelcontextprotocol/go-sdk", "golang.org/x/sync",
+    ]
+
+
+@pytest.mark.parametrize("parser, content", [
+    (parse_package_json, "{not json"),
+    (parse_package_json, "[1, 2]"),
+    (parse_package_json, '{"dependencies": ["mcp"], "bundleDependencies": {"a": 1}}'),
+    pytest.param(parse_pyproject, "[project\ndependencies = [", marks=needs_toml),
+    pytest.param(parse_pyproject, '[project]\ndependencies = "mcp"\n', marks=needs_toml),
+    pytest.param(parse_cargo_toml, "[dependencies\nrmcp = ", marks=needs_toml),
+    pytest.param(parse_cargo_toml, 'dependencies = "rmcp"\ntarget = 3\n', marks=needs_toml),
+    (parse_go_mod, "module x\n"),
+    (parse_requirements, "-r base.txt\n--hash=sha256:abc\n# only options\n"),
+])
+def test_malformed_or_empty_manifests_give_no_names(parser, content):
+    assert parser(content) == []
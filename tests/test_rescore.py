@@ -0,0 +1,96 @@
+import copy
+
+import pytest
+
+from repo_scanner.scanner.indicator_archive import IndicatorArchive
+from repo_scanner.scanner.pipeline import build_result, build_scanners, scan_files
+from repo_scanner.scanner.result import FileData
+
+np = pytest.importorskip("numpy")
+from repo_scanner.scanner.rescore import Rescorer  # noqa: E402
+
+REPOS = {
+    "acme/server": {
+        "server.py": "from mcp.server import Server\nimport mcp\nserver = Server('x')\nserver.listTools()\n",
+        "package.json": '{"dependencies": {"@modelcontextprotocol/sdk": "^1.0.0", "mcp-remote": "1"}}',
+        "requirements.txt": "mcp[cli]\nfastmcp\n",
+    },
+    "acme/client": {
+        "client.js": "const transport = new StdioClientTransport();\nclient.connect(transport);\n",
+        "package.json": '{"dependencies": {"mcp-remote": "1", "@langchain/mcp-adapters": "1"}}',
+    },
+    "acme/mention": {"README.py": "# see modelcontextprotocol.io\n"},
+    "acme/plain": {"utils.py": "def helper():\n    return 1\n"},
+    "acme/empty": {},
+}
+
+
+def with_keywords(config):
+    # Legacy keywords on, so keyword features are archived too
+    return dict(config, keywords={"server_indicators": ["server", "listen"], "client_indicators": ["client", "connect"]})
+
+
+def scan(config, languages):
+    scanners = build_scanners(config, languages)
+    results = []
+    for name, files in REPOS.items():
+        data = [FileData(path=path, content=content, extension="." + path.rsplit(".", 1)[-1])
+                for path, content in files.items()]
+        indicators, files_scanned, extensions = scan_files(scanners, data)
+        results.append(build_result(config, name, indicators, files_scanned, extensions))
+    return results
+
+
+@pytest.fixture
+def archived(config, languages, tmp_path):
+    config = with_keywords(config)
+    results = scan(config, languages)
+    archive = IndicatorArchive(str(tmp_path), config)
+    for result in results:
+        archive.append(result)
+    return results
+
+
+def check(rescored, results):
+    assert [repo["repository"] for repo in rescored.repos] == [r.repository for r in results]
+    assert rescored.labels == [r.classification for r in results]
+    assert rescored.confidence.tolist() == pytest.approx([r.confidence for r in results])
+
+
+def test_archive_round_trip(archived, tmp_path):
+    # The rescore command reopens the archive without a config
+    archive = IndicatorArchive(str(tmp_path))
+    assert [(r["repository"], r["classification"], r["files_scanned"]) for r in archive.repos] == \
+        [(r.repository, r.classification, r.files_scanned) for r in archived]
+    size, paths = archive.column_paths()
+    counts = np.fromfile(paths["counts"], dtype=np.uint32, count=size)
+    assert counts.sum() == sum(len(r.indicators) for r in archived)
+
+
+def test_rescore_matches_the_classifier(config, archived, tmp_path):
+    assert {r.classification for r in archived} >= {"SERVER", "PROTOCOL_RELATED", "UNKNOWN"}
+    check(Rescorer(with_keywords(config)).run(IndicatorArchive(str(tmp_path)), latest_only=False), archived)
+
+
+def test_rescore_under_a_new_config_matches_a_rescan(config, languages, archived, tmp_path):
+    changed = copy.deepcopy(with_keywords(config))
+    for pattern in changed["patterns"]:
+        pattern["score"] = pattern.get("score", 1.0) / 2
+    for entry in changed["dependencies"]["packages"]:
+        if entry["classification"] == "CLIENT":
+            entry["score"] = 9.0
+    changed["weights"]["keyword_match"] = 0.3
+    changed["thresholds"]["classification"]["high"] = 4.0
+
+    rescanned = scan(changed, languages)
+    assert [r.classification for r in rescanned] != [r.classification for r in archived]
+    assert "CLIENT" in {r.classification for r in rescanned}
+    check(Rescorer(changed).run(IndicatorArchive(str(tmp_path)), latest_only=False), rescanned)
+
+
+def test_latest_only_reports_the_last_scan_of_each_repository(config, archived, tmp_path):
+    archive = IndicatorArchive(str(tmp_path), config)
+    archive.append(archived[0])
+    rescored = Rescorer(with_keywords(config)).run(archive)
+    assert len(rescored.repos) == len(REPOS)
+    assert rescored.repos[0]["row"] == len(REPOS)
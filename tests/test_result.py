@@ -0,0 +1,32 @@
+from repo_scanner.scanner.indicator_store import CompactIndicator
+from repo_scanner.scanner.pipeline import build_result
+from repo_scanner.scanner.result import Indicator, ScanResult
+
+
+def compact(**overrides) -> CompactIndicator:
+    fields = dict(type="pattern_match", value="MCP SDK: mcp", file="server.py", score=5.0, classification="SERVER")
+    return CompactIndicator(**dict(fields, **overrides))
+
+
+def test_built_result_equals_its_round_trip(config):
+    result = build_result(config, "acme/alpha", [compact(), compact(file="b.py")], 2, {".py"})
+    loaded = ScanResult.model_validate(result.model_dump())
+    assert isinstance(loaded.indicators[0], Indicator)
+    assert loaded == result
+    assert loaded.model_dump() == result.model_dump()
+
+
+def test_compact_records_have_the_indicator_read_api():
+    record = compact(line=3)
+    model = record.to_indicator()
+    assert record.model_dump() == model.model_dump()
+    assert record.model_dump(exclude={"file"}) == model.model_dump(exclude={"file"})
+    assert record.model_copy(update={"line": 4}) == model.model_copy(update={"line": 4})
+    assert record == model and model == record
+    assert record != compact(line=4)
+
+
+def test_constructor_keeps_compact_records():
+    result = ScanResult(repository="acme/alpha", indicators=[compact(), {"type": "keyword", "value": "mcp"}])
+    assert isinstance(result.indicators[0], CompactIndicator)
+    assert isinstance(result.indicators[1], Indicator)
@@ -0,0 +1,75 @@
+import os
+import time
+
+from repo_scanner.scanner import config_snapshot
+from repo_scanner.scanner.result import ScanResult
+from repo_scanner.scanner.result_cache import ResultCache
+
+
+def result(name: str, sha: str = "abc123") -> ScanResult:
+    return ScanResult(repository=name, classification="SERVER", commit_sha=sha, files_scanned=3)
+
+
+def entry_size(tmp_path) -> int:
+    probe = ResultCache(str(tmp_path / "probe"))
+    probe.put(result("acme/probe"), "cfg")
+    return os.path.getsize(probe._path("acme/probe", "abc123", "cfg"))
+
+
+def test_round_trip_and_latest(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put(result("acme/alpha", "one"), "cfg")
+    cache.put(result("acme/alpha", "two"), "cfg")
+    assert cache.get("acme/alpha", "one", "cfg").commit_sha == "one"
+    assert cache.get("acme/alpha", "one", "other") is None
+    assert cache.latest("acme/alpha", "cfg").commit_sha == "two"
+
+
+def test_results_of_other_scanner_code_are_misses(tmp_path, monkeypatch):
+    ResultCache(str(tmp_path)).put(result("acme/alpha"), "cfg")
+    monkeypatch.setattr(config_snapshot, "code_fingerprint", lambda: "upgraded")
+    cache = ResultCache(str(tmp_path))
+    assert cache.get("acme/alpha", "abc123", "cfg") is None
+    assert cache.latest("acme/alpha", "cfg") is None
+    cache.put(result("acme/alpha"), "cfg")
+    assert cache.get("acme/alpha", "abc123", "cfg")
+
+
+def test_triaged_result_is_only_served_to_triage(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    triaged = result("acme/alpha")
+    triaged.triaged = True
+    cache.put(triaged, "cfg")
+    assert cache.get("acme/alpha", "abc123", "cfg", triaged=True).triaged
+    assert cache.get("acme/alpha", "abc123", "cfg") is None
+    # The full scan that missed replaces it, for both kinds of caller
+    cache.put(result("acme/alpha"), "cfg")
+    assert not cache.get("acme/alpha", "abc123", "cfg").triaged
+    assert not cache.get("acme/alpha", "abc123", "cfg", triaged=True).triaged
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    size = entry_size(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=size * 4 + size // 2)
+    for i in range(5):
+        cache.put(result(f"acme/r{i}"), "cfg")
+        # Distinct mtimes, oldest first
+        stamp = time.time() - 100 + i
+        os.utime(cache._path(f"acme/r{i}", "abc123", "cfg"), (stamp, stamp))
+    # Trimmed below the budget, oldest first
+    assert cache.get("acme/r0", "abc123", "cfg") is None
+    assert all(cache.get(f"acme/r{i}", "abc123", "cfg") for i in range(2, 5))
+
+
+def test_directory_is_not_scanned_on_every_put(tmp_path, monkeypatch):
+    size = entry_size(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=size * 20)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+    for i in range(50):
+        cache.put(result(f"acme/r{i}"), "cfg")
+    # The first put, then once per tenth of the budget written past it
+    assert len(scans) <= 1 + (50 - 20) // 2
+    entries = [n for n in os.listdir(cache.cache_dir) if n.endswith(".json")]
+    assert len(entries) <= 20
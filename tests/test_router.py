@@ -0,0 +1,43 @@
+import pytest
+
+from repo_scanner.scanner.pipeline import ScanRouter, build_scanners, scan_files
+from repo_scanner.scanner.result import FileData
+from repo_scanner.scanner.scanners.ast_scanner import ASTScanner
+from repo_scanner.scanner.scanners.dependency_scanner import DependencyScanner
+from repo_scanner.scanner.scanners.keyword_scanner import KeywordScanner
+
+
+@pytest.fixture(scope="module")
+def scanners(config, languages):
+    return build_scanners(config, languages)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("src/server.py", [KeywordScanner, ASTScanner]),
+    ("requirements.txt", [KeywordScanner, DependencyScanner]),
+    ("web/package.json", [KeywordScanner, DependencyScanner]),
+    ("cmd/main.go", [KeywordScanner]),
+    ("go.mod", [KeywordScanner, DependencyScanner]),
+])
+def test_route(scanners, path, expected):
+    router = ScanRouter(scanners)
+    extension = "." + path.rsplit(".", 1)[-1]
+    assert [type(s) for s in router.route(path, extension)] == expected
+
+
+def pattern_names(scanners, path: str, content: str):
+    indicators, _, _ = scan_files(scanners, [FileData(path=path, content=content, extension="." + path.rsplit(".", 1)[-1])])
+    return {ind.value.split(": ", 1)[0] for ind in indicators if ind.type == "pattern_match"}
+
+
+def test_scoped_patterns_only_run_on_their_languages(scanners):
+    content = "from mcp.server import Server\nserver = new Server()\n"
+    scoped = {"MCP SDK Import", "Server Class Import"}
+    assert scoped <= pattern_names(scanners, "server.py", content)
+    assert scoped <= pattern_names(scanners, "src/server.ts", content)
+    assert "MCP SDK Import" in pattern_names(scanners, "lib/app.rb", "require 'mcp'\n")
+    # Same text in a Go or C file: the unscoped patterns still match
+    for path in ("main.go", "src/server.c"):
+        names = pattern_names(scanners, path, content)
+        assert not names & scoped
+        assert "MCP Dependency Declaration" in names
@@ -0,0 +1,99 @@
+import random
+import re
+
+import pytest
+
+from repo_scanner.scanner.scanners.ruleset import RuleSet
+
+# Patterns that exercise the corners of the combined matcher: groups,
+# alternations, overlapping and zero-width matches, back references,
+# scoped and global inline flags, unbounded repeats
+EXTRA_PATTERNS = [
+    r"ab",
+    r"(?i)abc",
+    r"b(c)?",
+    r"a|ab|abc",
+    r"(a)(b)",
+    r"(?P<name>x+)",
+    r"(\w)\1",
+    r"x*",
+    r"a*$",
+    r"(?i:ca)B",
+    r"(?i)x(?-i:Ab)",
+    r"\bfoo\b",
+    r"[^\"]+\"",
+    r"(?m)^mcp",
+    r"server\-[\w\-]+",
+]
+
+ALPHABET = ["a", "b", "c", "x", "A", "B", "C", " ", "\n", '"', "foo", "mcp", "MCP", "server-", "İ", "ſ"]
+
+
+def findall_values(regex: str, content: str):
+    """
+    What a per-pattern scan reports: unique findall values in first-seen
+    order, the first group's value for patterns with several groups.
+    """
+    matches = re.findall(regex, content)
+    return list(dict.fromkeys(m[0] if isinstance(m, tuple) else m for m in matches))
+
+
+def expected(patterns, content):
+    results = {}
+    for index, p in enumerate(patterns):
+        values = findall_values(p["regex"], content)
+        if values:
+            results[index] = values
+    return results
+
+
+@pytest.fixture(scope="module")
+def patterns(config):
+    return config["patterns"] + [{"name": f"extra{i}", "regex": r} for i, r in enumerate(EXTRA_PATTERNS)]
+
+
+def test_config_patterns_on_samples(config):
+    ruleset = RuleSet(config["patterns"])
+    samples = [
+        "from mcp.server import Server\nserver = Server('x')\n",
+        'import { Server } from "@modelcontextprotocol/sdk/server/index.js";\n',
+        "const t = new StdioServerTransport(); server.registerTool('x');\n",
+        '"dependencies": {"@modelcontextprotocol/server-filesystem": "^1.0"}\n',
+        "subprocess.Popen(cmd, shell=True)  # mcp-server\n",
+        "nothing to see here\n",
+    ]
+    for content in samples:
+        assert ruleset.scan(content) == expected(config["patterns"], content)
+
+
+def test_random_content_matches_findall(patterns):
+    ruleset = RuleSet(patterns)
+    rng = random.Random(1234)
+    for _ in range(2000):
+        content = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        assert ruleset.scan(content) == expected(patterns, content), content
+
+
+def test_subset_of_rules(patterns):
+    ruleset = RuleSet(patterns)
+    content = 'abc AB x xx "quoted" foo mcp server-a'
+    subset = ruleset.rules[len(ruleset.rules) // 2:]
+    full = expected(patterns, content)
+    assert ruleset.scan(content, subset) == {r.index: full[r.index] for r in subset if r.index in full}
+
+
+def test_invalid_pattern_is_skipped():
+    ruleset = RuleSet([{"name": "bad", "regex": "("}, {"name": "good", "regex": "ok"}])
+    assert [r.name for r in ruleset.rules] == ["good"]
+    assert ruleset.scan("ok ok") == {0: ["ok"]}
+
+
+def test_scopes(languages):
+    ruleset = RuleSet([
+        {"name": "py", "regex": "x", "languages": ["python"]},
+        {"name": "toml", "regex": "x", "files": ["*.toml"]},
+        {"name": "all", "regex": "x"},
+    ], languages)
+    assert [r.name for r in ruleset.rules_for("src/app.py")] == ["py", "all"]
+    assert [r.name for r in ruleset.rules_for("Cargo.toml")] == ["toml", "all"]
+    assert [r.name for r in ruleset.rules_for("README.md")] == ["all"]
@@ -0,0 +1,59 @@
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from repo_scanner.scanner.service import make_server
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets")
+def test_socket_path_must_not_be_a_regular_file(tmp_path):
+    path = tmp_path / "scan.sock"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        make_server(None, socket_path=str(path))
+    assert path.read_text() == "keep me"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets")
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "scan.sock")
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(path)
+    stale.close()
+    server = make_server(None, socket_path=path)
+    server.server_close()
+    os.unlink(path)
+
+
+@pytest.fixture
+def server():
+    server = make_server(None, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("length, status", [("-1", 400), ("abc", 400), ("10000000", 413)])
+def test_bad_content_length_is_rejected(server, length, status):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.putrequest("POST", "/scan")
+    conn.putheader("Content-Length", length)
+    conn.endheaders()
+    response = conn.getresponse()
+    assert response.status == status
+    assert "error" in json.loads(response.read())
+    conn.close()
+
+
+def test_body_must_be_a_json_object(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.request("POST", "/scan", body=b"[1, 2]")
+    response = conn.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read())["error"].startswith("Invalid JSON")
+    conn.close()
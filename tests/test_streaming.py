@@ -0,0 +1,71 @@
+import hashlib
+import io
+import random
+
+import pytest
+
+from repo_scanner.scanner.scanners.keyword_scanner import KeywordScanner
+from repo_scanner.scanner.streaming import LargeFile, iter_windows
+
+PIECES = [
+    "from mcp.server import Server\n", "new StdioServerTransport()", "@modelcontextprotocol/sdk",
+    '"@modelcontextprotocol/server-git"', "listTools", "mcp", "MCP", "server", "client", "connect",
+    "subprocess.Popen(x, shell=True)", " ", "\n", "\r\n", "\r", "İ", "ſ", "é", " ", "x" * 70,
+]
+
+
+@pytest.fixture(scope="module")
+def scanner(config):
+    # Legacy keywords on, so keyword line numbers and contexts are covered too
+    config = dict(config, keywords={"server_indicators": ["server", "listen", "mcp"],
+                                    "client_indicators": ["client", "connect", "mcp"]})
+    return KeywordScanner(config)
+
+
+def normalized(content: str) -> str:
+    """What open(..., 'r') hands to scan(): universal newlines."""
+    return content.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def windowed(scanner, content: str, chunk_size: int):
+    read = io.BytesIO(content.encode("utf-8")).read
+    return scanner.scan_windows("big.py", iter_windows(read, chunk_size, scanner.window_overlap))
+
+
+def test_windows_cover_the_text_once():
+    content = "".join(random.Random(7).choice(PIECES) for _ in range(300))
+    for chunk_size in (1, 2, 7, 64, 1000, 100_000):
+        owned = [w.text[w.start:w.end] for w in iter_windows(io.BytesIO(content.encode("utf-8")).read, chunk_size, 5)]
+        assert "".join(owned) == normalized(content)
+
+
+def test_split_utf8_sequences_decode_like_a_whole_read():
+    data = "aé€😀\r\nb".encode("utf-8") + b"\xff" + "c".encode("utf-8")
+    owned = "".join(w.text[w.start:w.end] for w in iter_windows(io.BytesIO(data).read, 1, 2))
+    assert owned == normalized(data.decode("utf-8", errors="ignore"))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 100, 4096])
+def test_window_scan_matches_whole_file_scan(scanner, chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(40):
+        content = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 120)))
+        expected = scanner.scan("big.py", normalized(content))
+        assert windowed(scanner, content, chunk_size) == expected, content
+
+
+def test_match_across_a_window_boundary(scanner):
+    content = "a" * 1000 + "@modelcontextprotocol/server-filesystem" + "b" * 1000
+    expected = scanner.scan("big.py", content)
+    assert expected
+    for chunk_size in (1010, 1020, 1030):
+        assert windowed(scanner, content, chunk_size) == expected
+
+
+def test_large_file_hash_matches_a_whole_read(tmp_path):
+    content = "".join(random.Random(3).choice(PIECES) for _ in range(2000))
+    path = tmp_path / "big.py"
+    path.write_bytes(content.encode("utf-8"))
+    large = LargeFile(str(path), ".py", path.stat().st_size, chunk_size=333)
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        assert large.sha256() == hashlib.sha256(f.read().encode("utf-8")).hexdigest()